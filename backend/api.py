@@ -1,6 +1,6 @@
 # backend/api.py
 
-from fastapi import FastAPI, HTTPException, WebSocket, BackgroundTasks
+from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect, BackgroundTasks, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Boolean
 from sqlalchemy.ext.declarative import declarative_base
@@ -218,6 +218,8 @@ app.add_middleware(
 )
 
 # Dependencia de base de datos
+# Los endpoints que usan sesiones son `def` (no `async def`): FastAPI los ejecuta
+# en su pool de hilos y las consultas bloqueantes no detienen el event loop
 def get_db():
     db = SessionLocal()
     try:
@@ -231,7 +233,7 @@ async def root():
     return {"message": "CS:GO Arbitrage API v2.0"}
 
 @app.get("/api/opportunities", response_model=List[ProfitableOpportunity])
-async def get_opportunities(
+def get_opportunities(
     min_profitability: float = 0,
     max_price: Optional[float] = None,
     platforms: Optional[str] = None,
@@ -249,7 +251,7 @@ async def get_opportunities(
     return ArbitrageService.find_opportunities(db, filters)
 
 @app.get("/api/items", response_model=List[ItemResponse])
-async def get_items(
+def get_items(
     platform: Optional[str] = None,
     limit: int = 100,
     offset: int = 0,
@@ -265,7 +267,7 @@ async def get_items(
     return items
 
 @app.get("/api/item/{item_name}/history")
-async def get_item_history(
+def get_item_history(
     item_name: str,
     platform: Optional[str] = None,
     days: int = 7,
@@ -331,7 +333,7 @@ async def stop_scraper(scraper_name: str):
     return {"message": f"Scraper {scraper_name} detenido"}
 
 @app.get("/api/stats")
-async def get_stats(db: Session = Depends(get_db)):
+def get_stats(db: Session = Depends(get_db)):
     """Obtiene estadísticas generales"""
     total_items = db.query(Item).count()
     profitable_items = db.query(Item).filter(Item.is_profitable == True).count()
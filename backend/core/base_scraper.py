@@ -21,7 +21,20 @@ import threading
 # Importar nuestro gestor de configuración
 from .config_manager import get_config_manager
 from .proxy_manager import ProxyManager
+from .price_record import PriceRecord, make_record, record_from_dict
+from .snapshot import PriceSnapshot
+from .snapshot_store import get_snapshot_store
+from .snapshot_diff import SnapshotDiff, diff_snapshots, get_delta_log
+from .event_bus import get_event_bus, SNAPSHOT_DIFF, SNAPSHOT_READY, SnapshotReady
+from .item_registry import ItemRegistryError
+from .price_table import get_price_table
+from .validation import (
+    validate_snapshot as validate_price_snapshot, validate_records as validate_price_records,
+    ValidationReport, MALFORMED, MAX_SAMPLES
+)
+from .name_index import get_name_index
 from backend.services.database_service import get_database_service
+from backend.services.persistence_service import get_persistence_worker
 from backend.services.notification_service import get_notification_service
 class BaseScraper(ABC):
     """
@@ -44,6 +57,7 @@ class BaseScraper(ABC):
             custom_config: Configuración personalizada (sobrescribe la global)
         """
         self.platform_name = platform_name
+        self.source = sys.intern(platform_name.lower())
         self.config_manager = get_config_manager()
         
         # Cargar configuración de la plataforma
@@ -89,8 +103,21 @@ class BaseScraper(ABC):
     'requests_failed': 0,
     'items_fetched': 0,
     'last_run': None,
-    'last_error': None
+    'last_error': None,
+    'last_validation': None
 }
+        # Timestamp compartido por todos los registros de una ejecución
+        self._run_timestamp = None
+        # Índice de nombres canónicos (compartido por todos los scrapers)
+        self.name_index = get_name_index()
+        # Almacén de snapshots en disco (formato según settings['snapshots'])
+        self.snapshot_store = get_snapshot_store()
+        # Último snapshot guardado, para calcular los cambios de cada ejecución
+        self._previous_snapshot = None
+        self.event_bus = get_event_bus()
+        self.delta_log = get_delta_log()
+        # Tabla de precios en memoria compartida (None si está desactivada)
+        self.price_table = get_price_table()
         # Rate limiting
         try:
             from backend.core.rate_limiter import get_rate_limiter
@@ -108,6 +135,10 @@ class BaseScraper(ABC):
         self.db_service = get_database_service()
         self.notification_service = get_notification_service()
         self.use_database = self.config_manager.settings.get('database', {}).get('enabled', True)
+        # Worker de escritura diferida (None = escritura síncrona)
+        self.persistence_worker = None
+        if self.use_database and self.config_manager.settings.get('database', {}).get('write_behind', True):
+            self.persistence_worker = get_persistence_worker()
         # Sesión de requests para reutilizar conexiones
         self.session = requests.Session()
         self.session.headers.update(self.headers)
@@ -221,34 +252,66 @@ class BaseScraper(ABC):
         self.logger.error(f"Falló después de {max_retries} intentos: {url}")
         return None
     
-    def save_data(self, data: List[Dict]) -> bool:
+    def make_record(self, name: str, price: Any = None,
+                    price_minor: Optional[int] = None,
+                    url: Optional[str] = None) -> PriceRecord:
         """
-        Guarda los datos en formato JSON y en la base de datos
+        Crea un PriceRecord de esta plataforma
         
         Args:
-            data: Lista de items a guardar
+            name: Nombre del item (se convierte al nombre canónico)
+            price: Precio en dólares (str, int o float)
+            price_minor: Precio en milésimas de dólar si la API ya lo da así
+            url: URL opcional del item
+        """
+        return make_record(
+            name,
+            self.source,
+            price=price,
+            price_minor=price_minor,
+            url=url,
+            timestamp=self._run_timestamp
+        )
+    
+    def _as_record(self, item: Any) -> Any:
+        """Convierte items en formato dict histórico a PriceRecord"""
+        if isinstance(item, PriceRecord):
+            return item
+        if isinstance(item, dict) and 'Item' in item and 'Price' in item:
+            return record_from_dict(item, self.source, self._run_timestamp)
+        return item
+    
+    def save_data(self, snapshot: PriceSnapshot) -> bool:
+        """
+        Guarda el snapshot en disco (binario y/o JSON según settings) y en la base de datos
+        
+        Args:
+            snapshot: Snapshot columnar validado
             
         Returns:
             bool: True si se guardó correctamente
         """
         try:
-            # Guardar en JSON (mantener compatibilidad)
-            filename = f"{self.platform_name.lower()}_data.json"
-            filepath = self.config_manager.get_json_output_path(filename)
-            
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=4, ensure_ascii=False)
+            filepath = self.snapshot_store.save(snapshot)
             
             self.logger.info(f"Datos guardados en {filepath}")
             
             # Guardar en base de datos si está habilitada
             if self.use_database:
                 try:
-                    self.db_service.save_scraper_data(self.platform_name.lower(), data)
-                    self.logger.info(f"Datos guardados en base de datos")
+                    if self.persistence_worker:
+                        # Escritura diferida: el próximo fetch no espera al disco
+                        self.persistence_worker.submit(self.platform_name.lower(), snapshot)
+                        self.logger.info(
+                            f"Datos encolados para base de datos "
+                            f"(pendientes: {self.persistence_worker.queue_depth})"
+                        )
+                    else:
+                        self.db_service.save_scraper_data(self.platform_name.lower(), snapshot)
+                        self.logger.info(f"Datos guardados en base de datos")
                 except Exception as e:
                     self.logger.error(f"Error guardando en base de datos: {e}")
-                    # No fallar si la DB falla, ya tenemos el JSON
+                    # No fallar si la DB falla, ya tenemos el snapshot en disco
             
             return True
             
@@ -258,18 +321,17 @@ class BaseScraper(ABC):
     
 
     @abstractmethod
-    def fetch_data(self) -> List[Dict]:
+    def fetch_data(self) -> List[PriceRecord]:
         """
         Método abstracto que cada scraper debe implementar.
-        Debe retornar una lista de diccionarios con formato:
+        Debe retornar una lista de PriceRecord creados con self.make_record():
         [
-            {
-                'Item': 'nombre_del_item',
-                'Price': 'precio',
-                'URL': 'url_opcional'
-            },
+            self.make_record('nombre_del_item', price='precio', url='url_opcional'),
             ...
         ]
+        
+        Por compatibilidad también se aceptan diccionarios con las claves
+        'Item', 'Price' y 'URL' opcional.
         """
         pass
     
@@ -298,72 +360,194 @@ class BaseScraper(ABC):
         """
         pass
     
-    def validate_item(self, item: Dict) -> bool:
+    def validate_item(self, item: Any) -> bool:
         """
-        Valida que un item tenga los campos requeridos
+        Valida que un item tenga nombre y un precio válido
+        
+        Para catálogos completos usar validate_records, que valida en bloque
+        y no escribe un warning por cada item.
         
         Args:
-            item: Diccionario con datos del item
+            item: PriceRecord (o diccionario ya convertido con _as_record)
             
         Returns:
             True si el item es válido
         """
-        required_fields = ['Item', 'Price']
+        return (
+            isinstance(item, PriceRecord)
+            and bool(item.name)
+            and item.price_minor is not None
+            and item.price_minor >= 0
+        )
+    
+    def validate_records(self, records: List[PriceRecord],
+                         malformed: Optional[List[Any]] = None) -> List[PriceRecord]:
+        """
+        Valida los registros de un catálogo completo antes de crear el snapshot
         
-        # Verificar campos requeridos
-        for field in required_fields:
-            if field not in item:
-                self.logger.warning(f"Item inválido, falta campo {field}: {item}")
-                return False
+        Se llama antes de PriceSnapshot.from_records: los items descartados
+        (sin nombre, con precio no parseable o negativo) nunca se registran
+        en item_catalog. Escribe una sola línea de resumen en el log.
         
-        # Verificar que el precio sea válido
-        try:
-            price = float(str(item['Price']).replace(',', '.'))
-            if price < 0:
-                self.logger.warning(f"Precio negativo en item: {item}")
-                return False
-        except (ValueError, TypeError):
-            self.logger.warning(f"Precio inválido en item: {item}")
-            return False
+        Args:
+            records: Registros sin validar
+            malformed: Items que no se pudieron convertir a PriceRecord
+            
+        Returns:
+            Lista con solo los registros válidos
+        """
+        valid, report = validate_price_records(records)
+        self._record_validation(report, malformed)
+        return valid
+    
+    def validate_snapshot(self, snapshot: PriceSnapshot,
+                          malformed: Optional[List[Any]] = None) -> PriceSnapshot:
+        """
+        Valida un snapshot completo de forma vectorizada
+        
+        Descarta items sin nombre, con precio no parseable o negativo y
+        escribe una sola línea de resumen con contadores y ejemplos por motivo.
+        
+        Args:
+            snapshot: Snapshot sin validar
+            malformed: Items que no se pudieron convertir a PriceRecord
+            
+        Returns:
+            Snapshot con solo los items válidos
+        """
+        mask, report = validate_price_snapshot(snapshot)
+        self._record_validation(report, malformed)
         
-        return True
+        if report.valid == len(snapshot):
+            return snapshot
+        return snapshot.take(mask)
     
-    def run_once(self) -> List[Dict]:
-        """Ejecuta el scraper una vez y retorna los datos"""
+    def _record_validation(self, report: ValidationReport, malformed: Optional[List[Any]]):
+        """Añade los items malformados al informe, guarda estadísticas y escribe el resumen"""
+        if malformed:
+            report.total += len(malformed)
+            report.add(MALFORMED, len(malformed), [str(item)[:80] for item in malformed[:MAX_SAMPLES]])
+        
+        self.stats['last_validation'] = {
+            'total': report.total,
+            'valid': report.valid,
+            'rejected': dict(report.rejected)
+        }
+        
+        if report.rejected:
+            self.logger.warning(report.summary())
+    
+    def run_once(self) -> PriceSnapshot:
+        """Ejecuta el scraper una vez y retorna el snapshot validado"""
         self.logger.info(f"Iniciando scraper {self.platform_name}")
         self.stats['last_run'] = datetime.now()
+        self._run_timestamp = time.time()
         
         try:
             # Obtener datos
             data = self.fetch_data()
             
             if data:
-                # Validar items
-                valid_data = [item for item in data if self.validate_item(item)]
-                invalid_count = len(data) - len(valid_data)
+                # Convertir a snapshot columnar (los dicts históricos se convierten una sola vez)
+                records = []
+                malformed = []
+                for item in data:
+                    record = self._as_record(item)
+                    if isinstance(record, PriceRecord):
+                        records.append(record)
+                    else:
+                        malformed.append(item)
+                
+                # Validar items antes de registrarlos en el catálogo (un único resumen en el log)
+                records = self.validate_records(records, malformed)
                 
-                if invalid_count > 0:
-                    self.logger.warning(f"Se descartaron {invalid_count} items inválidos")
+                valid_snapshot = PriceSnapshot.from_records(
+                    self.source, records, self._run_timestamp
+                )
                 
                 # Actualizar estadísticas
-                self.stats['items_fetched'] = len(valid_data)
+                self.stats['items_fetched'] = len(valid_snapshot)
+                
+                # Comparar con la ejecución anterior antes de sobrescribirla
+                previous = self._get_previous_snapshot()
                 
                 # Guardar datos
-                self.save_data(valid_data)
+                self.save_data(valid_snapshot)
+                
+                # Publicar los cambios (altas, bajas y cambios de precio)
+                self.publish_diff(previous, valid_snapshot)
+                
+                # Publicar precios actuales para los lectores de otros procesos
+                if self.price_table:
+                    self.price_table.publish(valid_snapshot)
+                
+                # Avisar a los analizadores de este proceso: el snapshot ya se puede leer
+                self.publish_ready(valid_snapshot)
                 
                 self.logger.success(
-                    f"Scraper completado: {len(valid_data)} items válidos obtenidos"
+                    f"Scraper completado: {len(valid_snapshot)} items válidos obtenidos"
                 )
                 
-                return valid_data
+                return valid_snapshot
             else:
                 self.logger.warning("No se obtuvieron datos")
-                return []
+                return PriceSnapshot.empty(self.source)
                 
+        except ItemRegistryError as e:
+            # Sin ids del catálogo no se guarda ni se publica nada en este ciclo
+            self.logger.warning(f"Ciclo omitido, catálogo de items no disponible: {e}")
+            self.stats['last_error'] = str(e)
+            return PriceSnapshot.empty(self.source)
         except Exception as e:
             self.logger.error(f"Error ejecutando scraper: {e}")
             self.stats['last_error'] = str(e)
-            return []
+            return PriceSnapshot.empty(self.source)
+    
+    def _get_previous_snapshot(self) -> Optional[PriceSnapshot]:
+        """Último snapshot de esta plataforma (en memoria o, la primera vez, en disco)"""
+        if self._previous_snapshot is None:
+            previous = self.snapshot_store.load(self.source)
+            if len(previous):
+                self._previous_snapshot = previous
+        return self._previous_snapshot
+    
+    def publish_diff(self, previous: Optional[PriceSnapshot],
+                     snapshot: PriceSnapshot) -> Optional[SnapshotDiff]:
+        """
+        Calcula los cambios respecto a la ejecución anterior, los guarda en el
+        histórico de deltas y los publica en el bus de eventos
+        
+        Returns:
+            SnapshotDiff o None si falló el cálculo
+        """
+        try:
+            diff = diff_snapshots(previous, snapshot)
+            self._previous_snapshot = snapshot
+            
+            if self.delta_log:
+                self.delta_log.append(snapshot, diff)
+            
+            if len(diff):
+                self.logger.info(f"Cambios: {diff.summary()}")
+                self.event_bus.publish(SNAPSHOT_DIFF, diff)
+            
+            return diff
+            
+        except Exception as e:
+            self.logger.error(f"Error calculando cambios del snapshot: {e}")
+            return None
+    
+    def publish_ready(self, snapshot: PriceSnapshot):
+        """Publica SNAPSHOT_READY con la versión guardada del snapshot"""
+        if not self.event_bus.has_subscribers(SNAPSHOT_READY):
+            return
+        try:
+            version = self.snapshot_store.get_version(self.source)
+            self.event_bus.publish(SNAPSHOT_READY, SnapshotReady(
+                self.source, version, snapshot.timestamp, len(snapshot)
+            ))
+        except Exception as e:
+            self.logger.error(f"Error publicando snapshot listo: {e}")
     
     def run_forever(self, interval: Optional[int] = None):
         """
@@ -398,7 +582,10 @@ class BaseScraper(ABC):
     
     def get_stats(self) -> Dict[str, Any]:
         """Retorna estadísticas de ejecución del scraper"""
-        return self.stats.copy()
+        stats = self.stats.copy()
+        if self.persistence_worker:
+            stats['persistence_queue_depth'] = self.persistence_worker.queue_depth
+        return stats
     
     def __enter__(self):
         """Context manager para limpieza automática"""
@@ -88,8 +88,76 @@ class ConfigManager:
                 "retention": "7 days"
             },
             "database": {
-                "type": "sqlite",
-                "path": "csgo_arbitrage.db"
+                "type": "sqlite",  # sqlite o postgresql
+                "path": "csgo_arbitrage.db",  # Archivo SQLite dentro de data/
+                "url": "",  # URL completa de SQLAlchemy (tiene prioridad; también DATABASE_URL)
+                "postgresql": {
+                    "host": "localhost",
+                    "port": 5432,
+                    "database": "csgo_arbitrage",
+                    "user": "csgo_user",
+                    "password": "",  # Si está vacío se usa la variable DB_PASSWORD
+                    "pool_size": 10,
+                    "max_overflow": 20,
+                    "pool_timeout": 30,
+                    "pool_recycle": 1800,
+                    "copy_ingest": True  # Ingesta de snapshots con COPY + merge en bloque
+                },
+                "write_behind": True,  # Escribir en segundo plano (no bloquea a los scrapers)
+                "write_queue_size": 16,
+                "write_batch_size": 4,
+                "write_submit_timeout": 30,
+                "read_workers": 4,  # Hilos para las consultas de los endpoints async
+                "query_cache": True,  # Caché de lecturas del dashboard invalidada por escrituras
+                "query_cache_check_interval": 1.0,  # Segundos entre lecturas de data_versions
+                "sqlite_tuning": {
+                    "enabled": False,  # WAL + PRAGMAs + hilo escritor único
+                    "journal_mode": "WAL",
+                    "synchronous": "NORMAL",
+                    "mmap_size": 268435456,
+                    "cache_size": -65536,
+                    "busy_timeout": 30000,
+                    "pool_size": 5,
+                    "writer_thread": True
+                }
+            },
+            "snapshots": {
+                "format": "binary",  # binary (mmap) o json
+                "json_export": True,  # Exportar también el JSON histórico
+                "delta_log": True,  # Guardar deltas entre ejecuciones en JSON/history
+                "checkpoint_interval": 20  # Ejecuciones entre snapshots completos
+            },
+            "shared_memory": {
+                "enabled": True,  # Tabla de precios compartida entre procesos
+                "name": "csgo_prices",
+                "capacity": 100000  # Máximo item_id + 1
+            },
+            "profitability": {
+                "debounce": 0.25,  # Segundos sin snapshots nuevos antes de analizar
+                "max_delay": 2.0,  # Retraso máximo del análisis durante una ráfaga
+                "watch_interval": 0.2,  # Comprobación de versiones de otros procesos
+                "save_interval": 5.0,  # Segundos mínimos entre guardados de rentabilidad.json
+                "notify_top": 5  # Notificar las oportunidades que entran en este top
+            },
+            "arbitrage": {
+                "min_profit": 0.05,  # Rentabilidad mínima tras comisiones (5%)
+                "notify_top": 5,
+                # Comisiones por plataforma (fracciones; valores orientativos, revisar):
+                # buy_fee, sell_fee, withdrawal_fee, can_buy, can_sell. Las plataformas
+                # sin entrada solo se usan para comprar.
+                "fees": {
+                    "steam": {"can_buy": False, "can_sell": True},  # Venta con la tabla de comisiones de Steam
+                    "waxpeer": {"sell_fee": 0.06, "can_sell": True},
+                    "csdeals": {"sell_fee": 0.02, "can_sell": True},
+                    "skinport": {"sell_fee": 0.08, "can_sell": True},
+                    "manncostore": {"sell_fee": 0.05, "can_sell": True},
+                    "bitskins": {"sell_fee": 0.05, "can_sell": True},
+                    "marketcsgo": {"sell_fee": 0.05, "can_sell": True},
+                    "skindeck": {"sell_fee": 0.05, "can_sell": True},
+                    "white": {"sell_fee": 0.05, "can_sell": True},
+                    "lisskins": {"sell_fee": 0.05, "can_sell": True},
+                    "shadowpay": {"sell_fee": 0.05, "can_sell": True}
+                }
             }
         }
     
@@ -0,0 +1,145 @@
+# backend/core/event_bus.py
+
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from loguru import logger
+
+# Tipos de evento
+SNAPSHOT_DIFF = 'snapshot_diff'  # payload: SnapshotDiff con altas, bajas y cambios de precio
+SNAPSHOT_READY = 'snapshot_ready'  # payload: SnapshotReady, el snapshot ya está guardado
+
+
+@dataclass
+class SnapshotReady:
+    """Un scraper terminó y su snapshot ya se puede leer del almacén"""
+    platform: str
+    version: Optional[int]  # Versión del manifiesto (SnapshotStore.get_version)
+    timestamp: float
+    items: int
+
+
+class EventBus:
+    """
+    Bus de eventos en proceso (publicación/suscripción)
+
+    Los handlers se ejecutan en el hilo que publica. Un error en un handler
+    se registra en el log y no afecta al resto de suscriptores.
+    """
+
+    def __init__(self):
+        self.logger = logger.bind(service="EventBus")
+        self._handlers: Dict[str, List[Callable[[Any], None]]] = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def subscribe(self, event_type: str, handler: Callable[[Any], None]):
+        """Suscribe un handler a un tipo de evento"""
+        with self._lock:
+            if handler not in self._handlers[event_type]:
+                self._handlers[event_type].append(handler)
+
+    def unsubscribe(self, event_type: str, handler: Callable[[Any], None]):
+        """Elimina la suscripción de un handler"""
+        with self._lock:
+            if handler in self._handlers[event_type]:
+                self._handlers[event_type].remove(handler)
+
+    def publish(self, event_type: str, payload: Any = None) -> int:
+        """
+        Publica un evento a todos los suscriptores
+
+        Returns:
+            Número de handlers ejecutados
+        """
+        with self._lock:
+            handlers = list(self._handlers.get(event_type, ()))
+
+        for handler in handlers:
+            try:
+                handler(payload)
+            except Exception as e:
+                self.logger.error(f"Error en handler de {event_type}: {e}")
+
+        return len(handlers)
+
+    def has_subscribers(self, event_type: str) -> bool:
+        """Indica si algún handler escucha un tipo de evento"""
+        return bool(self._handlers.get(event_type))
+
+
+class DebouncedTrigger:
+    """
+    Agrupa ráfagas de eventos en un único disparo
+
+    wait() bloquea hasta que llega un evento y después espera a que pasen
+    `debounce` segundos sin eventos nuevos (como mucho `max_delay` desde el
+    primero), de modo que varios scrapers que terminan casi a la vez
+    provocan un solo análisis.
+    """
+
+    def __init__(self, event_bus: EventBus, event_type: str, debounce: float = 0.25,
+                 max_delay: float = 2.0, accept: Optional[Callable[[Any], bool]] = None):
+        self.event_bus = event_bus
+        self.event_type = event_type
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.accept = accept
+        self._pending: List[Any] = []
+        self._first = self._last = 0.0
+        self._closed = False
+        self._condition = threading.Condition()
+        event_bus.subscribe(event_type, self._on_event)
+
+    def _on_event(self, payload: Any):
+        if self.accept is not None and not self.accept(payload):
+            return
+        with self._condition:
+            now = time.monotonic()
+            if not self._pending:
+                self._first = now
+            self._last = now
+            self._pending.append(payload)
+            self._condition.notify_all()
+
+    def wait(self, timeout: Optional[float] = None) -> List[Any]:
+        """
+        Espera el próximo grupo de eventos
+
+        Returns:
+            Payloads recibidos (lista vacía si venció el timeout o se cerró)
+        """
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._pending or self._closed, timeout):
+                return []
+
+            # Esperar a que la ráfaga termine
+            while not self._closed:
+                now = time.monotonic()
+                deadline = min(self._last + self.debounce, self._first + self.max_delay)
+                if now >= deadline:
+                    break
+                self._condition.wait(deadline - now)
+
+            pending, self._pending = self._pending, []
+            return pending
+
+    def close(self):
+        """Deja de escuchar y despierta a quien esté esperando"""
+        self.event_bus.unsubscribe(self.event_type, self._on_event)
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+
+# Singleton del bus de eventos
+_event_bus = None
+
+def get_event_bus() -> EventBus:
+    """Obtiene la instancia singleton del EventBus"""
+    global _event_bus
+    if _event_bus is None:
+        _event_bus = EventBus()
+    return _event_bus
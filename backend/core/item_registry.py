@@ -0,0 +1,246 @@
+# backend/core/item_registry.py
+
+import sys
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+from sqlalchemy import select
+
+from backend.database.models import ItemCatalog, get_database_manager
+
+# Id reservado para items sin nombre (nunca se registra en la base de datos)
+MISSING_ITEM_ID = -1
+
+ITEM_ID_DTYPE = np.int32
+
+# Límite de parámetros por consulta (SQLite admite 999 por defecto)
+_LOOKUP_CHUNK = 500
+
+# Segundos entre reintentos de carga del catálogo tras un fallo
+_LOAD_RETRY_INTERVAL = 30.0
+
+
+class ItemRegistryError(RuntimeError):
+    """No se pudieron obtener ids del catálogo (base de datos no disponible)"""
+
+
+class ItemRegistry:
+    """
+    Diccionario global de items con ids enteros estables
+
+    Los ids se asignan en la tabla item_catalog, por lo que son los mismos
+    para todos los procesos (scrapers, servidor web, analizador). El
+    catálogo se carga en memoria una sola vez y los nombres nuevos se
+    registran por lotes.
+
+    Nunca se inventan ids locales: si la base de datos no responde, los
+    nombres nuevos lanzan ItemRegistryError y quien llama omite ese ciclo.
+    """
+
+    def __init__(self, db_manager=None):
+        self.db_manager = db_manager or get_database_manager()
+        self.logger = logger.bind(service="ItemRegistry")
+
+        self._ids: Dict[str, int] = {}
+        self._names: List[Optional[str]] = []
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._last_load_attempt = 0.0
+
+        # Un fallo al arrancar no debe detener el proceso: se reintenta al usarlo
+        self._try_load()
+
+    def load(self):
+        """Carga el catálogo completo desde la base de datos"""
+        with self.db_manager.engine.connect() as conn:
+            rows = conn.execute(select(ItemCatalog.id, ItemCatalog.name)).all()
+
+        with self._lock:
+            for item_id, name in rows:
+                self._store(item_id, name)
+            self._loaded = True
+
+        self.logger.info(f"Catálogo de items cargado: {len(rows)} items")
+
+    def _try_load(self) -> bool:
+        """Carga el catálogo si aún no se pudo (como mucho una vez cada _LOAD_RETRY_INTERVAL)"""
+        if self._loaded:
+            return True
+        now = time.monotonic()
+        if self._last_load_attempt and now - self._last_load_attempt < _LOAD_RETRY_INTERVAL:
+            return False
+        self._last_load_attempt = now
+        try:
+            self.load()
+            return True
+        except Exception as e:
+            self.logger.error(f"No se pudo cargar el catálogo de items (se reintentará): {e}")
+            return False
+
+    def _store(self, item_id: int, name: str):
+        """Guarda un id en los índices en memoria (requiere el lock)"""
+        name = sys.intern(name)
+        self._ids[name] = item_id
+        if item_id >= len(self._names):
+            self._names.extend([None] * (item_id + 1 - len(self._names)))
+        self._names[item_id] = name
+
+    def _insert_names(self, session, names: List[str]) -> List[Tuple[int, str]]:
+        """Transacción de escritura de _register: inserta los nombres y lee sus ids"""
+        try:
+            rows = []
+            for start in range(0, len(names), _LOOKUP_CHUNK):
+                chunk = names[start:start + _LOOKUP_CHUNK]
+                session.execute(
+                    self.db_manager.insert_ignore(ItemCatalog.__table__),
+                    [{'name': name} for name in chunk]
+                )
+                # Otro proceso pudo registrar el nombre antes: leer siempre el id real
+                rows.extend(session.execute(
+                    select(ItemCatalog.id, ItemCatalog.name).where(ItemCatalog.name.in_(chunk))
+                ).all())
+            session.commit()
+            return rows
+        except Exception:
+            session.rollback()
+            raise
+
+    def _register(self, names: List[str]):
+        """
+        Registra nombres nuevos en la base de datos y carga sus ids
+
+        Raises:
+            ItemRegistryError: si la base de datos no está disponible
+        """
+        self._try_load()
+        with self._lock:
+            names = [name for name in names if name not in self._ids]
+            if not names:
+                return
+
+            try:
+                # Mediante el escritor único: en SQLite ajustado no compite por el lock
+                rows = self.db_manager.run_write(lambda session: self._insert_names(session, names))
+            except Exception as e:
+                raise ItemRegistryError(
+                    f"Error registrando {len(names)} items en el catálogo: {e}"
+                ) from e
+
+            for item_id, name in rows:
+                self._store(item_id, name)
+
+    def get_id(self, name: str) -> int:
+        """Obtiene (o registra) el id de un nombre"""
+        if not name:
+            return MISSING_ITEM_ID
+
+        item_id = self._ids.get(name)
+        if item_id is None:
+            self._register([name])
+            item_id = self._ids[name]
+        return item_id
+
+    def get_ids(self, names: Iterable[str]) -> np.ndarray:
+        """Obtiene los ids de una secuencia de nombres registrando los nuevos en un solo lote"""
+        names = names if isinstance(names, list) else list(names)
+        ids = self._ids
+
+        missing = [name for name in dict.fromkeys(names) if name and name not in ids]
+        if missing:
+            self._register(missing)
+
+        return np.fromiter(
+            (ids[name] if name else MISSING_ITEM_ID for name in names),
+            dtype=ITEM_ID_DTYPE,
+            count=len(names)
+        )
+
+    def find_id(self, name: str) -> Optional[int]:
+        """Busca el id de un nombre sin registrarlo (consulta la DB si no está en memoria)"""
+        item_id = self._ids.get(name)
+        if item_id is not None or not name:
+            return item_id
+
+        # Puede haberlo registrado otro proceso después de la carga inicial
+        self._try_load()
+        item_id = self._ids.get(name)
+        if item_id is not None:
+            return item_id
+        with self.db_manager.engine.connect() as conn:
+            item_id = conn.execute(
+                select(ItemCatalog.id).where(ItemCatalog.name == name)
+            ).scalar()
+
+        if item_id is not None:
+            with self._lock:
+                self._store(item_id, name)
+        return item_id
+
+    def get_name(self, item_id: int) -> str:
+        """Obtiene el nombre de un id"""
+        return self.get_names(np.array([item_id], dtype=ITEM_ID_DTYPE))[0]
+
+    def get_names(self, item_ids: np.ndarray) -> List[str]:
+        """
+        Obtiene los nombres de un array de ids
+
+        Los ids registrados por otro proceso después de la carga inicial (p.
+        ej. los de un snapshot leído de disco) se buscan en la base de datos
+        la primera vez que se piden.
+        """
+        ids = item_ids.tolist()
+        names = self._names
+        try:
+            result = [names[item_id] if item_id >= 0 else '' for item_id in ids]
+            if None not in result:
+                return result
+        except IndexError:
+            pass
+
+        self._load_ids(ids)
+        names = self._names
+        return [(names[item_id] or '') if item_id >= 0 else '' for item_id in ids]
+
+    def _load_ids(self, item_ids: List[int]):
+        """Carga desde item_catalog los ids que aún no están en memoria"""
+        with self._lock:
+            names = self._names
+            missing = sorted({
+                item_id for item_id in item_ids
+                if item_id >= 0 and (item_id >= len(names) or names[item_id] is None)
+            })
+        if not missing:
+            return
+
+        with self.db_manager.engine.connect() as conn:
+            rows = []
+            for start in range(0, len(missing), _LOOKUP_CHUNK):
+                rows.extend(conn.execute(
+                    select(ItemCatalog.id, ItemCatalog.name)
+                    .where(ItemCatalog.id.in_(missing[start:start + _LOOKUP_CHUNK]))
+                ).all())
+
+        with self._lock:
+            for item_id, name in rows:
+                self._store(item_id, name)
+            # Ids que no existen en el catálogo: quedan sin nombre ('')
+            if missing[-1] >= len(self._names):
+                self._names.extend([None] * (missing[-1] + 1 - len(self._names)))
+
+    def __len__(self) -> int:
+        """Tamaño del espacio de ids (id máximo + 1), útil para arrays densos"""
+        return len(self._names)
+
+
+# Singleton del registro de items
+_item_registry = None
+
+def get_item_registry() -> ItemRegistry:
+    """Obtiene la instancia singleton del ItemRegistry"""
+    global _item_registry
+    if _item_registry is None:
+        _item_registry = ItemRegistry()
+    return _item_registry
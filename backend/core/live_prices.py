@@ -0,0 +1,167 @@
+# backend/core/live_prices.py
+
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+from .event_bus import EventBus, get_event_bus, SNAPSHOT_DIFF
+from .snapshot_diff import SnapshotDiff, price_by_item
+from .snapshot_store import get_snapshot_store
+
+
+def take_prices(prices: np.ndarray, item_ids: np.ndarray) -> np.ndarray:
+    """Precios de un array denso para unos ids (0 para ids fuera del array)"""
+    result = np.zeros(len(item_ids), dtype=np.int64)
+    known = item_ids < len(prices)
+    result[known] = prices[item_ids[known]]
+    return result
+
+
+class LivePrices:
+    """
+    Precio actual por item de varias plataformas, con el conjunto de cambios
+
+    Guarda un array denso por plataforma indexado por item_id (milésimas de
+    dólar, 0 = sin precio). refresh() lo pone al día y retorna solo los ids
+    que cambiaron desde la llamada anterior:
+
+    - Los SnapshotDiff publicados por los scrapers del mismo proceso se
+      aplican directamente (coste proporcional a los cambios).
+    - Para los scrapers de otros procesos se compara la versión del
+      manifiesto y, si cambió, el array denso nuevo con el anterior.
+
+    Como en price_by_item, si un item aparece varias veces en un snapshot
+    se toma el precio más bajo.
+    """
+
+    def __init__(self, platforms: Iterable[str], event_bus: Optional[EventBus] = None):
+        self.platforms = tuple(platforms)
+        self.event_bus = event_bus or get_event_bus()
+        self.snapshot_store = get_snapshot_store()
+        self.logger = logger.bind(service="LivePrices")
+
+        # Estado: precios por item y versión del manifiesto aplicada
+        self._prices: Dict[str, np.ndarray] = {}
+        self._versions: Dict[str, object] = {}
+
+        # Diffs recibidos por el bus pendientes de aplicar
+        self._pending: List[Tuple[SnapshotDiff, object]] = []
+        self._lock = threading.Lock()
+        self._subscribed = False
+
+    def start(self):
+        """Escucha los SnapshotDiff de los scrapers que corren en este proceso"""
+        if not self._subscribed:
+            self.event_bus.subscribe(SNAPSHOT_DIFF, self._on_snapshot_diff)
+            self._subscribed = True
+
+    def stop(self):
+        if self._subscribed:
+            self.event_bus.unsubscribe(SNAPSHOT_DIFF, self._on_snapshot_diff)
+            self._subscribed = False
+
+    def __getitem__(self, platform: str) -> np.ndarray:
+        return self._prices.get(platform, np.zeros(0, dtype=np.int64))
+
+    def take(self, platform: str, item_ids: np.ndarray) -> np.ndarray:
+        """Precios de una plataforma para unos ids (0 = sin precio)"""
+        return take_prices(self[platform], item_ids)
+
+    # ------------------------------------------------------------------
+    # Entrada de cambios
+    # ------------------------------------------------------------------
+
+    def _on_snapshot_diff(self, diff: SnapshotDiff):
+        """Handler del bus: se ejecuta en el hilo del scraper, solo encola"""
+        if diff.platform not in self.platforms:
+            return
+        # El scraper ya guardó el snapshot: esta es la versión que describe el diff
+        version = self.snapshot_store.get_version(diff.platform)
+        with self._lock:
+            self._pending.append((diff, version))
+
+    def refresh(self) -> Dict[str, np.ndarray]:
+        """
+        Aplica los cambios pendientes
+
+        Returns:
+            Ids modificados por plataforma (ordenados, sin repetidos); solo
+            aparecen las plataformas con cambios
+        """
+        with self._lock:
+            pending, self._pending = self._pending, []
+
+        dirty: Dict[str, List[np.ndarray]] = {}
+        stale = set()
+        for diff, version in pending:
+            if not self._apply_diff(diff, version, dirty):
+                stale.add(diff.platform)
+        # Un diff que no partía de nuestro estado deja la plataforma sin versión
+        # aunque un diff posterior sí cuadre: _sync recarga el snapshot completo
+        for platform in stale:
+            self._versions.pop(platform, None)
+        for platform in self.platforms:
+            self._sync(platform, dirty)
+
+        return {platform: np.unique(np.concatenate(parts)) for platform, parts in dirty.items()}
+
+    def _apply_diff(self, diff: SnapshotDiff, version, dirty: Dict[str, List[np.ndarray]]) -> bool:
+        """
+        Aplica un diff sobre los precios en memoria
+
+        Returns:
+            False si el diff no partía del estado en memoria (hay que recargar)
+        """
+        if diff.platform not in self._prices:
+            # Sin estado base todavía: _sync cargará el snapshot completo
+            return True
+
+        ids = np.concatenate((diff.added_ids, diff.changed_ids, diff.removed_ids))
+        prices = self._grow(diff.platform, int(ids.max()) + 1 if len(ids) else 0)
+
+        # Si el diff parte del mismo estado que tenemos, la versión queda al día;
+        # si no, se aplica igualmente y _sync completará la diferencia
+        consistent = (
+            np.array_equal(take_prices(prices, diff.changed_ids), diff.old_prices)
+            and not take_prices(prices, diff.added_ids).any()
+        )
+
+        prices[diff.added_ids] = diff.added_prices
+        prices[diff.changed_ids] = diff.new_prices
+        prices[diff.removed_ids] = 0
+        if len(ids):
+            dirty.setdefault(diff.platform, []).append(ids)
+        if consistent and version is not None:
+            self._versions[diff.platform] = version
+        return consistent
+
+    def _sync(self, platform: str, dirty: Dict[str, List[np.ndarray]]):
+        """Recarga una plataforma si su versión publicada cambió y marca los ids modificados"""
+        version = self.snapshot_store.get_version(platform)
+        if platform in self._prices and version == self._versions.get(platform):
+            return
+
+        old = self[platform]
+        if version is None:
+            new = np.zeros(len(old), dtype=np.int64)
+        else:
+            item_ids, prices = price_by_item(self.snapshot_store.load(platform))
+            new = np.zeros(max(len(old), int(item_ids[-1]) + 1 if len(item_ids) else 0),
+                           dtype=np.int64)
+            new[item_ids] = prices
+
+        changed = np.flatnonzero(take_prices(old, np.arange(len(new))) != new)
+        self._prices[platform] = new
+        self._versions[platform] = version
+        if len(changed):
+            dirty.setdefault(platform, []).append(changed)
+
+    def _grow(self, platform: str, size: int) -> np.ndarray:
+        prices = self._prices[platform]
+        if len(prices) < size:
+            grown = np.zeros(size, dtype=np.int64)
+            grown[:len(prices)] = prices
+            self._prices[platform] = prices = grown
+        return prices
@@ -0,0 +1,81 @@
+# backend/core/name_index.py
+
+import re
+import sys
+import unicodedata
+from typing import Dict, Iterable, List
+
+# Desgastes en el formato de market_hash_name de Steam
+_WEARS = {
+    wear.lower(): wear
+    for wear in ('Factory New', 'Minimal Wear', 'Field-Tested', 'Well-Worn', 'Battle-Scarred')
+}
+
+_SPACES_RE = re.compile(r'\s+')
+_STATTRAK_RE = re.compile(r'stat\s*trak(?:\s*(?:™|\(tm\)))?\s*', re.IGNORECASE)
+_WEAR_RE = re.compile(r'\(([^()]*)\)$')
+
+
+def canonicalize_name(raw: str) -> str:
+    """
+    Convierte un nombre de item al formato canónico (market_hash_name de Steam)
+
+    - Normaliza unicode (NFC) y espacios
+    - Reemplaza '/' por '-' (igual que los scrapers de Steam)
+    - Unifica las variantes de StatTrak™ (StatTrak, Stattrak, StatTrak(TM)...)
+    - Deja un único espacio después de ★
+    - Corrige mayúsculas del desgaste: '(field-tested)' -> '(Field-Tested)'
+    """
+    name = unicodedata.normalize('NFC', raw)
+    name = name.replace('/', '-')
+    name = _SPACES_RE.sub(' ', name).strip()
+    name = _STATTRAK_RE.sub('StatTrak™ ', name)
+
+    if name.startswith('★'):
+        name = '★ ' + name[1:].lstrip()
+
+    wear = _WEAR_RE.search(name)
+    if wear:
+        canonical_wear = _WEARS.get(wear.group(1).strip().lower())
+        if canonical_wear:
+            name = f"{name[:wear.start()].rstrip()} ({canonical_wear})"
+
+    return name
+
+
+class NameIndex:
+    """
+    Índice nombre original -> nombre canónico
+
+    Cada nombre distinto se normaliza una sola vez; los ciclos siguientes
+    solo hacen una búsqueda en el diccionario.
+    """
+
+    def __init__(self):
+        self._canonical: Dict[str, str] = {}
+
+    def canonical(self, raw: str) -> str:
+        """Obtiene el nombre canónico de un nombre original"""
+        name = self._canonical.get(raw)
+        if name is None:
+            name = sys.intern(canonicalize_name(raw))
+            self._canonical[raw] = name
+        return name
+
+    def canonical_many(self, names: Iterable[str]) -> List[str]:
+        """Obtiene los nombres canónicos de una secuencia de nombres"""
+        return [self.canonical(name) for name in names]
+
+    def __len__(self) -> int:
+        return len(self._canonical)
+
+
+# Singleton del índice de nombres
+_name_index = None
+
+def get_name_index() -> NameIndex:
+    """Obtiene la instancia singleton del NameIndex"""
+    global _name_index
+    if _name_index is None:
+        _name_index = NameIndex()
+    return _name_index
@@ -0,0 +1,123 @@
+# backend/core/price_record.py
+
+import math
+import sys
+import time
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+from .name_index import get_name_index
+
+# Unidades menores por dólar: los precios se guardan en milésimas de dólar
+MINOR_UNITS = 1000
+
+
+class PriceRecord(NamedTuple):
+    """
+    Registro compacto de precio emitido por los scrapers
+
+    El precio se parsea una sola vez al crear el registro y se guarda como
+    entero en milésimas de dólar. Validación, base de datos y rentabilidad
+    trabajan sobre este entero sin volver a convertir strings.
+    """
+    name: str
+    price_minor: Optional[int]  # None si el precio original no se pudo parsear
+    source: str
+    timestamp: float
+    url: Optional[str] = None
+
+    @property
+    def price(self) -> float:
+        """Precio en dólares"""
+        return from_minor(self.price_minor)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convierte al formato JSON histórico {'Item', 'Price', 'URL'}"""
+        data = {'Item': self.name, 'Price': self.price}
+        if self.url:
+            data['URL'] = self.url
+        return data
+
+
+def to_minor(value: Any) -> Optional[int]:
+    """
+    Convierte un precio en dólares (str, int o float) a milésimas de dólar
+
+    Acepta coma como separador decimal. Retorna None si no es un número finito.
+    """
+    if value is None or isinstance(value, bool):
+        return None
+
+    if isinstance(value, int):
+        return value * MINOR_UNITS
+
+    try:
+        if isinstance(value, str):
+            value = float(value.strip().replace(',', '.'))
+        else:
+            value = float(value)
+    except (ValueError, TypeError):
+        return None
+
+    if not math.isfinite(value):
+        return None
+
+    return int(round(value * MINOR_UNITS))
+
+
+def from_minor(price_minor: Optional[int]) -> float:
+    """Convierte milésimas de dólar a dólares"""
+    if price_minor is None:
+        return 0.0
+    return price_minor / MINOR_UNITS
+
+
+def make_record(name: str,
+                source: str,
+                price: Any = None,
+                price_minor: Optional[int] = None,
+                url: Optional[str] = None,
+                timestamp: Optional[float] = None) -> PriceRecord:
+    """
+    Crea un PriceRecord parseando el precio una única vez
+
+    Args:
+        name: Nombre del item (se convierte al nombre canónico internalizado)
+        source: Plataforma de origen
+        price: Precio en dólares en cualquier formato (se ignora si hay price_minor)
+        price_minor: Precio ya expresado en milésimas de dólar
+        url: URL opcional del item
+        timestamp: Momento de la observación (None = ahora)
+    """
+    if price_minor is None:
+        price_minor = to_minor(price)
+    else:
+        price_minor = int(price_minor)
+
+    return PriceRecord(
+        name=get_name_index().canonical(name) if isinstance(name, str) and name else name,
+        price_minor=price_minor,
+        source=source,
+        timestamp=timestamp if timestamp is not None else time.time(),
+        url=url or None
+    )
+
+
+def record_from_dict(item: Dict[str, Any], source: str,
+                     timestamp: Optional[float] = None) -> PriceRecord:
+    """Convierte un item en formato JSON histórico a PriceRecord"""
+    return make_record(
+        item.get('Item', ''),
+        source,
+        price=item.get('Price'),
+        url=item.get('URL') or item.get('url'),
+        timestamp=timestamp
+    )
+
+
+def records_from_dicts(items: Iterable[Dict[str, Any]], source: str,
+                       timestamp: Optional[float] = None) -> List[PriceRecord]:
+    """Convierte una lista de items JSON a PriceRecords compartiendo timestamp"""
+    if timestamp is None:
+        timestamp = time.time()
+    source = sys.intern(source)
+    return [record_from_dict(item, source, timestamp) for item in items]
@@ -0,0 +1,326 @@
+# backend/core/price_table.py
+
+import os
+import struct
+import sys
+import time
+import zlib
+from multiprocessing import shared_memory
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+from .config_manager import get_config_manager
+from .snapshot import PriceSnapshot
+from .snapshot_diff import price_by_item
+from .snapshot_store import get_snapshot_store
+
+# Plataformas con columna en la tabla (el orden define el layout en memoria)
+PLATFORMS = (
+    'steam', 'steammarket', 'steamlisting',
+    'waxpeer', 'csdeals', 'empire', 'skinport', 'manncostore', 'cstrade',
+    'bitskins', 'tradeit', 'marketcsgo', 'skinout', 'skindeck', 'white',
+    'lisskins', 'shadowpay', 'rapidskins', 'offlinetest'
+)
+
+# Cabecera: magic, nº de plataformas, hash del layout, capacidad (ids)
+_MAGIC = b'CSPRICE1'
+_HEADER = struct.Struct('<8sIIQ')
+_HEADER_SIZE = 64
+
+# Reintentos de lectura mientras un escritor está actualizando la plataforma: los
+# primeros _SPIN_RETRIES solo ceden el procesador, el resto duerme _BACKOFF segundos
+_MAX_READ_RETRIES = 1000
+_SPIN_RETRIES = 50
+_BACKOFF = 0.001
+
+# Espera máxima a otra escritura de la misma fila antes de darla por interrumpida
+_WRITER_WAIT = 1.0
+
+
+def _layout_hash() -> int:
+    return zlib.crc32(','.join(PLATFORMS).encode('ascii'))
+
+
+def _open_shared_memory(name: str, create: bool, size: int = 0) -> shared_memory.SharedMemory:
+    """
+    Abre un bloque de memoria compartida sin que el resource_tracker lo borre
+    al terminar el proceso que lo creó (la tabla debe sobrevivir a los scrapers)
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, create=create, size=size, track=False)
+
+    shm = shared_memory.SharedMemory(name=name, create=create, size=size)
+    if os.name != 'nt':
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(shm._name, 'shared_memory')
+    return shm
+
+
+class SharedPriceTable:
+    """
+    Tabla de precios en memoria compartida indexada por (plataforma, item_id)
+
+    Los scrapers publican su último snapshot en la fila de su plataforma; el
+    servidor web, el analizador y la GUI leen directamente de la memoria
+    compartida sin tocar disco ni base de datos.
+
+    Cada plataforma tiene un seqlock: el escritor incrementa el contador
+    (impar = escribiendo), actualiza la fila y lo vuelve a incrementar. Los
+    lectores repiten la lectura si el contador era impar o cambió; si un
+    escritor no termina, la lectura lanza TimeoutError.
+
+    Cada fila tiene un solo escritor habitual (el scraper de la plataforma).
+    La excepción es restore(), que solo escribe filas con contador 0; si
+    publish() encuentra una escritura en curso, espera a que termine.
+
+    Layout:
+        cabecera (64 bytes) | seq uint64[P] | timestamps float64[P]
+                            | precios int64[P, capacidad] (0 = sin precio)
+
+    Vida del bloque: en Linux/macOS persiste hasta unlink() o el reinicio;
+    en Windows el sistema lo libera al cerrarse el último proceso que lo
+    tiene abierto (un scraper con --once, por ejemplo). Los procesos de
+    larga duración (servidor web, monitores) lo abren al arrancar para
+    mantenerlo vivo y, si aun así hay que crearlo de nuevo, get_price_table()
+    rellena las filas vacías con los últimos snapshots guardados en disco.
+    """
+
+    def __init__(self, name: str = 'csgo_prices', capacity: int = 100_000, create: bool = True):
+        self.logger = logger.bind(service="SharedPriceTable")
+        self.name = name
+        self.platform_index = {platform: index for index, platform in enumerate(PLATFORMS)}
+        # Plataformas ya avisadas por superar la capacidad (un aviso por ejecución)
+        self._capacity_warned = set()
+
+        count = len(PLATFORMS)
+        try:
+            self._shm = _open_shared_memory(name, create=False)
+            created = False
+        except FileNotFoundError:
+            if not create:
+                raise
+            size = _HEADER_SIZE + count * 16 + count * capacity * 8
+            try:
+                self._shm = _open_shared_memory(name, create=True, size=size)
+                created = True
+            except FileExistsError:
+                # Otro proceso la creó al mismo tiempo
+                self._shm = _open_shared_memory(name, create=False)
+                created = False
+
+        buffer = self._shm.buf
+        if created:
+            _HEADER.pack_into(buffer, 0, _MAGIC, count, _layout_hash(), capacity)
+        else:
+            # Dar tiempo al creador a escribir la cabecera
+            for _ in range(100):
+                if bytes(buffer[:len(_MAGIC)]) == _MAGIC:
+                    break
+                time.sleep(0.01)
+
+        magic, platforms, layout, capacity = _HEADER.unpack_from(buffer, 0)
+        if magic != _MAGIC or platforms != count or layout != _layout_hash():
+            self._shm.close()
+            raise ValueError(f"La memoria compartida '{name}' tiene un layout distinto")
+
+        self.capacity = capacity
+        self.created = created
+        offset = _HEADER_SIZE
+        self._seq = np.ndarray((count,), dtype=np.uint64, buffer=buffer, offset=offset)
+        offset += count * 8
+        self._timestamps = np.ndarray((count,), dtype=np.float64, buffer=buffer, offset=offset)
+        offset += count * 8
+        self._prices = np.ndarray((count, capacity), dtype=np.int64, buffer=buffer, offset=offset)
+
+        if created:
+            self.logger.info(f"Tabla de precios compartida '{name}' creada ({capacity} items)")
+
+    # ------------------------------------------------------------------
+    # Escritura (scrapers)
+    # ------------------------------------------------------------------
+
+    def publish(self, snapshot: PriceSnapshot) -> bool:
+        """Reemplaza la fila de la plataforma con los precios del snapshot"""
+        index = self.platform_index.get(snapshot.platform)
+        if index is None:
+            return False
+
+        item_ids, prices = self._row_values(snapshot)
+        self._wait_for_writer(index)
+        self._write_row(index, item_ids, prices, snapshot.timestamp)
+        return True
+
+    def _row_values(self, snapshot: PriceSnapshot) -> Tuple[np.ndarray, np.ndarray]:
+        """(item_ids, precios) del snapshot que caben en la tabla (sin precios inválidos)"""
+        item_ids, prices = price_by_item(snapshot)
+        # 0 = sin precio: los precios sin parsear (INVALID_PRICE) no se publican
+        valid = prices > 0
+        item_ids, prices = item_ids[valid], prices[valid]
+        in_range = item_ids < self.capacity
+        if not in_range.all():
+            if snapshot.platform not in self._capacity_warned:
+                self._capacity_warned.add(snapshot.platform)
+                self.logger.warning(
+                    f"{int((~in_range).sum())} items de {snapshot.platform} superan la capacidad "
+                    f"de la tabla compartida ({self.capacity}); se omiten (no se volverá a avisar)"
+                )
+            item_ids, prices = item_ids[in_range], prices[in_range]
+        return item_ids, prices
+
+    def _wait_for_writer(self, index: int):
+        """
+        Espera a que termine otra escritura de la fila (p. ej. un restore())
+
+        Si el contador sigue impar pasado _WRITER_WAIT, el escritor anterior
+        terminó a mitad de escritura (proceso cerrado): se reinicia el seqlock.
+        """
+        deadline = time.monotonic() + _WRITER_WAIT
+        while self._seq[index] & 1:
+            if time.monotonic() >= deadline:
+                self._seq[index] += 1
+                break
+            time.sleep(_BACKOFF)
+
+    def _write_row(self, index: int, item_ids: np.ndarray, prices: np.ndarray, timestamp: float):
+        """Escribe la fila de una plataforma dentro del seqlock"""
+        row = self._prices[index]
+        self._seq[index] += 1  # impar: escritura en curso
+        row[:] = 0
+        row[item_ids] = prices
+        self._timestamps[index] = timestamp
+        self._seq[index] += 1  # par: fila consistente
+
+    def restore(self, snapshot_store) -> int:
+        """
+        Rellena las filas que nadie ha publicado con los snapshots en disco
+
+        Se usa al crear de nuevo la tabla (por ejemplo en Windows, después de
+        que se cerrara el último proceso que la tenía abierta). Las filas con
+        versión distinta de 0 ya las publicó (o las está publicando) un
+        scraper y no se tocan. Los precios se preparan antes de tomar la
+        fila, así que la escritura dura solo la copia a memoria compartida.
+
+        Returns:
+            Número de plataformas restauradas
+        """
+        restored = 0
+        for platform, index in self.platform_index.items():
+            if self._seq[index] or snapshot_store.get_version(platform) is None:
+                continue
+            try:
+                snapshot = snapshot_store.load(platform)
+            except Exception as e:
+                self.logger.warning(f"No se pudo restaurar {platform}: {e}")
+                continue
+            item_ids, prices = self._row_values(snapshot)
+            # Un scraper pudo publicar mientras se cargaba: su fila es más reciente
+            if self._seq[index]:
+                continue
+            self._write_row(index, item_ids, prices, snapshot.timestamp)
+            restored += 1
+        if restored:
+            self.logger.info(f"Tabla compartida restaurada desde disco ({restored} plataformas)")
+        return restored
+
+    # ------------------------------------------------------------------
+    # Lectura (web, analizador, GUI)
+    # ------------------------------------------------------------------
+
+    def _read(self, index: int, reader):
+        """
+        Ejecuta reader() con el seqlock de una plataforma
+
+        Puede esperar hasta ~1 s a un escritor: desde código async llamarlo
+        en un hilo (asyncio.to_thread).
+
+        Raises:
+            TimeoutError: si la fila no queda consistente tras los reintentos
+        """
+        seq = self._seq
+        for attempt in range(_MAX_READ_RETRIES):
+            before = int(seq[index])
+            if not before & 1:
+                value = reader()
+                if int(seq[index]) == before:
+                    return value
+            time.sleep(0 if attempt < _SPIN_RETRIES else _BACKOFF)
+        raise TimeoutError(f"Lectura de {PLATFORMS[index]} interrumpida por escrituras continuas")
+
+    def version(self, platform: str) -> int:
+        """Contador de versiones de la plataforma (cambia en cada publicación)"""
+        return int(self._seq[self.platform_index[platform]])
+
+    def get_price(self, item_id: int, platform: str) -> Optional[int]:
+        """Precio actual en milésimas de dólar (None si no hay precio)"""
+        index = self.platform_index.get(platform)
+        if index is None or not 0 <= item_id < self.capacity:
+            return None
+        price = self._read(index, lambda: int(self._prices[index, item_id]))
+        return price or None
+
+    def get_prices(self, item_id: int) -> Dict[str, int]:
+        """Precios actuales de un item en todas las plataformas"""
+        if not 0 <= item_id < self.capacity:
+            return {}
+        prices = {}
+        for platform, index in self.platform_index.items():
+            price = self._read(index, lambda: int(self._prices[index, item_id]))
+            if price:
+                prices[platform] = price
+        return prices
+
+    def read_platform(self, platform: str) -> Tuple[np.ndarray, float]:
+        """Copia consistente de la fila de una plataforma: (precios por id, timestamp)"""
+        index = self.platform_index[platform]
+        return self._read(index, lambda: (self._prices[index].copy(), float(self._timestamps[index])))
+
+    def view(self, platform: str) -> np.ndarray:
+        """
+        Vista sin copia de la fila de una plataforma
+
+        Puede cambiar mientras se lee; comparar version() antes y después si
+        se necesita consistencia.
+        """
+        return self._prices[self.platform_index[platform]]
+
+    def close(self):
+        """Libera la vista de este proceso (la tabla sigue existiendo)"""
+        self._seq = self._timestamps = self._prices = None
+        self._shm.close()
+
+    def unlink(self):
+        """Elimina la tabla compartida del sistema"""
+        if sys.version_info < (3, 13) and os.name != 'nt':
+            # unlink() la quita del resource_tracker: registrarla de nuevo para que no falle
+            from multiprocessing import resource_tracker
+            resource_tracker.register(self._shm._name, 'shared_memory')
+        self._shm.unlink()
+
+
+# Singleton de la tabla compartida
+_price_table = None
+_price_table_failed = False
+
+def get_price_table() -> Optional[SharedPriceTable]:
+    """Obtiene la tabla compartida configurada en settings['shared_memory'] (None si no está disponible)"""
+    global _price_table, _price_table_failed
+    if _price_table is None and not _price_table_failed:
+        settings = get_config_manager().settings.get('shared_memory', {})
+        if not settings.get('enabled', True):
+            _price_table_failed = True
+            return None
+        try:
+            _price_table = SharedPriceTable(
+                settings.get('name', 'csgo_prices'),
+                settings.get('capacity', 100_000)
+            )
+        except Exception as e:
+            _price_table_failed = True
+            logger.warning(f"Tabla de precios compartida no disponible: {e}")
+        else:
+            if _price_table.created:
+                # Tabla nueva (primer arranque o liberada por el sistema): partir del disco
+                _price_table.restore(get_snapshot_store())
+    return _price_table
@@ -0,0 +1,166 @@
+# backend/core/snapshot.py
+
+import sys
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+
+from .item_registry import ItemRegistry, get_item_registry, ITEM_ID_DTYPE, MISSING_ITEM_ID
+from .price_record import PriceRecord, from_minor, record_from_dict, MINOR_UNITS
+
+# Precio centinela para items cuyo precio no se pudo parsear
+INVALID_PRICE = np.iinfo(np.int64).min
+
+PRICE_DTYPE = np.int64
+
+
+class PriceSnapshot:
+    """
+    Representación columnar del catálogo de una plataforma
+
+    En lugar de una lista de dicts guarda:
+        item_ids: array int32 con el id global de cada item (ItemRegistry),
+                  MISSING_ITEM_ID si el item no tiene nombre
+        prices: array int64 con el precio en milésimas de dólar
+        url_offsets/url_data: URLs concatenadas en un único string con offsets
+                              (None si la plataforma no da URLs)
+    """
+
+    __slots__ = ('platform', 'timestamp', 'item_ids', 'prices',
+                 'url_offsets', 'url_data', 'registry')
+
+    def __init__(self,
+                 platform: str,
+                 item_ids: np.ndarray,
+                 prices: np.ndarray,
+                 timestamp: Optional[float] = None,
+                 url_offsets: Optional[np.ndarray] = None,
+                 url_data: str = '',
+                 registry: Optional[ItemRegistry] = None):
+        self.platform = platform
+        self.timestamp = timestamp if timestamp is not None else time.time()
+        self.item_ids = np.asarray(item_ids, dtype=ITEM_ID_DTYPE)
+        self.prices = np.asarray(prices, dtype=PRICE_DTYPE)
+        self.url_offsets = url_offsets
+        self.url_data = url_data
+        self.registry = registry or get_item_registry()
+
+    # ------------------------------------------------------------------
+    # Construcción
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_records(cls, platform: str, records: List[PriceRecord],
+                     timestamp: Optional[float] = None,
+                     registry: Optional[ItemRegistry] = None) -> 'PriceSnapshot':
+        """Construye un snapshot a partir de PriceRecords"""
+        registry = registry or get_item_registry()
+        count = len(records)
+
+        item_ids = registry.get_ids([record.name for record in records])
+        prices = np.fromiter(
+            (INVALID_PRICE if record.price_minor is None else record.price_minor
+             for record in records),
+            dtype=PRICE_DTYPE,
+            count=count
+        )
+
+        url_offsets = None
+        url_data = ''
+        if any(record.url for record in records):
+            urls = [record.url or '' for record in records]
+            url_offsets = np.zeros(count + 1, dtype=np.int64)
+            np.cumsum([len(url) for url in urls], out=url_offsets[1:])
+            url_data = ''.join(urls)
+
+        if timestamp is None:
+            timestamp = records[0].timestamp if records else time.time()
+
+        return cls(platform, item_ids, prices, timestamp,
+                   url_offsets, url_data, registry)
+
+    @classmethod
+    def from_dicts(cls, platform: str, items: List[Dict[str, Any]],
+                   timestamp: Optional[float] = None) -> 'PriceSnapshot':
+        """Construye un snapshot a partir del formato JSON histórico"""
+        if timestamp is None:
+            timestamp = time.time()
+        source = sys.intern(platform)
+        records = [record_from_dict(item, source, timestamp) for item in items]
+        return cls.from_records(platform, records, timestamp)
+
+    @classmethod
+    def empty(cls, platform: str) -> 'PriceSnapshot':
+        """Snapshot vacío"""
+        return cls(platform,
+                   np.empty(0, dtype=ITEM_ID_DTYPE),
+                   np.empty(0, dtype=PRICE_DTYPE))
+
+    # ------------------------------------------------------------------
+    # Acceso
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.item_ids)
+
+    @property
+    def names(self) -> List[str]:
+        """Nombres de los items en el orden del snapshot"""
+        return self.registry.get_names(self.item_ids)
+
+    def prices_dollars(self) -> np.ndarray:
+        """Precios en dólares como float64"""
+        return self.prices / MINOR_UNITS
+
+    def url(self, index: int) -> Optional[str]:
+        """URL del item en la posición index"""
+        if self.url_offsets is None:
+            return None
+        start, end = self.url_offsets[index], self.url_offsets[index + 1]
+        return self.url_data[start:end] or None
+
+    def take(self, selector: np.ndarray) -> 'PriceSnapshot':
+        """Retorna un nuevo snapshot con las filas seleccionadas (máscara o índices)"""
+        indices = np.flatnonzero(selector) if selector.dtype == bool else selector
+
+        url_offsets = None
+        url_data = ''
+        if self.url_offsets is not None:
+            urls = [self.url(i) or '' for i in indices.tolist()]
+            url_offsets = np.zeros(len(urls) + 1, dtype=np.int64)
+            np.cumsum([len(url) for url in urls], out=url_offsets[1:])
+            url_data = ''.join(urls)
+
+        return PriceSnapshot(self.platform,
+                             self.item_ids[indices],
+                             self.prices[indices],
+                             self.timestamp,
+                             url_offsets, url_data, self.registry)
+
+    def iter_records(self) -> Iterator[PriceRecord]:
+        """Itera el snapshot como PriceRecords"""
+        source = sys.intern(self.platform)
+        for index, (name, price) in enumerate(zip(self.names, self.prices.tolist())):
+            yield PriceRecord(
+                name=name,
+                price_minor=None if price == INVALID_PRICE else price,
+                source=source,
+                timestamp=self.timestamp,
+                url=self.url(index)
+            )
+
+    def to_records(self) -> List[PriceRecord]:
+        """Convierte el snapshot a una lista de PriceRecords"""
+        return list(self.iter_records())
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Convierte al formato JSON histórico {'Item', 'Price', 'URL'}"""
+        items = []
+        for index, (name, price) in enumerate(zip(self.names, self.prices.tolist())):
+            item = {'Item': name, 'Price': from_minor(None if price == INVALID_PRICE else price)}
+            url = self.url(index)
+            if url:
+                item['URL'] = url
+            items.append(item)
+        return items
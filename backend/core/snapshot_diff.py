@@ -0,0 +1,212 @@
+# backend/core/snapshot_diff.py
+
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+from .config_manager import get_config_manager
+from .item_registry import ITEM_ID_DTYPE, MISSING_ITEM_ID
+from .snapshot import PriceSnapshot, PRICE_DTYPE
+from .snapshot_store import atomic_write
+
+_EMPTY_IDS = np.empty(0, dtype=ITEM_ID_DTYPE)
+_EMPTY_PRICES = np.empty(0, dtype=PRICE_DTYPE)
+
+
+@dataclass
+class SnapshotDiff:
+    """
+    Cambios entre dos snapshots consecutivos de una plataforma
+
+    Todos los arrays están ordenados por item_id. Los precios están en
+    milésimas de dólar.
+    """
+    platform: str
+    timestamp: float
+    added_ids: np.ndarray
+    added_prices: np.ndarray
+    removed_ids: np.ndarray
+    changed_ids: np.ndarray
+    old_prices: np.ndarray
+    new_prices: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.added_ids) + len(self.removed_ids) + len(self.changed_ids)
+
+    def summary(self) -> str:
+        return (f"{self.platform}: +{len(self.added_ids)} -{len(self.removed_ids)} "
+                f"~{len(self.changed_ids)}")
+
+
+def price_by_item(snapshot: PriceSnapshot) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Precio por item de un snapshot (ordenado por id)
+
+    Si un item aparece varias veces se toma el precio más bajo, que es el
+    precio de compra relevante.
+    """
+    valid = snapshot.item_ids != MISSING_ITEM_ID
+    item_ids = snapshot.item_ids[valid]
+    prices = snapshot.prices[valid]
+
+    order = np.lexsort((prices, item_ids))
+    item_ids = item_ids[order]
+    prices = prices[order]
+
+    first = np.ones(len(item_ids), dtype=bool)
+    first[1:] = item_ids[1:] != item_ids[:-1]
+    return item_ids[first], prices[first]
+
+
+def diff_snapshots(old: Optional[PriceSnapshot], new: PriceSnapshot) -> SnapshotDiff:
+    """Compara dos snapshots de la misma plataforma por item_id (vectorizado)"""
+    new_ids, new_prices = price_by_item(new)
+
+    if old is None:
+        old_ids, old_prices = _EMPTY_IDS, _EMPTY_PRICES
+    else:
+        old_ids, old_prices = price_by_item(old)
+
+    common, old_index, new_index = np.intersect1d(
+        old_ids, new_ids, assume_unique=True, return_indices=True
+    )
+    changed = old_prices[old_index] != new_prices[new_index]
+
+    added = ~np.isin(new_ids, common, assume_unique=True)
+    removed = ~np.isin(old_ids, common, assume_unique=True)
+
+    return SnapshotDiff(
+        platform=new.platform,
+        timestamp=new.timestamp,
+        added_ids=new_ids[added],
+        added_prices=new_prices[added],
+        removed_ids=old_ids[removed],
+        changed_ids=common[changed],
+        old_prices=old_prices[old_index][changed],
+        new_prices=new_prices[new_index][changed]
+    )
+
+
+class DeltaLog:
+    """
+    Histórico compacto de snapshots: checkpoints completos cada N ejecuciones
+    y deltas (SnapshotDiff) entre ellos
+
+    Estructura en disco:
+        <base>/<plataforma>/00000001.checkpoint.npz
+        <base>/<plataforma>/00000002.delta.npz
+        ...
+    Al escribir un checkpoint se borran los archivos anteriores al checkpoint
+    previo, de modo que siempre quedan al menos dos cadenas completas.
+    """
+
+    _FILE_RE = re.compile(r'^(\d{8})\.(checkpoint|delta)\.npz$')
+
+    def __init__(self, base_path: Path, checkpoint_interval: int = 20):
+        self.base_path = Path(base_path)
+        self.checkpoint_interval = max(1, checkpoint_interval)
+        self.logger = logger.bind(service="DeltaLog")
+
+    def _files(self, platform: str):
+        """Archivos del histórico de una plataforma ordenados por secuencia"""
+        directory = self.base_path / platform
+        if not directory.exists():
+            return []
+        files = []
+        for path in directory.iterdir():
+            match = self._FILE_RE.match(path.name)
+            if match:
+                files.append((int(match.group(1)), match.group(2), path))
+        return sorted(files)
+
+    def append(self, snapshot: PriceSnapshot, diff: SnapshotDiff) -> Path:
+        """Registra una ejecución: checkpoint si toca, delta en caso contrario"""
+        files = self._files(snapshot.platform)
+        sequence = files[-1][0] + 1 if files else 1
+
+        last_checkpoint = next(
+            (seq for seq, kind, _ in reversed(files) if kind == 'checkpoint'), None
+        )
+        is_checkpoint = last_checkpoint is None or sequence - last_checkpoint >= self.checkpoint_interval
+
+        directory = self.base_path / snapshot.platform
+        if is_checkpoint:
+            item_ids, prices = price_by_item(snapshot)
+            path = directory / f"{sequence:08d}.checkpoint.npz"
+            atomic_write(path, lambda f: np.savez(
+                f, timestamp=snapshot.timestamp, item_ids=item_ids, prices=prices
+            ), binary=True)
+            self._prune(files, last_checkpoint)
+        else:
+            path = directory / f"{sequence:08d}.delta.npz"
+            atomic_write(path, lambda f: np.savez(
+                f, timestamp=diff.timestamp,
+                added_ids=diff.added_ids, added_prices=diff.added_prices,
+                removed_ids=diff.removed_ids,
+                changed_ids=diff.changed_ids, new_prices=diff.new_prices
+            ), binary=True)
+
+        return path
+
+    def _prune(self, files, last_checkpoint: Optional[int]):
+        """Borra los archivos anteriores al checkpoint previo"""
+        if last_checkpoint is None:
+            return
+        for sequence, _, path in files:
+            if sequence < last_checkpoint:
+                try:
+                    path.unlink()
+                except OSError as e:
+                    self.logger.warning(f"No se pudo borrar {path}: {e}")
+
+    def replay(self, platform: str) -> Tuple[np.ndarray, np.ndarray, Optional[float]]:
+        """
+        Reconstruye el último estado conocido aplicando los deltas al último checkpoint
+
+        Returns:
+            (item_ids, prices, timestamp) ordenados por id
+        """
+        files = self._files(platform)
+        start = next(
+            (i for i in range(len(files) - 1, -1, -1) if files[i][1] == 'checkpoint'), None
+        )
+        if start is None:
+            return _EMPTY_IDS, _EMPTY_PRICES, None
+
+        with np.load(files[start][2]) as data:
+            state = dict(zip(data['item_ids'].tolist(), data['prices'].tolist()))
+            timestamp = float(data['timestamp'])
+
+        for _, _, path in files[start + 1:]:
+            with np.load(path) as data:
+                for item_id in data['removed_ids'].tolist():
+                    state.pop(item_id, None)
+                state.update(zip(data['added_ids'].tolist(), data['added_prices'].tolist()))
+                state.update(zip(data['changed_ids'].tolist(), data['new_prices'].tolist()))
+                timestamp = float(data['timestamp'])
+
+        item_ids = np.array(sorted(state), dtype=ITEM_ID_DTYPE)
+        prices = np.array([state[item_id] for item_id in item_ids.tolist()], dtype=PRICE_DTYPE)
+        return item_ids, prices, timestamp
+
+
+# Singleton del histórico de deltas
+_delta_log = None
+
+def get_delta_log() -> Optional[DeltaLog]:
+    """Obtiene el DeltaLog configurado en settings['snapshots'] (None si está desactivado)"""
+    global _delta_log
+    if _delta_log is None:
+        config_manager = get_config_manager()
+        settings = config_manager.settings.get('snapshots', {})
+        if not settings.get('delta_log', True):
+            return None
+        _delta_log = DeltaLog(
+            config_manager.json_path / 'history',
+            settings.get('checkpoint_interval', 20)
+        )
+    return _delta_log
@@ -0,0 +1,333 @@
+# backend/core/snapshot_store.py
+
+import json
+import mmap
+import os
+import struct
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+from .config_manager import get_config_manager
+from .item_registry import get_item_registry, ITEM_ID_DTYPE
+from .snapshot import PriceSnapshot, PRICE_DTYPE
+
+# Formatos de snapshot soportados
+FORMAT_BINARY = 'binary'
+FORMAT_JSON = 'json'
+
+_EXTENSIONS = {FORMAT_BINARY: '.snap', FORMAT_JSON: '.json'}
+
+# Cabecera: magic, versión, flags, nº de items, timestamp, bytes de nombres, bytes de URLs
+_MAGIC = b'CSNP'
+_VERSION = 2
+_HEADER = struct.Struct('<4sHHQdQQ')
+
+# La versión 1 no tiene la columna de item_ids (se leen los nombres)
+_SUPPORTED_VERSIONS = (1, 2)
+_FLAG_URLS = 1
+
+# Separador de la tabla de nombres (los market_hash_name no contienen saltos de línea)
+_NAME_SEPARATOR = '\n'
+
+
+class SnapshotStore:
+    """
+    Lectura y escritura de snapshots de plataforma en disco
+
+    El formato binario guarda columnas fijas por item (precio int64 e id
+    int32 de item_catalog) más una tabla de strings con los nombres y, si
+    existen, las URLs con sus offsets. Se lee con mmap sin parsear: precios,
+    ids y offsets se copian directamente a arrays NumPy y los nombres solo
+    se decodifican si hacen falta (archivos v1 o lectores sin catálogo).
+
+    Estructura del archivo <plataforma>_data.snap (v2):
+        cabecera | precios int64[n] | url_offsets int64[n + 1] (opcional)
+                 | item_ids int32[n] | nombres utf-8 separados por '\\n'
+                 | URLs utf-8 concatenadas
+    """
+
+    def __init__(self,
+                 base_path: Optional[Path] = None,
+                 snapshot_format: Optional[str] = None,
+                 json_export: Optional[bool] = None):
+        config_manager = get_config_manager()
+        settings = config_manager.settings.get('snapshots', {})
+
+        self.base_path = Path(base_path) if base_path else config_manager.json_path
+        self.format = snapshot_format or settings.get('format', FORMAT_BINARY)
+        self.json_export = settings.get('json_export', True) if json_export is None else json_export
+        self.logger = logger.bind(service="SnapshotStore")
+
+        if self.format not in _EXTENSIONS:
+            self.logger.warning(f"Formato de snapshot desconocido '{self.format}', usando JSON")
+            self.format = FORMAT_JSON
+
+    def path(self, platform: str, snapshot_format: Optional[str] = None) -> Path:
+        """Ruta del snapshot de una plataforma"""
+        return self.base_path / f"{platform}_data{_EXTENSIONS[snapshot_format or self.format]}"
+
+    # ------------------------------------------------------------------
+    # Escritura
+    # ------------------------------------------------------------------
+
+    def save(self, snapshot: PriceSnapshot) -> Path:
+        """
+        Publica el snapshot en el formato configurado (y el JSON de exportación si aplica)
+
+        Los archivos se escriben de forma atómica y después se incrementa la
+        versión de la plataforma en el manifiesto, de modo que un lector que
+        ve la versión nueva encuentra siempre el archivo completo.
+
+        Returns:
+            Ruta del archivo principal escrito
+        """
+        path = self.path(snapshot.platform)
+
+        if self.format == FORMAT_BINARY:
+            self.write_binary(snapshot, path)
+            if self.json_export:
+                self.write_json(snapshot, self.path(snapshot.platform, FORMAT_JSON))
+        else:
+            self.write_json(snapshot, path)
+
+        self._write_manifest(snapshot, path)
+        return path
+
+    # ------------------------------------------------------------------
+    # Manifiesto de versiones
+    # ------------------------------------------------------------------
+
+    def manifest_path(self, platform: str) -> Path:
+        """
+        Ruta del manifiesto de una plataforma
+
+        Hay un manifiesto por plataforma para que cada scraper (un proceso
+        por plataforma) sea su único escritor y no haga falta bloqueo.
+        """
+        return self.base_path / 'manifests' / f"{platform}.json"
+
+    def read_manifest(self, platform: str) -> Optional[Dict[str, Any]]:
+        """Lee el manifiesto de una plataforma (None si no existe)"""
+        try:
+            with open(self.manifest_path(platform), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            self.logger.warning(f"Manifiesto de {platform} ilegible: {e}")
+            return None
+
+    def get_version(self, platform: str) -> Optional[int]:
+        """
+        Versión publicada de una plataforma
+
+        Para archivos sin manifiesto (generados por versiones anteriores) se
+        usa la fecha de modificación como versión.
+        """
+        manifest = self.read_manifest(platform)
+        if manifest:
+            return manifest['version']
+
+        for snapshot_format in _EXTENSIONS:
+            path = self.path(platform, snapshot_format)
+            if path.exists():
+                return -path.stat().st_mtime_ns
+        return None
+
+    def _write_manifest(self, snapshot: PriceSnapshot, path: Path):
+        """Incrementa la versión de la plataforma tras publicar el snapshot"""
+        previous = self.read_manifest(snapshot.platform)
+        manifest = {
+            'platform': snapshot.platform,
+            'version': (previous['version'] + 1) if previous else 1,
+            'file': path.name,
+            'format': self.format,
+            'items': len(snapshot),
+            'timestamp': snapshot.timestamp
+        }
+        atomic_write(self.manifest_path(snapshot.platform),
+                     lambda f: json.dump(manifest, f, indent=4))
+
+    def write_binary(self, snapshot: PriceSnapshot, path: Path):
+        """Escribe el snapshot en formato binario"""
+        names = _NAME_SEPARATOR.join(snapshot.names).encode('utf-8')
+        has_urls = snapshot.url_offsets is not None
+        urls = snapshot.url_data.encode('utf-8') if has_urls else b''
+
+        header = _HEADER.pack(
+            _MAGIC, _VERSION, _FLAG_URLS if has_urls else 0,
+            len(snapshot), snapshot.timestamp, len(names), len(urls)
+        )
+
+        def write(f):
+            f.write(header)
+            f.write(np.ascontiguousarray(snapshot.prices, dtype='<i8').tobytes())
+            if has_urls:
+                f.write(np.ascontiguousarray(snapshot.url_offsets, dtype='<i8').tobytes())
+            f.write(np.ascontiguousarray(snapshot.item_ids, dtype='<i4').tobytes())
+            f.write(names)
+            f.write(urls)
+
+        atomic_write(path, write, binary=True)
+
+    def write_json(self, snapshot: PriceSnapshot, path: Path):
+        """Escribe el snapshot en el formato JSON histórico"""
+        data = snapshot.to_dicts()
+        atomic_write(path, lambda f: json.dump(data, f, indent=4, ensure_ascii=False))
+
+    # ------------------------------------------------------------------
+    # Lectura
+    # ------------------------------------------------------------------
+
+    def load(self, platform: str) -> PriceSnapshot:
+        """
+        Carga el snapshot de una plataforma
+
+        Prueba primero el formato configurado y luego el otro, para leer
+        archivos generados antes de cambiar la configuración.
+        """
+        formats = [self.format] + [fmt for fmt in _EXTENSIONS if fmt != self.format]
+
+        for snapshot_format in formats:
+            path = self.path(platform, snapshot_format)
+            if not path.exists():
+                continue
+            try:
+                if snapshot_format == FORMAT_BINARY:
+                    return self.read_binary(path, platform)
+                return self.read_json(path, platform)
+            except Exception as e:
+                self.logger.error(f"Error cargando {path.name}: {e}")
+
+        self.logger.warning(f"No se encontró snapshot de {platform}")
+        return PriceSnapshot.empty(platform)
+
+    def read_binary(self, path: Path, platform: str) -> PriceSnapshot:
+        """
+        Lee un snapshot binario mediante mmap
+
+        Los ids salen de la columna item_ids sin tocar los nombres: el
+        ItemRegistry resuelve los nombres solo si alguien los pide. Los
+        archivos v1 (sin ids) se resuelven por nombre.
+        """
+        columns = read_binary_columns(path)
+        registry = get_item_registry()
+        item_ids = columns.item_ids
+        if item_ids is None:
+            item_ids = registry.get_ids(columns.names())
+        return PriceSnapshot(platform, item_ids, columns.prices, columns.timestamp,
+                             columns.url_offsets, columns.url_data, registry)
+
+    def read_json(self, path: Path, platform: str) -> PriceSnapshot:
+        """Lee un snapshot en formato JSON histórico"""
+        with open(path, 'r', encoding='utf-8') as f:
+            return PriceSnapshot.from_dicts(platform, json.load(f), path.stat().st_mtime)
+
+
+def read_binary_header(path: Path) -> Tuple[int, float]:
+    """Número de items y timestamp de un snapshot binario (solo lee la cabecera)"""
+    with open(path, 'rb') as f:
+        magic, version, _, count, timestamp, _, _ = _HEADER.unpack(f.read(_HEADER.size))
+    if magic != _MAGIC or version not in _SUPPORTED_VERSIONS:
+        raise ValueError(f"Formato de snapshot no soportado ({magic!r} v{version})")
+    return count, timestamp
+
+
+@dataclass
+class BinaryColumns:
+    """Columnas de un snapshot binario tal como están en el archivo"""
+    item_ids: Optional[np.ndarray]  # None en archivos v1
+    prices: np.ndarray
+    timestamp: float
+    url_offsets: Optional[np.ndarray]
+    url_data: str
+    names_data: bytes  # Nombres utf-8 sin decodificar
+    count: int
+
+    def names(self) -> List[str]:
+        """Decodifica la tabla de nombres (solo cuando hace falta)"""
+        if not self.count:
+            return []
+        return self.names_data.decode('utf-8').split(_NAME_SEPARATOR)
+
+
+def read_binary_columns(path: Path) -> BinaryColumns:
+    """
+    Columnas de un snapshot binario sin resolver ni decodificar los nombres
+
+    No usa el ItemRegistry ni la base de datos, así que se puede llamar
+    desde procesos auxiliares.
+    """
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        magic, version, flags, count, timestamp, names_size, urls_size = _HEADER.unpack_from(mm)
+        if magic != _MAGIC or version not in _SUPPORTED_VERSIONS:
+            raise ValueError(f"Formato de snapshot no soportado ({magic!r} v{version})")
+
+        offset = _HEADER.size
+        # Se copian los arrays para poder cerrar el mmap: en Windows un
+        # archivo mapeado no se puede reemplazar mientras siga abierto
+        prices = np.frombuffer(mm, dtype='<i8', count=count, offset=offset).astype(PRICE_DTYPE)
+        offset += count * 8
+
+        url_offsets = None
+        if flags & _FLAG_URLS:
+            url_offsets = np.frombuffer(mm, dtype='<i8', count=count + 1, offset=offset).astype(np.int64)
+            offset += (count + 1) * 8
+
+        item_ids = None
+        if version >= 2:
+            item_ids = np.frombuffer(mm, dtype='<i4', count=count, offset=offset).astype(ITEM_ID_DTYPE)
+            offset += count * 4
+
+        names_data = mm[offset:offset + names_size]
+        offset += names_size
+        url_data = mm[offset:offset + urls_size].decode('utf-8')
+
+    return BinaryColumns(item_ids, prices, timestamp, url_offsets, url_data, names_data, count)
+
+
+def atomic_write(path: Path, write, binary: bool = False):
+    """
+    Escribe un archivo de forma atómica (archivo temporal + rename)
+
+    Los lectores ven siempre el archivo anterior completo o el nuevo completo.
+
+    Args:
+        path: Ruta destino
+        write: Función que recibe el archivo abierto y escribe el contenido
+        binary: Abrir en modo binario
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix='.tmp')
+
+    try:
+        if binary:
+            f = os.fdopen(fd, 'wb')
+        else:
+            f = os.fdopen(fd, 'w', encoding='utf-8')
+        with f:
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+# Singleton del almacén de snapshots
+_snapshot_store = None
+
+def get_snapshot_store() -> SnapshotStore:
+    """Obtiene la instancia singleton del SnapshotStore"""
+    global _snapshot_store
+    if _snapshot_store is None:
+        _snapshot_store = SnapshotStore()
+    return _snapshot_store
@@ -0,0 +1,86 @@
+# backend/core/snapshot_watcher.py
+
+import threading
+from typing import Dict, Iterable, Optional
+
+from loguru import logger
+
+from .event_bus import EventBus, get_event_bus, SNAPSHOT_READY, SnapshotReady
+from .price_table import get_price_table
+from .snapshot_store import get_snapshot_store
+
+
+class SnapshotWatcher:
+    """
+    Publica SNAPSHOT_READY para los scrapers que corren en otros procesos
+
+    Los scrapers solo publican en el bus de su propio proceso. Este hilo
+    compara cada `interval` segundos la versión de cada plataforma (el
+    seqlock de la tabla compartida, una lectura de memoria, o el manifiesto
+    del almacén si la tabla no está disponible) y publica el evento en el
+    bus local cuando cambia. No analiza nada: solo despierta a los
+    suscriptores.
+    """
+
+    def __init__(self, platforms: Iterable[str], interval: float = 0.2,
+                 event_bus: Optional[EventBus] = None):
+        self.platforms = tuple(platforms)
+        self.interval = interval
+        self.event_bus = event_bus or get_event_bus()
+        self.snapshot_store = get_snapshot_store()
+        self.price_table = get_price_table()
+        self.logger = logger.bind(service="SnapshotWatcher")
+
+        self._versions: Dict[str, object] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _shared(self, platform: str) -> bool:
+        return self.price_table is not None and platform in self.price_table.platform_index
+
+    def _version(self, platform: str):
+        if self._shared(platform):
+            return self.price_table.version(platform)
+        return self.snapshot_store.get_version(platform)
+
+    def check(self) -> int:
+        """Publica un evento por cada plataforma cuya versión cambió; retorna cuántas"""
+        changed = 0
+        for platform in self.platforms:
+            version = self._version(platform)
+            if version == self._versions.get(platform):
+                continue
+            self._versions[platform] = version
+            # Seqlock impar: el escritor aún no terminó, se verá en la próxima vuelta
+            if self._shared(platform) and version & 1:
+                continue
+            manifest = self.snapshot_store.read_manifest(platform) or {}
+            self.event_bus.publish(SNAPSHOT_READY, SnapshotReady(
+                platform, self.snapshot_store.get_version(platform),
+                manifest.get('timestamp', 0.0), manifest.get('items', 0)
+            ))
+            changed += 1
+        return changed
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                self.logger.error(f"Error comprobando versiones: {e}")
+
+    def start(self):
+        """Arranca el hilo (el estado actual cuenta como ya visto)"""
+        if self._thread is not None:
+            return
+        for platform in self.platforms:
+            self._versions[platform] = self._version(platform)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="SnapshotWatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,114 @@
+# backend/core/validation.py
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from .item_registry import MISSING_ITEM_ID
+from .snapshot import PriceSnapshot, INVALID_PRICE
+from .price_record import PriceRecord, from_minor
+
+# Motivos de rechazo
+MISSING_NAME = 'missing_name'
+INVALID_PRICE_REASON = 'invalid_price'
+NEGATIVE_PRICE = 'negative_price'
+MALFORMED = 'malformed'
+
+# Ejemplos guardados por motivo
+MAX_SAMPLES = 3
+
+
+@dataclass
+class ValidationReport:
+    """Resultado agregado de validar un snapshot completo"""
+    total: int = 0
+    valid: int = 0
+    rejected: Dict[str, int] = field(default_factory=dict)
+    samples: Dict[str, List[str]] = field(default_factory=dict)
+
+    @property
+    def rejected_count(self) -> int:
+        return sum(self.rejected.values())
+
+    def add(self, reason: str, count: int, samples: List[str]):
+        """Acumula rechazos de un motivo"""
+        if count <= 0:
+            return
+        self.rejected[reason] = self.rejected.get(reason, 0) + count
+        stored = self.samples.setdefault(reason, [])
+        stored.extend(samples[:MAX_SAMPLES - len(stored)])
+
+    def summary(self) -> str:
+        """Línea de resumen para el log"""
+        if not self.rejected:
+            return f"Validación: {self.valid}/{self.total} items válidos"
+        details = ', '.join(
+            f"{reason}={count} (ej: {'; '.join(self.samples.get(reason, []))})"
+            for reason, count in sorted(self.rejected.items())
+        )
+        return f"Validación: {self.valid}/{self.total} items válidos, descartados: {details}"
+
+
+def validate_records(records: List[PriceRecord]) -> Tuple[List[PriceRecord], ValidationReport]:
+    """
+    Valida PriceRecords antes de construir el snapshot
+
+    Mismos motivos que validate_snapshot, pero sobre los registros crudos:
+    así solo los items válidos llegan a registrarse en item_catalog.
+
+    Returns:
+        (valid, report): registros válidos y contadores por motivo
+    """
+    valid = []
+    missing_name, invalid_price, negative_price = [], [], []
+    for index, record in enumerate(records):
+        if not record.name:
+            missing_name.append(f"posición {index}")
+        elif record.price_minor is None:
+            invalid_price.append(record.name)
+        elif record.price_minor < 0:
+            negative_price.append(f"{record.name} {from_minor(record.price_minor)}")
+        else:
+            valid.append(record)
+
+    report = ValidationReport(total=len(records), valid=len(valid))
+    for reason, rejected in ((MISSING_NAME, missing_name),
+                             (INVALID_PRICE_REASON, invalid_price),
+                             (NEGATIVE_PRICE, negative_price)):
+        report.add(reason, len(rejected), rejected)
+
+    return valid, report
+
+
+def validate_snapshot(snapshot: PriceSnapshot) -> Tuple[np.ndarray, ValidationReport]:
+    """
+    Valida un snapshot completo de forma vectorizada
+
+    Returns:
+        (mask, report): máscara booleana de items válidos y contadores por motivo
+    """
+    item_ids = snapshot.item_ids
+    prices = snapshot.prices
+
+    missing_name = item_ids == MISSING_ITEM_ID
+    invalid_price = ~missing_name & (prices == INVALID_PRICE)
+    negative_price = ~missing_name & ~invalid_price & (prices < 0)
+    mask = ~(missing_name | invalid_price | negative_price)
+
+    report = ValidationReport(total=len(snapshot), valid=int(np.count_nonzero(mask)))
+    if report.valid == report.total:
+        return mask, report
+
+    registry = snapshot.registry
+    reasons = (
+        (MISSING_NAME, missing_name, lambda i: f"posición {i}"),
+        (INVALID_PRICE_REASON, invalid_price, lambda i: registry.get_name(int(item_ids[i]))),
+        (NEGATIVE_PRICE, negative_price,
+         lambda i: f"{registry.get_name(int(item_ids[i]))} {from_minor(int(prices[i]))}"),
+    )
+    for reason, reason_mask, describe in reasons:
+        indices = np.flatnonzero(reason_mask)
+        report.add(reason, len(indices), [describe(i) for i in indices[:MAX_SAMPLES].tolist()])
+
+    return mask, report
@@ -1,56 +1,86 @@
 # backend/database/models.py
 
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Boolean, Index, UniqueConstraint
+from sqlalchemy import create_engine, event, func, inspect, text, select, Column, BigInteger, Integer, String, Float, DateTime, Boolean, Index, UniqueConstraint
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import URL
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from loguru import logger
 from datetime import datetime
+from concurrent.futures import Future
+import io
 import os
+import queue
+import threading
 from pathlib import Path
 
+from .partitions import HistoryPartitions, RollupPartitions
+from .normalize import normalize_schema, partition_minute_rollups
+
 Base = declarative_base()
 
+
+class ItemCatalog(Base):
+    """Diccionario global de items: nombre canónico -> id entero estable"""
+    __tablename__ = "item_catalog"
+    
+    id = Column(Integer, primary_key=True)
+    name = Column(String, nullable=False, unique=True)
+    
+    def __repr__(self):
+        return f"<ItemCatalog(id={self.id}, name='{self.name}')>"
+
+
+class Platform(Base):
+    """Diccionario de plataformas: nombre -> id entero"""
+    __tablename__ = "platforms"
+    
+    id = Column(Integer, primary_key=True)
+    name = Column(String, nullable=False, unique=True)
+    
+    def __repr__(self):
+        return f"<Platform(id={self.id}, name='{self.name}')>"
+
+
 class Item(Base):
-    """Modelo para items de CS:GO"""
+    """Precio actual de cada item en cada plataforma"""
     __tablename__ = "items"
     
-    id = Column(Integer, primary_key=True, index=True)
-    name = Column(String, nullable=False, index=True)
-    platform = Column(String, nullable=False, index=True)
-    price = Column(Float, nullable=False)
-    steam_price = Column(Float, nullable=True)
-    profitability = Column(Float, nullable=True)
+    item_id = Column(Integer, primary_key=True)  # id en item_catalog
+    platform_id = Column(Integer, primary_key=True)  # id en platforms
+    price_minor = Column(BigInteger, nullable=False)  # Milésimas de dólar
     url = Column(String)
     last_updated = Column(DateTime, default=datetime.utcnow)
     is_available = Column(Boolean, default=True)
     
-    # Índice único para evitar duplicados
     __table_args__ = (
-        UniqueConstraint('name', 'platform', name='_name_platform_uc'),
-        Index('idx_profitability', 'profitability'),
-        Index('idx_last_updated', 'last_updated'),
+        Index('idx_items_platform_updated', 'platform_id', 'last_updated'),
     )
     
     def __repr__(self):
-        return f"<Item(name='{self.name}', platform='{self.platform}', price={self.price})>"
+        return f"<Item(item_id={self.item_id}, platform_id={self.platform_id}, price_minor={self.price_minor})>"
 
 
-class PriceHistory(Base):
-    """Modelo para histórico de precios"""
-    __tablename__ = "price_history"
+class PriceRollup(Base):
+    """
+    Resumen OHLC del histórico de precios por intervalo (1 hora, 1 día)
     
-    id = Column(Integer, primary_key=True, index=True)
-    item_name = Column(String, nullable=False, index=True)
-    platform = Column(String, nullable=False, index=True)
-    price = Column(Float, nullable=False)
-    timestamp = Column(DateTime, default=datetime.utcnow, index=True)
+    Los rollups de 5 minutos van en particiones diarias (RollupPartitions).
+    """
+    __tablename__ = "price_rollups"
     
-    # Índices para consultas rápidas
-    __table_args__ = (
-        Index('idx_item_platform_time', 'item_name', 'platform', 'timestamp'),
-    )
+    resolution = Column(Integer, primary_key=True)  # Segundos del intervalo
+    item_id = Column(Integer, primary_key=True)
+    platform_id = Column(Integer, primary_key=True)  # id en platforms
+    bucket = Column(DateTime, primary_key=True)  # Inicio del intervalo (UTC)
+    open = Column(BigInteger, nullable=False)  # Milésimas de dólar
+    high = Column(BigInteger, nullable=False)
+    low = Column(BigInteger, nullable=False)
+    close = Column(BigInteger, nullable=False)
+    count = Column(Integer, nullable=False, default=1)
     
     def __repr__(self):
-        return f"<PriceHistory(item='{self.item_name}', platform='{self.platform}', price={self.price}, time={self.timestamp})>"
+        return f"<PriceRollup(item_id={self.item_id}, platform_id={self.platform_id}, bucket={self.bucket}, close={self.close})>"
 
 
 class ProfitableOpportunity(Base):
@@ -66,9 +96,17 @@ class ProfitableOpportunity(Base):
     net_steam_price = Column(Float, nullable=False)
     profitability = Column(Float, nullable=False, index=True)
     profit_amount = Column(Float, nullable=False)
-    found_at = Column(DateTime, default=datetime.utcnow, index=True)
+    first_seen = Column(DateTime, default=datetime.utcnow)  # Inicio del periodo activo actual
+    last_seen = Column(DateTime, default=datetime.utcnow, index=True)
     is_active = Column(Boolean, default=True)
     
+    # Una fila por (item, plataforma de compra); índice parcial solo con las activas
+    __table_args__ = (
+        UniqueConstraint('item_name', 'buy_platform', name='uq_opportunity_item_platform'),
+        Index('idx_opportunities_active', profitability,
+              postgresql_where=is_active == True, sqlite_where=is_active == True),
+    )
+    
     def __repr__(self):
         return f"<Opportunity(item='{self.item_name}', profit={self.profitability*100:.2f}%)>"
 
@@ -90,20 +128,407 @@ class ScraperStatus(Base):
         return f"<ScraperStatus(name='{self.scraper_name}', status='{self.status}')>"
 
 
+class SnapshotImport(Base):
+    """Archivos de snapshot ya importados por import_snapshots.py (permite reanudar)"""
+    __tablename__ = "snapshot_imports"
+
+    id = Column(Integer, primary_key=True)
+    path = Column(String, nullable=False)
+    platform = Column(String, nullable=False)
+    snapshot_at = Column(DateTime, nullable=False)  # Momento del snapshot (UTC)
+    items = Column(Integer, default=0)
+    changes = Column(Integer, default=0)  # Precios nuevos o distintos al snapshot anterior
+    imported_at = Column(DateTime, default=datetime.utcnow)
+
+    # Un archivo reescrito (p. ej. JSON/<plataforma>_data.json) es un snapshot distinto
+    __table_args__ = (
+        UniqueConstraint('path', 'snapshot_at', name='uq_snapshot_import_file'),
+    )
+
+    def __repr__(self):
+        return f"<SnapshotImport(path='{self.path}', platform='{self.platform}')>"
+
+
+class DataVersion(Base):
+    """
+    Contador de versión por conjunto de datos (items, opportunities, scrapers)
+
+    Las escrituras lo incrementan en su misma transacción; las cachés de
+    lectura de cualquier proceso lo comparan para saber si siguen vigentes.
+    """
+    __tablename__ = "data_versions"
+
+    name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<DataVersion(name='{self.name}', version={self.version})>"
+
+
+# Configuración del modo SQLite de alto rendimiento (opt-in en settings['database']['sqlite_tuning'])
+DEFAULT_SQLITE_TUNING = {
+    'enabled': False,
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64 * 1024,  # En KiB (negativo = tamaño, no páginas)
+    'busy_timeout': 30000,  # ms
+    'pool_size': 5,
+    'writer_thread': True
+}
+
+
+# Pool de conexiones para PostgreSQL (settings['database']['postgresql'])
+DEFAULT_POSTGRES_POOL = {
+    'pool_size': 10,
+    'max_overflow': 20,
+    'pool_timeout': 30,
+    'pool_recycle': 1800  # Segundos: renovar conexiones antes de que las corte el servidor
+}
+
+
+def database_url(settings: dict) -> str:
+    """
+    URL de SQLAlchemy según settings['database']
+    
+    Prioridad: variable DATABASE_URL, settings['url'] y por último el tipo
+    configurado (sqlite en data/<path> o postgresql con sus parámetros).
+    """
+    url = os.getenv('DATABASE_URL') or settings.get('url')
+    if url:
+        return url
+    
+    if settings.get('type', 'sqlite') == 'postgresql':
+        pg = settings.get('postgresql', {})
+        return URL.create(
+            'postgresql+psycopg2',
+            username=pg.get('user', 'csgo_user'),
+            password=pg.get('password') or os.getenv('DB_PASSWORD'),
+            host=pg.get('host', 'localhost'),
+            port=pg.get('port', 5432),
+            database=pg.get('database', 'csgo_arbitrage')
+        ).render_as_string(hide_password=False)
+    
+    db_path = Path("data") / settings.get('path', 'csgo_arbitrage.db')
+    db_path.parent.mkdir(exist_ok=True)
+    return f"sqlite:///{db_path}"
+
+
+def _copy_value(value) -> str:
+    """Valor en formato de texto de COPY (\\N = NULL)"""
+    if value is None:
+        return '\\N'
+    if isinstance(value, str):
+        return (value.replace('\\', '\\\\').replace('\t', '\\t')
+                     .replace('\n', '\\n').replace('\r', '\\r'))
+    return str(value)
+
+
+class DatabaseWriter:
+    """
+    Hilo único dueño de todas las transacciones de escritura
+    
+    En SQLite solo puede haber un escritor a la vez; en lugar de que cada
+    hilo compita por el lock (y reciba 'database is locked'), las escrituras
+    se encolan y las ejecuta este hilo en orden. Las lecturas siguen usando
+    el pool de conexiones y no esperan a la cola.
+    """
+    
+    def __init__(self, session_factory):
+        self.session_factory = session_factory
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="DatabaseWriter", daemon=True)
+        self._thread.start()
+    
+    def submit(self, func) -> Future:
+        """Encola func(session) y retorna un Future con su resultado"""
+        future = Future()
+        self._queue.put((func, future))
+        return future
+    
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+    
+    def in_writer_thread(self) -> bool:
+        return threading.current_thread() is self._thread
+    
+    def _run(self):
+        while True:
+            func, future = self._queue.get()
+            if not future.set_running_or_notify_cancel():
+                continue
+            session = self.session_factory()
+            try:
+                future.set_result(func(session))
+            except BaseException as e:
+                session.rollback()
+                future.set_exception(e)
+            finally:
+                session.close()
+
+
 # Clase para manejar la base de datos
 class DatabaseManager:
-    def __init__(self, db_url=None):
+    def __init__(self, db_url=None, sqlite_tuning=None, postgres_pool=None):
         if db_url is None:
             # Por defecto usar SQLite
-            db_path = Path("data/csgo_arbitrage.db")
-            db_path.parent.mkdir(exist_ok=True)
-            db_url = f"sqlite:///{db_path}"
+            db_url = database_url({})
+        if db_url.startswith('postgresql://'):
+            db_url = db_url.replace('postgresql://', 'postgresql+psycopg2://', 1)
         
-        self.engine = create_engine(db_url, echo=False)
+        tuning = {**DEFAULT_SQLITE_TUNING, **(sqlite_tuning or {})}
+        self.tuned_sqlite = db_url.startswith('sqlite') and tuning['enabled']
+        
+        if self.tuned_sqlite:
+            self.engine = create_engine(
+                db_url, echo=False,
+                pool_size=tuning['pool_size'],
+                connect_args={'timeout': tuning['busy_timeout'] / 1000}
+            )
+            self._configure_sqlite(tuning)
+        elif db_url.startswith('postgresql'):
+            pool = {**DEFAULT_POSTGRES_POOL, **(postgres_pool or {})}
+            # Varios procesos escriben a la vez: pool acotado por proceso y
+            # comprobación de la conexión antes de usarla
+            self.engine = create_engine(
+                db_url, echo=False,
+                pool_size=pool['pool_size'],
+                max_overflow=pool['max_overflow'],
+                pool_timeout=pool['pool_timeout'],
+                pool_recycle=pool['pool_recycle'],
+                pool_pre_ping=True
+            )
+        else:
+            self.engine = create_engine(db_url, echo=False)
         self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
         
+        # Escritor dedicado: todas las transacciones de escritura en un solo hilo
+        self.writer = None
+        if self.tuned_sqlite and tuning['writer_thread']:
+            self.writer = DatabaseWriter(self.SessionLocal)
+        
+        # Histórico y rollups de 5 minutos particionados por día
+        self.history = HistoryPartitions(self.engine)
+        self.rollups_5m = RollupPartitions(self.engine)
+        
+        # Diccionario de plataformas en memoria (nombre <-> id)
+        self._platform_ids = {}
+        self._platform_names = {}
+        self._platforms_lock = threading.Lock()
+        
         # Crear tablas si no existen
         Base.metadata.create_all(bind=self.engine)
+        
+        # Completar esquemas creados por versiones anteriores
+        self._migrate_schema()
+    
+    def _configure_sqlite(self, tuning):
+        """Aplica los PRAGMA de alto rendimiento a cada conexión nueva"""
+        pragmas = (
+            f"PRAGMA journal_mode={tuning['journal_mode']}",
+            f"PRAGMA synchronous={tuning['synchronous']}",
+            f"PRAGMA mmap_size={int(tuning['mmap_size'])}",
+            f"PRAGMA cache_size={int(tuning['cache_size'])}",
+            f"PRAGMA busy_timeout={int(tuning['busy_timeout'])}",
+            "PRAGMA temp_store=MEMORY",
+        )
+        
+        @event.listens_for(self.engine, "connect")
+        def set_sqlite_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            for pragma in pragmas:
+                cursor.execute(pragma)
+            cursor.close()
+        
+        logger.info(
+            f"SQLite en modo alto rendimiento ({tuning['journal_mode']}, "
+            f"synchronous={tuning['synchronous']})"
+        )
+    
+    def run_write(self, func):
+        """
+        Ejecuta func(session) como transacción de escritura
+        
+        Con el escritor dedicado activo la función se ejecuta en su hilo y
+        se espera el resultado; si no, se ejecuta en el hilo actual. func es
+        responsable de hacer commit.
+        """
+        if self.writer and not self.writer.in_writer_thread():
+            return self.writer.submit(func).result()
+        
+        session = self.get_session()
+        try:
+            return func(session)
+        finally:
+            session.close()
+    
+    def _migrate_schema(self):
+        """
+        Aplica migraciones aditivas sobre bases de datos existentes
+        
+        create_all no modifica tablas ya creadas, así que se agregan aquí las
+        columnas e índices nuevos. Las tablas con el esquema de nombres
+        repetidos se convierten antes al esquema normalizado.
+        """
+        normalize_schema(self)
+        partition_minute_rollups(self)
+        inspector = inspect(self.engine)
+        
+        # profitable_opportunities se regenera en cada análisis: con el esquema
+        # anterior (una fila por ciclo, sin last_seen) se recrea en lugar de migrarla
+        opportunities = ProfitableOpportunity.__table__
+        if inspector.has_table(opportunities.name) and 'last_seen' not in {
+            col['name'] for col in inspector.get_columns(opportunities.name)
+        }:
+            with self.engine.begin() as conn:
+                opportunities.drop(bind=conn)
+                opportunities.create(bind=conn)
+            inspector = inspect(self.engine)
+            logger.info(f"Migración: tabla {opportunities.name} recreada con una fila por item y plataforma")
+        
+        with self.engine.begin() as conn:
+            for table in Base.metadata.sorted_tables:
+                if not inspector.has_table(table.name):
+                    continue
+                
+                existing_columns = {col['name'] for col in inspector.get_columns(table.name)}
+                for column in table.columns:
+                    if column.name not in existing_columns:
+                        column_type = column.type.compile(dialect=self.engine.dialect)
+                        conn.execute(text(
+                            f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'
+                        ))
+                        logger.info(f"Migración: columna {table.name}.{column.name} agregada")
+            
+            for table in Base.metadata.sorted_tables:
+                for index in table.indexes:
+                    index.create(bind=conn, checkfirst=True)
+    
+    def platform_id(self, name: str, create: bool = True):
+        """
+        Id de una plataforma en la tabla platforms
+        
+        Args:
+            name: Nombre de la plataforma
+            create: Registrarla si no existe (si no, retorna None)
+        """
+        platform_id = self._platform_ids.get(name)
+        if platform_id is not None:
+            return platform_id
+        
+        with self._platforms_lock:
+            if create:
+                # Transacción propia (por el escritor único): el id queda
+                # confirmado aunque falle la escritura que lo usa
+                platform_id = self.run_write(lambda session: self._insert_platform(session, name))
+            else:
+                with self.engine.connect() as conn:
+                    platform_id = conn.execute(
+                        select(Platform.id).where(Platform.name == name)
+                    ).scalar()
+            if platform_id is not None:
+                self._platform_ids[name] = platform_id
+                self._platform_names[platform_id] = name
+        return platform_id
+    
+    def _insert_platform(self, session, name: str) -> int:
+        """Transacción de escritura de platform_id"""
+        try:
+            session.execute(self.insert_ignore(Platform.__table__), [{'name': name}])
+            platform_id = session.execute(
+                select(Platform.id).where(Platform.name == name)
+            ).scalar()
+            session.commit()
+            return platform_id
+        except Exception:
+            session.rollback()
+            raise
+    
+    def platform_name(self, platform_id: int) -> str:
+        """Nombre de una plataforma a partir de su id"""
+        name = self._platform_names.get(platform_id)
+        if name is None:
+            with self._platforms_lock:
+                with self.engine.connect() as conn:
+                    for row_id, row_name in conn.execute(select(Platform.id, Platform.name)):
+                        self._platform_ids[row_name] = row_id
+                        self._platform_names[row_id] = row_name
+            name = self._platform_names.get(platform_id, '')
+        return name
+    
+    def insert_ignore(self, table):
+        """INSERT que ignora conflictos de unicidad según el dialecto"""
+        if self.engine.dialect.name == 'postgresql':
+            return postgresql.insert(table).on_conflict_do_nothing()
+        return sqlite.insert(table).on_conflict_do_nothing()
+    
+    def upsert(self, table, index_elements, update_columns=(), set_=None, from_select=None):
+        """
+        INSERT ... ON CONFLICT DO UPDATE según el dialecto
+        
+        Args:
+            table: Tabla destino
+            index_elements: Columnas de la restricción única
+            update_columns: Columnas que toman el valor nuevo
+            set_: Función stmt -> dict con expresiones de actualización adicionales
+            from_select: (columnas, select) para INSERT ... SELECT
+        """
+        dialect = postgresql if self.engine.dialect.name == 'postgresql' else sqlite
+        stmt = dialect.insert(table)
+        if from_select is not None:
+            stmt = stmt.from_select(*from_select)
+        values = {column: stmt.excluded[column] for column in update_columns}
+        if set_:
+            values.update(set_(stmt))
+        return stmt.on_conflict_do_update(index_elements=index_elements, set_=values)
+    
+    @property
+    def supports_copy(self) -> bool:
+        """Indica si el backend admite COPY FROM STDIN (PostgreSQL)"""
+        return self.engine.dialect.name == 'postgresql'
+    
+    def copy_rows(self, session, table_name: str, columns, rows) -> int:
+        """
+        Carga filas en una tabla con COPY FROM STDIN (solo PostgreSQL)
+        
+        Usa la conexión de la sesión, así que la carga forma parte de su
+        transacción.
+        
+        Returns:
+            Número de filas enviadas
+        """
+        buffer = io.StringIO()
+        count = 0
+        for row in rows:
+            buffer.write('\t'.join(_copy_value(value) for value in row))
+            buffer.write('\n')
+            count += 1
+        buffer.seek(0)
+        
+        sql = f"COPY {table_name} ({', '.join(columns)}) FROM STDIN"
+        cursor = session.connection().connection.cursor()
+        try:
+            if hasattr(cursor, 'copy_expert'):
+                cursor.copy_expert(sql, buffer)  # psycopg2
+            else:
+                with cursor.copy(sql) as copy:  # psycopg 3
+                    copy.write(buffer.getvalue())
+        finally:
+            cursor.close()
+        return count
+    
+    def greatest(self, *args):
+        """Máximo escalar entre expresiones (GREATEST en PostgreSQL, MAX en SQLite)"""
+        if self.engine.dialect.name == 'postgresql':
+            return func.greatest(*args)
+        return func.max(*args)
+    
+    def least(self, *args):
+        """Mínimo escalar entre expresiones (LEAST en PostgreSQL, MIN en SQLite)"""
+        if self.engine.dialect.name == 'postgresql':
+            return func.least(*args)
+        return func.min(*args)
     
     def get_session(self):
         """Obtiene una nueva sesión de base de datos"""
@@ -121,5 +546,11 @@ def get_database_manager():
     """Obtiene la instancia singleton del DatabaseManager"""
     global _db_manager
     if _db_manager is None:
-        _db_manager = DatabaseManager()
+        from backend.core.config_manager import get_config_manager
+        settings = get_config_manager().settings.get('database', {})
+        _db_manager = DatabaseManager(
+            database_url(settings),
+            sqlite_tuning=settings.get('sqlite_tuning'),
+            postgres_pool=settings.get('postgresql')
+        )
     return _db_manager
\ No newline at end of file
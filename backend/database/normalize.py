@@ -0,0 +1,302 @@
+# backend/database/normalize.py
+
+import re
+from datetime import date, datetime, timedelta
+from typing import Dict, List
+
+from loguru import logger
+from sqlalchemy import (
+    BigInteger, Column, Integer, MetaData, String, Table, cast, delete, func, inspect, literal,
+    select, text
+)
+
+from .partitions import HISTORY_COLUMNS, PARTITION_PREFIX, ROLLUP_COLUMNS
+
+# Milésimas de dólar por dólar (igual que backend.core.price_record.MINOR_UNITS)
+MINOR_UNITS = 1000
+
+# Tablas del esquema anterior (nombres y plataformas como texto en cada fila)
+LEGACY_ITEMS = 'items_legacy'
+LEGACY_HISTORY = 'price_history'
+LEGACY_ROLLUPS = 'price_rollups_legacy'
+_OLD_SUFFIX = '_old'
+_PARTITION_RE = re.compile(rf'^{PARTITION_PREFIX}(\d{{8}})$')
+_OLD_PARTITION_RE = re.compile(rf'^{PARTITION_PREFIX}(\d{{8}}){_OLD_SUFFIX}$')
+
+# Columnas OHLC de los rollups (dólares en el esquema anterior, milésimas en el nuevo)
+_OHLC_COLUMNS = ('open', 'high', 'low', 'close')
+
+# Nombre original -> id del nombre canónico, mientras dura la conversión
+_LEGACY_NAMES = Table(
+    'legacy_item_names', MetaData(),
+    Column('name', String, primary_key=True),
+    Column('item_id', Integer, nullable=False),
+)
+
+# Nombres por sentencia al registrar el catálogo
+_NAMES_CHUNK = 500
+
+
+def _columns(inspector, table_name: str) -> set:
+    return {column['name'] for column in inspector.get_columns(table_name)}
+
+
+def _as_datetime(value) -> datetime:
+    return datetime.fromisoformat(value) if isinstance(value, str) else value
+
+
+def _legacy_tables(inspector) -> List[str]:
+    """Tablas antiguas pendientes de convertir (ya apartadas con su nombre legado)"""
+    return [
+        name for name in inspector.get_table_names()
+        if name in (LEGACY_ITEMS, LEGACY_HISTORY, LEGACY_ROLLUPS) or _OLD_PARTITION_RE.match(name)
+    ]
+
+
+def _set_aside_old_tables(engine, inspector) -> bool:
+    """
+    Renombra las tablas antiguas cuyo nombre usa el esquema nuevo
+
+    Returns:
+        True si hay tablas antiguas que convertir
+    """
+    renames = []
+    for name in inspector.get_table_names():
+        if name == 'items' and 'name' in _columns(inspector, name):
+            renames.append((name, LEGACY_ITEMS))
+        elif name == 'price_rollups' and 'platform' in _columns(inspector, name):
+            renames.append((name, LEGACY_ROLLUPS))
+        elif _PARTITION_RE.match(name) and 'platform' in _columns(inspector, name):
+            renames.append((name, name + _OLD_SUFFIX))
+
+    with engine.begin() as conn:
+        for old, new in renames:
+            conn.execute(text(f'ALTER TABLE {old} RENAME TO {new}'))
+            if engine.dialect.name == 'postgresql':
+                # Los nombres de índice son globales en PostgreSQL: liberar el de la clave primaria
+                conn.execute(text(f'ALTER INDEX IF EXISTS {old}_pkey RENAME TO {new}_pkey'))
+
+    return bool(renames) or bool(_legacy_tables(inspect(engine)))
+
+
+def _register_platforms(conn, db_manager, source: Table, platforms: Table):
+    """Registra en platforms las plataformas de una tabla antigua"""
+    conn.execute(db_manager.insert_ignore(platforms).from_select(
+        ['name'], select(source.c.platform).where(source.c.platform != '').distinct()
+    ))
+
+
+def _register_names(conn, db_manager, source: Table, name_column: str, catalog: Table):
+    """
+    Registra en item_catalog los nombres de una tabla antigua
+
+    Los nombres se pasan por el NameIndex antes de registrarlos (p. ej.
+    'StatTrak(TM)' -> 'StatTrak™'), igual que en la ingesta en vivo. Las
+    variantes de un mismo item comparten id: la tabla legacy_item_names
+    guarda nombre original -> id canónico y las copias se unen con ella.
+    """
+    from backend.core.name_index import get_name_index
+
+    name_index = get_name_index()
+    names = conn.execute(
+        select(source.c[name_column]).where(source.c[name_column] != '').distinct()
+    ).scalars().all()
+
+    for start in range(0, len(names), _NAMES_CHUNK):
+        chunk = names[start:start + _NAMES_CHUNK]
+        canonical = {name: name_index.canonical(name) for name in chunk}
+        unique = sorted(set(canonical.values()))
+        conn.execute(db_manager.insert_ignore(catalog), [{'name': name} for name in unique])
+        ids = dict(conn.execute(select(catalog.c.name, catalog.c.id).where(catalog.c.name.in_(unique))).all())
+        conn.execute(db_manager.insert_ignore(_LEGACY_NAMES), [
+            {'name': name, 'item_id': ids[canonical[name]]} for name in chunk
+        ])
+
+
+def _copy_history(conn, db_manager, source: Table, platforms: Table, day, where=None) -> int:
+    """Copia a la partición de `day` las filas de una tabla de histórico antigua"""
+    partition = db_manager.history.table_for(day)
+    partition.create(bind=conn, checkfirst=True)
+
+    query = select(
+        _LEGACY_NAMES.c.item_id, platforms.c.id, source.c.timestamp,
+        cast(func.round(source.c.price * MINOR_UNITS), BigInteger)
+    ).select_from(
+        source.join(_LEGACY_NAMES, _LEGACY_NAMES.c.name == source.c.item_name)
+              .join(platforms, platforms.c.name == source.c.platform)
+    ).where(source.c.price > 0)
+    if where is not None:
+        query = query.where(where)
+
+    result = conn.execute(partition.insert().from_select(list(HISTORY_COLUMNS), query))
+    return result.rowcount or 0
+
+
+def normalize_schema(db_manager) -> Dict[str, int]:
+    """
+    Convierte una base de datos con el esquema anterior al normalizado
+
+    El esquema anterior guardaba el nombre del item y de la plataforma como
+    texto en cada fila de items, price_history y price_rollups (estos con
+    precios en dólares). El nuevo usa solo enteros: items(item_id,
+    platform_id, price_minor, ...), particiones diarias
+    price_history_YYYYMMDD(item_id, platform_id, ts, price_minor) y
+    price_rollups con platform_id y OHLC en milésimas.
+
+    Los nombres antiguos se canonicalizan antes de registrarlos: las filas
+    de variantes de un mismo item se fusionan (en items queda la más
+    reciente; el histórico conserva las de todas).
+
+    Es reanudable: las tablas antiguas se apartan con otro nombre y se
+    borran solo después de copiar sus filas.
+
+    Returns:
+        Filas convertidas: {'items': n, 'history': n, 'rollups': n}
+    """
+    from .models import Base, ItemCatalog, Platform, Item
+
+    engine = db_manager.engine
+    stats = {'items': 0, 'history': 0, 'rollups': 0}
+
+    if not _set_aside_old_tables(engine, inspect(engine)):
+        return stats
+
+    logger.info("Migración: convirtiendo la base de datos al esquema normalizado...")
+    Base.metadata.create_all(bind=engine)
+    _LEGACY_NAMES.create(bind=engine, checkfirst=True)
+
+    catalog = ItemCatalog.__table__
+    platforms = Platform.__table__
+    items = Item.__table__
+    legacy = MetaData()
+
+    for name in sorted(_legacy_tables(inspect(engine))):
+        with engine.begin() as conn:
+            source = Table(name, legacy, autoload_with=conn)
+            _register_platforms(conn, db_manager, source, platforms)
+
+            if name == LEGACY_ROLLUPS:
+                # Los rollups ya usaban ids del catálogo: solo cambian plataforma y precios
+                stats['rollups'] += _copy_rollups(conn, db_manager, source, platforms)
+
+            elif name == LEGACY_ITEMS:
+                _register_names(conn, db_manager, source, 'name', catalog)
+                # Columnas opcionales en esquemas muy antiguos
+                defaults = {'url': '', 'last_updated': datetime.utcnow(), 'is_available': True}
+                optional = [
+                    source.c[column] if column in source.c else literal(value).label(column)
+                    for column, value in defaults.items()
+                ]
+                # Variantes del mismo item: la primera fila insertada (la más reciente) gana
+                query = select(
+                    _LEGACY_NAMES.c.item_id, platforms.c.id,
+                    cast(func.round(source.c.price * MINOR_UNITS), BigInteger),
+                    *optional
+                ).select_from(
+                    source.join(_LEGACY_NAMES, _LEGACY_NAMES.c.name == source.c.name)
+                          .join(platforms, platforms.c.name == source.c.platform)
+                ).where(source.c.price > 0)
+                if 'last_updated' in source.c:
+                    query = query.order_by(source.c.last_updated.desc())
+                result = conn.execute(db_manager.insert_ignore(items).from_select(
+                    ['item_id', 'platform_id', 'price_minor', 'url', 'last_updated', 'is_available'],
+                    query
+                ))
+                stats['items'] += result.rowcount or 0
+
+            elif name == LEGACY_HISTORY:
+                _register_names(conn, db_manager, source, 'item_name', catalog)
+                stats['history'] += _copy_legacy_history(conn, db_manager, source, platforms)
+
+            else:
+                _register_names(conn, db_manager, source, 'item_name', catalog)
+                day = datetime.strptime(_OLD_PARTITION_RE.match(name).group(1), '%Y%m%d').date()
+                stats['history'] += _copy_history(conn, db_manager, source, platforms, day)
+
+            source.drop(bind=conn)
+            logger.info(f"Migración: tabla {name} convertida")
+
+    _LEGACY_NAMES.drop(bind=engine, checkfirst=True)
+    logger.info(
+        f"Migración: esquema normalizado ({stats['items']} items, "
+        f"{stats['history']} registros de histórico, {stats['rollups']} rollups)"
+    )
+    return stats
+
+
+def _copy_legacy_history(conn, db_manager, source: Table, platforms: Table) -> int:
+    """Reparte la tabla price_history original en particiones diarias"""
+    first, last = conn.execute(
+        select(func.min(source.c.timestamp), func.max(source.c.timestamp))
+    ).one()
+    if first is None:
+        return 0
+
+    copied = 0
+    day = _as_datetime(first).date()
+    while day <= _as_datetime(last).date():
+        start = datetime.combine(day, datetime.min.time())
+        in_day = (source.c.timestamp >= start) & (source.c.timestamp < start + timedelta(days=1))
+        # No crear particiones vacías para los días sin datos
+        if conn.execute(select(source.c.timestamp).where(in_day).limit(1)).first() is not None:
+            copied += _copy_history(conn, db_manager, source, platforms, day, in_day)
+        day += timedelta(days=1)
+    return copied
+
+
+def _copy_rollups(conn, db_manager, source: Table, platforms: Table) -> int:
+    """Copia los rollups antiguos (plataforma como texto, OHLC en dólares) a price_rollups"""
+    from .models import PriceRollup
+
+    query = select(
+        source.c.resolution, source.c.item_id, platforms.c.id, source.c.bucket,
+        *(cast(func.round(source.c[column] * MINOR_UNITS), BigInteger) for column in _OHLC_COLUMNS),
+        source.c.count
+    ).select_from(source.join(platforms, platforms.c.name == source.c.platform))
+
+    result = conn.execute(db_manager.insert_ignore(PriceRollup.__table__).from_select(
+        ['resolution', 'item_id', 'platform_id', 'bucket', *_OHLC_COLUMNS, 'count'], query
+    ))
+    return result.rowcount or 0
+
+
+def partition_minute_rollups(db_manager) -> int:
+    """
+    Mueve los rollups de 5 minutos de price_rollups a sus particiones diarias
+
+    Las versiones anteriores (y la conversión de normalize_schema) los
+    guardaban junto a los horarios y diarios. Es un paso único: después la
+    ingesta los escribe directamente en price_rollups_5m_YYYYMMDD.
+
+    Returns:
+        Rollups movidos
+    """
+    from .models import PriceRollup
+
+    table = PriceRollup.__table__
+    partitions = db_manager.rollups_5m
+    minute = table.c.resolution == partitions.resolution
+
+    with db_manager.engine.begin() as conn:
+        if conn.execute(select(table.c.resolution).where(minute).limit(1)).first() is None:
+            return 0
+
+        days = sorted(
+            day if isinstance(day, date) else date.fromisoformat(day)
+            for day in conn.execute(select(func.date(table.c.bucket)).where(minute).distinct()).scalars()
+        )
+        moved = 0
+        for day in days:
+            partition = partitions.ensure_partition(conn, day)
+            start = datetime.combine(day, datetime.min.time())
+            result = conn.execute(db_manager.insert_ignore(partition).from_select(
+                list(ROLLUP_COLUMNS),
+                select(*(table.c[column] for column in ROLLUP_COLUMNS)).where(
+                    minute, table.c.bucket >= start, table.c.bucket < start + timedelta(days=1)
+                )
+            ))
+            moved += result.rowcount or 0
+        conn.execute(delete(table).where(minute))
+
+    logger.info(f"Migración: {moved} rollups de 5 minutos movidos a particiones diarias")
+    return moved
@@ -0,0 +1,243 @@
+# backend/database/partitions.py
+
+import re
+import threading
+from datetime import date, datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from loguru import logger
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy import (
+    BigInteger, Column, DateTime, Index, Integer, MetaData, PrimaryKeyConstraint, Table,
+    func, inspect, select, union_all
+)
+
+# Prefijo de las tablas de partición diarias: price_history_YYYYMMDD
+PARTITION_PREFIX = 'price_history_'
+
+# Columnas de cada partición (y de las filas que devuelven las consultas)
+HISTORY_COLUMNS = ('item_id', 'platform_id', 'ts', 'price_minor')
+
+# Rollups de 5 minutos: price_rollups_5m_YYYYMMDD, con la misma retención que el histórico
+ROLLUP_PARTITION_PREFIX = 'price_rollups_5m_'
+ROLLUP_COLUMNS = ('item_id', 'platform_id', 'bucket', 'open', 'high', 'low', 'close', 'count')
+
+
+class HistoryPartitions:
+    """
+    Histórico de precios particionado por día
+
+    Cada día se guarda en su propia tabla (price_history_YYYYMMDD). Las
+    consultas por rango de fechas solo leen las particiones del rango y la
+    retención consiste en borrar tablas completas (DROP TABLE) en lugar de
+    un DELETE masivo.
+
+    Las filas son solo enteros (item_id, platform_id, ts, price_minor) y el
+    índice compuesto las cubre: las consultas por item se resuelven sin
+    leer la tabla.
+
+    Las subclases cambian el prefijo, las columnas y la columna de tiempo
+    (ver RollupPartitions).
+    """
+
+    prefix = PARTITION_PREFIX
+    columns = HISTORY_COLUMNS
+    time_column = 'ts'
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.metadata = MetaData()
+        self._lock = threading.Lock()
+        self._partition_re = re.compile(rf'^{re.escape(self.prefix)}(\d{{8}})$')
+        self.logger = logger.bind(service=type(self).__name__)
+
+    # ------------------------------------------------------------------
+    # Particiones
+    # ------------------------------------------------------------------
+
+    def partition_name(self, day: date) -> str:
+        return f"{self.prefix}{day:%Y%m%d}"
+
+    def _schema(self, name: str) -> List:
+        """Columnas e índices de una partición"""
+        return [
+            Column('item_id', Integer, nullable=False),
+            Column('platform_id', Integer, nullable=False),
+            Column('ts', DateTime, nullable=False),
+            Column('price_minor', BigInteger, nullable=False),
+            Index(f"idx_{name}_cover", 'item_id', 'platform_id', 'ts', 'price_minor'),
+        ]
+
+    def table_for(self, day: date) -> Table:
+        """Objeto Table de la partición de un día (no crea la tabla en la base de datos)"""
+        name = self.partition_name(day)
+        with self._lock:
+            table = self.metadata.tables.get(name)
+            if table is not None:
+                return table
+            return Table(name, self.metadata, *self._schema(name))
+
+    def ensure_partition(self, connection, day: date) -> Table:
+        """
+        Crea la partición de un día si no existe
+
+        En PostgreSQL varios procesos pueden intentar crearla a la vez: la
+        creación va en un savepoint y si otro proceso se adelantó se ignora
+        el error. En SQLite solo hay un escritor.
+        """
+        table = self.table_for(day)
+        if connection.dialect.name != 'postgresql':
+            table.create(bind=connection, checkfirst=True)
+            return table
+
+        try:
+            with connection.begin_nested():
+                table.create(bind=connection, checkfirst=True)
+        except DBAPIError:
+            if not inspect(connection).has_table(table.name):
+                raise
+        return table
+
+    def partition_days(self, connection=None) -> List[date]:
+        """Días con partición existente, ordenados"""
+        inspector = inspect(connection if connection is not None else self.engine)
+        days = []
+        for name in inspector.get_table_names():
+            match = self._partition_re.match(name)
+            if match:
+                days.append(datetime.strptime(match.group(1), '%Y%m%d').date())
+        return sorted(days)
+
+    def _tables_in_range(self, connection, since: Optional[datetime],
+                         until: Optional[datetime]) -> List[Table]:
+        """Particiones que pueden contener filas del rango (poda por fecha)"""
+        return [
+            self.table_for(day) for day in self.partition_days(connection)
+            if (since is None or day >= since.date()) and (until is None or day <= until.date())
+        ]
+
+    # ------------------------------------------------------------------
+    # Escritura
+    # ------------------------------------------------------------------
+
+    def insert(self, session, rows: List[Dict], chunk_size: int = 500):
+        """Inserta filas en la partición de su día (la crea si no existe)"""
+        by_day: Dict[date, List[Dict]] = {}
+        for row in rows:
+            by_day.setdefault(row[self.time_column].date(), []).append(row)
+
+        connection = session.connection()
+        for day, day_rows in by_day.items():
+            table = self.ensure_partition(connection, day)
+            for start in range(0, len(day_rows), chunk_size):
+                connection.execute(table.insert(), day_rows[start:start + chunk_size])
+
+    # ------------------------------------------------------------------
+    # Lectura
+    # ------------------------------------------------------------------
+
+    def select(self, connection, since: Optional[datetime] = None,
+               until: Optional[datetime] = None, item_id: Optional[int] = None,
+               platform_id: Optional[int] = None):
+        """
+        SELECT (UNION ALL) sobre las particiones del rango con los filtros aplicados
+
+        Retorna None si no hay particiones.
+        """
+        selects = []
+        for table in self._tables_in_range(connection, since, until):
+            ts = table.c[self.time_column]
+            query = select(*(table.c[column] for column in self.columns))
+            if since is not None:
+                query = query.where(ts >= since)
+            if until is not None:
+                query = query.where(ts < until)
+            if item_id is not None:
+                query = query.where(table.c.item_id == item_id)
+            if platform_id is not None:
+                query = query.where(table.c.platform_id == platform_id)
+            selects.append(query)
+
+        if not selects:
+            return None
+        if len(selects) == 1:
+            return selects[0].order_by(selects[0].selected_columns[self.time_column])
+
+        history = union_all(*selects).subquery()
+        return select(*(history.c[column] for column in self.columns)).order_by(
+            history.c[self.time_column]
+        )
+
+    def rows(self, connection, **filters) -> Iterator[Tuple]:
+        """Filas (columnas de `columns`, p. ej. item_id, platform_id, ts, price_minor) ordenadas por tiempo"""
+        query = self.select(connection, **filters)
+        if query is None:
+            return iter(())
+        return iter(connection.execute(query.execution_options(yield_per=10000)))
+
+    def count(self, connection) -> int:
+        """Número total de filas de todas las particiones"""
+        total = 0
+        for table in self._tables_in_range(connection, None, None):
+            total += connection.execute(select(func.count()).select_from(table)).scalar() or 0
+        return total
+
+    # ------------------------------------------------------------------
+    # Retención
+    # ------------------------------------------------------------------
+
+    def drop_before(self, session, cutoff: datetime) -> int:
+        """
+        Elimina las particiones de los días anteriores al día de cutoff
+
+        La retención es por días completos: la partición del propio día de
+        cutoff se conserva entera.
+
+        Returns:
+            Número de particiones eliminadas
+        """
+        connection = session.connection()
+        dropped = 0
+        for day in self.partition_days(connection):
+            if day >= cutoff.date():
+                break
+            table = self.table_for(day)
+            table.drop(bind=connection, checkfirst=True)
+            with self._lock:
+                self.metadata.remove(table)
+            dropped += 1
+        return dropped
+
+
+class RollupPartitions(HistoryPartitions):
+    """
+    Rollups OHLC de 5 minutos particionados por día
+
+    Son los que más filas generan y solo sirven para ventanas cortas, así
+    que siguen la retención del histórico crudo: cada día va en su tabla
+    (price_rollups_5m_YYYYMMDD) y se eliminan con DROP TABLE. Los rollups
+    horarios y diarios se quedan en price_rollups.
+
+    La clave primaria (item_id, platform_id, bucket) es la restricción del
+    upsert que combina high/low/count.
+    """
+
+    prefix = ROLLUP_PARTITION_PREFIX
+    columns = ROLLUP_COLUMNS
+    time_column = 'bucket'
+
+    # Resolución en segundos de los rollups que se guardan aquí
+    resolution = 300
+
+    def _schema(self, name: str) -> List:
+        return [
+            Column('item_id', Integer, nullable=False),
+            Column('platform_id', Integer, nullable=False),
+            Column('bucket', DateTime, nullable=False),  # Inicio del intervalo (UTC)
+            Column('open', BigInteger, nullable=False),  # Milésimas de dólar
+            Column('high', BigInteger, nullable=False),
+            Column('low', BigInteger, nullable=False),
+            Column('close', BigInteger, nullable=False),
+            Column('count', Integer, nullable=False),
+            PrimaryKeyConstraint('item_id', 'platform_id', 'bucket', name=f"{name}_pkey"),
+        ]
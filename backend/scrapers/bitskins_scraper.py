@@ -8,6 +8,7 @@ sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from backend.core.base_scraper import BaseScraper
 from backend.core.translator import get_translator
+from backend.core.price_record import PriceRecord
 
 
 class BitskinsScraper(BaseScraper):
@@ -27,7 +28,7 @@ class BitskinsScraper(BaseScraper):
         
         self.translator = get_translator('bitskins', self.config_manager.get_language_config())
     
-    def fetch_data(self) -> List[Dict]:
+    def fetch_data(self) -> List[PriceRecord]:
         """Obtiene datos de la API de Bitskins"""
         self.logger.info("Obteniendo datos de Bitskins...")
         
@@ -36,7 +37,7 @@ class BitskinsScraper(BaseScraper):
             return self.parse_response(response)
         return []
     
-    def parse_response(self, response) -> List[Dict]:
+    def parse_response(self, response) -> List[PriceRecord]:
         """Parsea la respuesta de Bitskins"""
         try:
             data = response.json()
@@ -54,13 +55,8 @@ class BitskinsScraper(BaseScraper):
                 price_min = item.get('price_min', 0)  # Precio en milésimas
                 
                 if name:
-                    # Convertir de milésimas a dólares (price_min está en milésimas)
-                    price_dollars = self._convert_price(price_min)
-                    
-                    items.append({
-                        'Item': name,
-                        'Price': price_dollars
-                    })
+                    # price_min ya está en milésimas de dólar, igual que PriceRecord
+                    items.append(self.make_record(name, price_minor=price_min))
             
             self.logger.info(f"Parseados {len(items)} items de Bitskins")
             
@@ -75,19 +71,6 @@ class BitskinsScraper(BaseScraper):
                 print(self.translator.gettext('fetch_error', error=str(e)), flush=True)
             return []
     
-    def _convert_price(self, price_min: int) -> str:
-        """
-        Convierte el precio de Bitskins (en milésimas) a dólares
-        
-        Args:
-            price_min: Precio en milésimas (ej: 1000 = $1.00)
-        
-        Returns:
-            Precio formateado como string
-        """
-        return f"{price_min / 1000:.2f}"
-
-
 
 def main():
     scraper = BitskinsScraper()
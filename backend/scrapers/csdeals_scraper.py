@@ -9,6 +9,7 @@ sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from backend.core.base_scraper import BaseScraper
 from backend.core.translator import get_translator
+from backend.core.price_record import PriceRecord
 
 
 class CSDealsScraper(BaseScraper):
@@ -42,7 +43,7 @@ class CSDealsScraper(BaseScraper):
             'Referer': 'https://cs.deals/'
         })
     
-    def fetch_data(self) -> List[Dict]:
+    def fetch_data(self) -> List[PriceRecord]:
         """
         Obtiene los datos de la API de CSDeals
         
@@ -59,7 +60,7 @@ class CSDealsScraper(BaseScraper):
         
         return []
     
-    def parse_response(self, response) -> List[Dict]:
+    def parse_response(self, response) -> List[PriceRecord]:
         """
         Parsea la respuesta de CSDeals
         
@@ -96,13 +97,8 @@ class CSDealsScraper(BaseScraper):
                 if not name or price is None:
                     continue
                 
-                # Crear item con formato estándar
-                formatted_item = {
-                    'Item': name,
-                    'Price': float(price)  # CSDeals ya devuelve el precio en formato decimal
-                }
-                
-                items.append(formatted_item)
+                # CSDeals ya devuelve el precio en formato decimal
+                items.append(self.make_record(name, price=price))
             
             self.logger.info(f"Parseados {len(items)} items de CSDeals")
             
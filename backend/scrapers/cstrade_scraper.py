@@ -8,6 +8,7 @@ sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from backend.core.base_scraper import BaseScraper
 from backend.core.translator import get_translator
+from backend.core.price_record import PriceRecord
 
 
 class CstradeScraper(BaseScraper):
@@ -30,7 +31,7 @@ class CstradeScraper(BaseScraper):
         
         self.translator = get_translator('cstrade', self.config_manager.get_language_config())
     
-    def fetch_data(self) -> List[Dict]:
+    def fetch_data(self) -> List[PriceRecord]:
         """Obtiene datos de la API de CsTrade"""
         self.logger.info("Obteniendo datos de CsTrade...")
         
@@ -39,7 +40,7 @@ class CstradeScraper(BaseScraper):
             return self.parse_response(response)
         return []
     
-    def parse_response(self, response) -> List[Dict]:
+    def parse_response(self, response) -> List[PriceRecord]:
         """Parsea la respuesta de CsTrade"""
         try:
             data = response.json()
@@ -58,10 +59,7 @@ class CstradeScraper(BaseScraper):
                 # Calcular precio real antes del bono
                 real_price = self._calculate_real_price(original_price, self.bonus_rate)
                 
-                items.append({
-                    'Item': item_name,
-                    'Price': f"{real_price:.2f}"
-                })
+                items.append(self.make_record(item_name, price=real_price))
             
             self.logger.info(f"Parseados {len(items)} items de CsTrade")
             
@@ -9,6 +9,7 @@ sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from backend.core.base_scraper import BaseScraper
 from backend.core.translator import get_translator
+from backend.core.price_record import PriceRecord
 
 
 class EmpireScraper(BaseScraper):
@@ -39,7 +40,7 @@ class EmpireScraper(BaseScraper):
         # Tasa de conversión Empire coins a USD
         self.conversion_rate = 0.6154
     
-    def fetch_data(self) -> List[Dict]:
+    def fetch_data(self) -> List[PriceRecord]:
         """Obtiene datos de Empire combinando auction=yes y auction=no"""
         self.logger.info("Obteniendo datos de Empire...")
         
@@ -51,13 +52,13 @@ class EmpireScraper(BaseScraper):
             
             # Combinar items, manteniendo el precio más bajo
             for name, item_data in items.items():
-                if name not in all_items or item_data['Price'] < all_items[name]['Price']:
+                if name not in all_items or item_data.price_minor < all_items[name].price_minor:
                     all_items[name] = item_data
         
         # Convertir a lista
         return list(all_items.values())
     
-    def _fetch_auction_items(self, auction_type: str) -> Dict[str, Dict]:
+    def _fetch_auction_items(self, auction_type: str) -> Dict[str, PriceRecord]:
         """Obtiene items de un tipo de subasta específico"""
         items = {}
         page = 1
@@ -86,17 +87,11 @@ class EmpireScraper(BaseScraper):
             for item in page_items:
                 name = item.get("market_name", "Unknown")
                 price_in_coins = item.get("market_value", 0) / 100.0
-                price_in_usd = price_in_coins * self.conversion_rate
-                item_id = item.get("id")
+                record = self.make_record(name, price=price_in_coins * self.conversion_rate)
                 
                 # Guardar item si es nuevo o tiene precio menor
-                if name not in items or price_in_usd < items[name]['Price']:
-                    items[name] = {
-                        'Item': name,
-                        'Price': f"{price_in_usd:.3f}",
-                        'Coin': f"{price_in_coins:.3f}",
-                        'id': item_id
-                    }
+                if name not in items or record.price_minor < items[name].price_minor:
+                    items[name] = record
             
             self.logger.info(f"Página {page} con auction={auction_type}: {len(page_items)} items")
             page += 1
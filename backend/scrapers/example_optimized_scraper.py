@@ -5,6 +5,7 @@ Ejemplo de scraper optimizado usando todas las mejoras disponibles
 from typing import List, Dict, Optional
 import asyncio
 from backend.scrapers.concurrent_scraper import ConcurrentScraper
+from backend.core.price_record import PriceRecord
 
 
 class ExampleOptimizedScraper(ConcurrentScraper):
@@ -14,7 +15,7 @@ class ExampleOptimizedScraper(ConcurrentScraper):
         super().__init__('ExamplePlatform', use_proxy)
         self.base_url = "https://api.example.com/items"
         
-    def fetch_data(self) -> List[Dict]:
+    def fetch_data(self) -> List[PriceRecord]:
         """Implementación optimizada con caché y concurrencia"""
         # Intentar obtener del caché primero
         cache_key = f"{self.platform_name}:all_items"
@@ -29,24 +30,21 @@ class ExampleOptimizedScraper(ConcurrentScraper):
         # Usar caché con TTL de 5 minutos
         return self.get_cached_data(cache_key, fetch_fresh_data, ttl=300)
     
-    def parse_page(self, response) -> List[Dict]:
+    def parse_page(self, response) -> List[PriceRecord]:
         """Parsea una página de resultados"""
         try:
             data = response.json()
             items = []
             
             for item in data.get('items', []):
-                items.append({
-                    'Item': item['name'],
-                    'Price': item['price']
-                })
+                items.append(self.make_record(item['name'], price=item['price']))
             
             return items
         except Exception as e:
             self.logger.error(f"Error parseando: {e}")
             return []
     
-    async def fetch_data_async(self) -> List[Dict]:
+    async def fetch_data_async(self) -> List[PriceRecord]:
         """Versión asíncrona para máximo rendimiento"""
         urls = [f"{self.base_url}?page={i}" for i in range(1, 11)]
         
@@ -58,10 +56,7 @@ class ExampleOptimizedScraper(ConcurrentScraper):
         for result in all_results:
             if result and 'items' in result:
                 for item in result['items']:
-                    items.append({
-                        'Item': item['name'],
-                        'Price': item['price']
-                    })
+                    items.append(self.make_record(item['name'], price=item['price']))
         
         return items
     
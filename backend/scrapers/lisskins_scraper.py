@@ -4,6 +4,7 @@ import sys
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent.parent))
 from backend.core.base_scraper import BaseScraper
+from backend.core.price_record import PriceRecord
 class LisskinsScraper(BaseScraper):
     """Scraper para Lis-skins.com"""
     
@@ -15,13 +16,13 @@ class LisskinsScraper(BaseScraper):
             'https://lis-skins.com/market_export_json/api_csgo_full.json'
         )
     
-    def fetch_data(self) -> List[Dict]:
+    def fetch_data(self) -> List[PriceRecord]:
         response = self.make_request(self.api_url)
         if response:
             return self.parse_response(response)
         return []
     
-    def parse_response(self, response) -> List[Dict]:
+    def parse_response(self, response) -> List[PriceRecord]:
         try:
             data = response.json()
             
@@ -33,19 +34,15 @@ class LisskinsScraper(BaseScraper):
                 price = item.get('price')
                 
                 if name and price is not None:
-                    if name in cheapest_items:
-                        if price < cheapest_items[name]['Price']:
-                            cheapest_items[name] = {
-                                'Item': name,
-                                'Price': price,
-                                'URL': f"https://lis-skins.com/ru/market/csgo/{self._format_url_name(name)}"
-                            }
-                    else:
-                        cheapest_items[name] = {
-                            'Item': name,
-                            'Price': price,
-                            'URL': f"https://lis-skins.com/ru/market/csgo/{self._format_url_name(name)}"
-                        }
+                    record = self.make_record(name, price=price)
+                    if record.price_minor is None:
+                        continue
+                    
+                    current = cheapest_items.get(name)
+                    if current is None or record.price_minor < current.price_minor:
+                        cheapest_items[name] = record._replace(
+                            url=f"https://lis-skins.com/ru/market/csgo/{self._format_url_name(name)}"
+                        )
             
             items = list(cheapest_items.values())
             self.logger.info(f"Parseados {len(items)} items de Lisskins")
@@ -13,6 +13,7 @@ sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from backend.core.base_scraper import BaseScraper
 from backend.core.translator import get_translator
+from backend.core.price_record import PriceRecord
 
 
 class ManncoStoreScraper(BaseScraper):
@@ -59,7 +60,7 @@ class ManncoStoreScraper(BaseScraper):
         else:
             self.driver = uc.Chrome(options=options)
     
-    def fetch_data(self) -> List[Dict]:
+    def fetch_data(self) -> List[PriceRecord]:
         """Obtiene datos de ManncoStore usando Selenium"""
         self.logger.info("Obteniendo datos de ManncoStore...")
         
@@ -85,7 +86,7 @@ class ManncoStoreScraper(BaseScraper):
         self.logger.info(f"Total items obtenidos: {len(all_items)}")
         return all_items
     
-    def _fetch_page(self, skip: int) -> List[Dict]:
+    def _fetch_page(self, skip: int) -> List[PriceRecord]:
         """Obtiene items de una página específica"""
         try:
             url = self.base_url.format(skip)
@@ -102,11 +103,12 @@ class ManncoStoreScraper(BaseScraper):
             if isinstance(data, list) and len(data) > 0:
                 items = []
                 for item in data:
-                    items.append({
-                        'Item': item['name'],
-                        'Price': self._transform_price(item['price']),
-                        'URL': self.manncostore_url + (item.get('url', ''))
-                    })
+                    # ManncoStore da el precio en centavos
+                    items.append(self.make_record(
+                        item['name'],
+                        price_minor=int(item['price']) * 10,
+                        url=self.manncostore_url + (item.get('url', ''))
+                    ))
                 
                 if hasattr(self, 'translator'):
                     print(self.translator.gettext('success_message', skip=skip, total_items=len(items)), flush=True)
@@ -126,14 +128,6 @@ class ManncoStoreScraper(BaseScraper):
                 print(self.translator.gettext('fetch_error', skip=skip, error=str(e)), flush=True)
             return []
     
-    def _transform_price(self, price: int) -> str:
-        """Transforma el precio a formato XX.XX"""
-        price_str = str(price)
-        if len(price_str) > 2:
-            return f"{price_str[:-2]}.{price_str[-2:]}"
-        else:
-            return f"0.{price_str.zfill(2)}"
-    
     def parse_response(self, response):
         """No se usa en ManncoStore, el parsing se hace en fetch_data"""
         pass
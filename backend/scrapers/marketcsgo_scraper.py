@@ -8,6 +8,7 @@ sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from backend.core.base_scraper import BaseScraper
 from backend.core.translator import get_translator
+from backend.core.price_record import PriceRecord
 
 
 class MarketCSGOScraper(BaseScraper):
@@ -27,7 +28,7 @@ class MarketCSGOScraper(BaseScraper):
         
         self.translator = get_translator('marketcsgo', self.config_manager.get_language_config())
     
-    def fetch_data(self) -> List[Dict]:
+    def fetch_data(self) -> List[PriceRecord]:
         """Obtiene datos de la API de Market.csgo"""
         self.logger.info("Obteniendo datos de Market.csgo...")
         
@@ -36,7 +37,7 @@ class MarketCSGOScraper(BaseScraper):
             return self.parse_response(response)
         return []
     
-    def parse_response(self, response) -> List[Dict]:
+    def parse_response(self, response) -> List[PriceRecord]:
         """Parsea la respuesta de Market.csgo"""
         try:
             data = response.json()
@@ -57,10 +58,8 @@ class MarketCSGOScraper(BaseScraper):
                 price = item.get("price")
                 
                 if name and price is not None:
-                    items.append({
-                        'Item': name,
-                        'Price': float(price)  # Market.csgo ya da precio en formato correcto
-                    })
+                    # Market.csgo ya da precio en formato correcto
+                    items.append(self.make_record(name, price=price))
             
             self.logger.info(f"Parseados {len(items)} items de Market.csgo")
             print(f"Data saved in market.csgo_data.json", flush=True)
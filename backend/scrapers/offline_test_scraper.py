@@ -1,6 +1,8 @@
 # backend/scrapers/offline_test_scraper.py
 from backend.core.base_scraper import BaseScraper
+from backend.core.price_record import PriceRecord
 from datetime import datetime
+from typing import List
 import random
 
 class OfflineTestScraper(BaseScraper):
@@ -9,17 +11,17 @@ class OfflineTestScraper(BaseScraper):
     def __init__(self, use_proxy=None):
         super().__init__('OfflineTest', use_proxy=False)
     
-    def fetch_data(self):
+    def fetch_data(self) -> List[PriceRecord]:
         """Genera datos de prueba sin conexión"""
         self.logger.info("Generando datos de prueba (modo offline)...")
         
         # Simular datos
         items = []
         for i in range(10):
-            items.append({
-                'Item': f'Test Item {i+1}',
-                'Price': round(random.uniform(10, 1000), 2)
-            })
+            items.append(self.make_record(
+                f'Test Item {i+1}',
+                price=round(random.uniform(10, 1000), 2)
+            ))
         
         return items
     
@@ -5,6 +5,7 @@ filename = os.path.basename(__file__)
 from backend.core.base_scraper import BaseScraper
 from typing import List, Dict, Optional
 from backend.core.translator import get_translator
+from backend.core.price_record import PriceRecord
 class RapidskinsScraper(BaseScraper):
     """
     Scraper para Rapidskins.com usando GraphQL
@@ -25,7 +26,7 @@ class RapidskinsScraper(BaseScraper):
             "Content-Type": "application/json"
         })
     
-    def fetch_data(self) -> List[Dict]:
+    def fetch_data(self) -> List[PriceRecord]:
         """Obtiene datos de Rapidskins usando GraphQL"""
         self.logger.info("Obteniendo datos de Rapidskins...")
         
@@ -52,7 +53,7 @@ class RapidskinsScraper(BaseScraper):
         
         return all_items
     
-    def _fetch_page(self, page: int) -> List[Dict]:
+    def _fetch_page(self, page: int) -> List[PriceRecord]:
         """Obtiene items de una página específica"""
         query = """
         query Inventories($filter: InventoryFilters!) { 
@@ -104,15 +105,13 @@ class RapidskinsScraper(BaseScraper):
                 data = response.json()
                 items = data['data']['siteInventory']['csgo']['items']
                 
-                # Formatear items
+                # Formatear items (coinAmount viene en centavos)
                 formatted_items = []
                 for item in items:
-                    formatted_items.append({
-                        'marketHashName': item['marketHashName'],
-                        'price': {
-                            'coinAmount': item['price']['coinAmount']
-                        }
-                    })
+                    formatted_items.append(self.make_record(
+                        item['marketHashName'],
+                        price_minor=item['price']['coinAmount'] * 10
+                    ))
                 
                 return formatted_items
                 
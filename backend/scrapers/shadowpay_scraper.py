@@ -1,5 +1,6 @@
 # backend/scrapers/shadowpay_scraper.py
 from backend.core.base_scraper import BaseScraper
+from backend.core.price_record import PriceRecord
 from typing import List, Dict, Optional
 class ShadowpayScraper(BaseScraper):
     """Scraper para Shadowpay.com"""
@@ -18,22 +19,22 @@ class ShadowpayScraper(BaseScraper):
             if api_key:
                 self.headers['Authorization'] = f'Bearer {api_key}'
     
-    def fetch_data(self) -> List[Dict]:
+    def fetch_data(self) -> List[PriceRecord]:
         response = self.make_request(self.api_url)
         if response:
             return self.parse_response(response)
         return []
     
-    def parse_response(self, response) -> List[Dict]:
+    def parse_response(self, response) -> List[PriceRecord]:
         try:
             data = response.json()
             
             items = []
             for item in data.get("data", []):
-                items.append({
-                    "Item": item["steam_market_hash_name"],
-                    "Price": item["price"]
-                })
+                items.append(self.make_record(
+                    item["steam_market_hash_name"],
+                    price=item["price"]
+                ))
             
             self.logger.info(f"Parseados {len(items)} items de Shadowpay")
             print("Data saved successfully", flush=True)
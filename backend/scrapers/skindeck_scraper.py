@@ -2,6 +2,7 @@
 from backend.core.base_scraper import BaseScraper
 from typing import List, Dict, Optional
 from backend.core.translator import get_translator
+from backend.core.price_record import PriceRecord
 class SkindeckScraper(BaseScraper):
     """
     Scraper para Skindeck.com
@@ -29,7 +30,7 @@ class SkindeckScraper(BaseScraper):
         
         self.translator = get_translator('skindeck', self.config_manager.get_language_config())
     
-    def fetch_data(self) -> List[Dict]:
+    def fetch_data(self) -> List[PriceRecord]:
         """Obtiene datos de Skindeck"""
         params = {
             'page': 1,
@@ -42,7 +43,7 @@ class SkindeckScraper(BaseScraper):
             return self.parse_response(response)
         return []
     
-    def parse_response(self, response) -> List[Dict]:
+    def parse_response(self, response) -> List[PriceRecord]:
         try:
             data = response.json()
             
@@ -62,10 +63,7 @@ class SkindeckScraper(BaseScraper):
                 price = item['offer'].get('price')
                 
                 if name and price is not None:
-                    items.append({
-                        'Item': name,
-                        'Price': price
-                    })
+                    items.append(self.make_record(name, price=price))
             
             self.logger.info(f"Parseados {len(items)} items de Skindeck")
             
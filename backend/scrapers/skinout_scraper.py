@@ -12,6 +12,7 @@ sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from backend.core.base_scraper import BaseScraper
 from backend.core.translator import get_translator
+from backend.core.price_record import PriceRecord
 
 
 class SkinoutScraper(BaseScraper):
@@ -35,7 +36,7 @@ class SkinoutScraper(BaseScraper):
         self.empty_pages_threshold = 3
         self.retry_delay = 5
     
-    def fetch_data(self) -> List[Dict]:
+    def fetch_data(self) -> List[PriceRecord]:
         """Obtiene datos de Skinout usando múltiples threads"""
         self.logger.info("Obteniendo datos de Skinout...")
         
@@ -59,7 +60,7 @@ class SkinoutScraper(BaseScraper):
         self.logger.info(f"Total items obtenidos de Skinout: {len(all_items)}")
         return all_items
     
-    def _process_batch(self, start_page: int, batch_size: int) -> tuple[List[Dict], bool]:
+    def _process_batch(self, start_page: int, batch_size: int) -> tuple[List[PriceRecord], bool]:
         """Procesa un lote de páginas en paralelo"""
         results = []
         empty_pages = 0
@@ -85,7 +86,7 @@ class SkinoutScraper(BaseScraper):
         
         return results, False
     
-    def _obtain_page_data(self, page: int) -> tuple[int, List[Dict]]:
+    def _obtain_page_data(self, page: int) -> tuple[int, List[PriceRecord]]:
         """Obtiene datos de una página específica con reintentos"""
         while True:  # Bucle infinito para reintentos
             try:
@@ -108,10 +109,7 @@ class SkinoutScraper(BaseScraper):
                 if data.get('success') and 'items' in data:
                     items = data['items']
                     formatted_items = [
-                        {
-                            'Item': item['market_hash_name'],
-                            'Price': item['price']
-                        }
+                        self.make_record(item['market_hash_name'], price=item['price'])
                         for item in items
                     ]
                     return page, formatted_items
@@ -8,6 +8,7 @@ sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from backend.core.base_scraper import BaseScraper
 from backend.core.translator import get_translator
+from backend.core.price_record import PriceRecord
 
 
 class SkinportScraper(BaseScraper):
@@ -27,7 +28,7 @@ class SkinportScraper(BaseScraper):
         
         self.translator = get_translator('skinports', self.config_manager.get_language_config())
     
-    def fetch_data(self) -> List[Dict]:
+    def fetch_data(self) -> List[PriceRecord]:
         """Obtiene datos de la API de Skinport"""
         self.logger.info("Obteniendo datos de Skinport...")
         
@@ -36,7 +37,7 @@ class SkinportScraper(BaseScraper):
             return self.parse_response(response)
         return []
     
-    def parse_response(self, response) -> List[Dict]:
+    def parse_response(self, response) -> List[PriceRecord]:
         """Parsea la respuesta de Skinport"""
         try:
             data = response.json()
@@ -56,10 +57,7 @@ class SkinportScraper(BaseScraper):
                 price = item.get('min_price')
                 
                 if name and price is not None:
-                    items.append({
-                        'Item': name,
-                        'Price': str(price)  # Skinport ya da precio en formato correcto
-                    })
+                    items.append(self.make_record(name, price=price))
             
             self.logger.info(f"Parseados {len(items)} items de Skinport")
             
@@ -9,6 +9,7 @@ sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from backend.core.base_scraper import BaseScraper
 from backend.core.translator import get_translator
+from backend.core.price_record import PriceRecord
 class SteamListingScraper(BaseScraper):
     """
     Scraper para precios de venta de Steam (sell prices)
@@ -19,7 +20,7 @@ class SteamListingScraper(BaseScraper):
         
         self.base_url = "https://steamcommunity.com/market/search/render/?query=&start={}&count=100&search_descriptions=0&sort_column=popular&sort_dir=desc&appid=730&norender=1"
     
-    def fetch_data(self) -> List[Dict]:
+    def fetch_data(self) -> List[PriceRecord]:
         """Obtiene precios de venta de Steam Market"""
         self.logger.info("Obteniendo precios de venta de Steam...")
         
@@ -41,7 +42,7 @@ class SteamListingScraper(BaseScraper):
         
         return all_items
     
-    def _get_market_items(self, start: int) -> List[Dict]:
+    def _get_market_items(self, start: int) -> List[PriceRecord]:
         """Obtiene items con precios de venta"""
         url = self.base_url.format(start)
         response = self.make_request(url, max_retries=20)
@@ -56,21 +57,17 @@ class SteamListingScraper(BaseScraper):
         
         return []
     
-    def _extract_items(self, json_data: List) -> List[Dict]:
+    def _extract_items(self, json_data: List) -> List[PriceRecord]:
         """Extrae items con precios de venta"""
         items = []
         for item in json_data:
             try:
+                # make_record convierte el nombre al formato canónico
                 name = item.get('name', 'Unknown')
-                name = name.replace("/", "-")
                 
                 sell_price_cents = item.get('sell_price', 0)
-                sell_price_dollars = sell_price_cents / 100.0
                 
-                items.append({
-                    "name": name,
-                    "price": sell_price_dollars
-                })
+                items.append(self.make_record(name, price_minor=int(sell_price_cents) * 10))
             except Exception as e:
                 self.logger.error(f"Error extrayendo item: {e}")
         
@@ -10,6 +10,7 @@ sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from backend.core.base_scraper import BaseScraper
 from backend.core.translator import get_translator
+from backend.core.price_record import PriceRecord
 
 
 class SteamMarketScraper(BaseScraper):
@@ -25,7 +26,7 @@ class SteamMarketScraper(BaseScraper):
         
         self.translator = get_translator('SteamMarket_vproxy', self.config_manager.get_language_config())
     
-    def fetch_data(self) -> List[Dict]:
+    def fetch_data(self) -> List[PriceRecord]:
         """Obtiene datos del Steam Market usando item_nameids"""
         self.logger.info("Obteniendo datos de Steam Market...")
         
@@ -60,7 +61,7 @@ class SteamMarketScraper(BaseScraper):
         self.logger.info(f"Obtenidos {len(results)} precios de Steam Market")
         return results
     
-    def _process_item(self, item: Dict) -> Optional[Dict]:
+    def _process_item(self, item: Dict) -> Optional[PriceRecord]:
         """Procesa un item individual"""
         item_nameid = item.get('id')
         name = unquote(item.get('name', ''))
@@ -77,20 +78,15 @@ class SteamMarketScraper(BaseScraper):
                 
                 # Verificar si hay highest_buy_order
                 if 'highest_buy_order' in data and data['highest_buy_order'] is not None:
-                    highest_buy_order = int(data['highest_buy_order']) / 100.0
+                    # highest_buy_order viene en centavos
+                    highest_buy_order = int(data['highest_buy_order']) * 10
                     
                     print(self.translator.gettext('data_retrieved_success', total_items=1), flush=True)
                     
-                    return {
-                        "name": name,
-                        "price": highest_buy_order
-                    }
+                    return self.make_record(name, price_minor=highest_buy_order)
                 else:
                     self.logger.debug(f"No buy order para: {name}")
-                    return {
-                        "name": name,
-                        "price": 0
-                    }
+                    return self.make_record(name, price_minor=0)
                     
             except Exception as e:
                 self.logger.error(f"Error procesando {name}: {e}")
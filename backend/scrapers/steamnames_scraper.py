@@ -64,7 +64,7 @@ class SteamNamesScraper(BaseScraper):
         for item in json_data:
             try:
                 name = item.get('name', 'Unknown')
-                name = name.replace("/", "-")  # Limpiar nombre
+                name = self.name_index.canonical(name)  # Limpiar nombre
                 items.append({"name": name})
             except Exception as e:
                 self.logger.error(f"Error extrayendo item: {e}")
@@ -7,6 +7,7 @@ import shutil
 import undetected_chromedriver as uc
 sys.path.append(str(Path(__file__).parent.parent.parent))
 from backend.core.base_scraper import BaseScraper
+from backend.core.price_record import PriceRecord
 
 class TradeitScraper(BaseScraper):
     """
@@ -44,7 +45,7 @@ class TradeitScraper(BaseScraper):
             self.logger.error(f"Error configurando ChromeDriver: {e}")
             self.driver = None
 
-    def fetch_data(self) -> List[Dict]:
+    def fetch_data(self) -> List[PriceRecord]:
         """Obtiene datos de Tradeit usando Selenium"""
         self.logger.info("Obteniendo datos de Tradeit...")
         
@@ -73,7 +74,7 @@ class TradeitScraper(BaseScraper):
         
         return all_items
     
-    def _fetch_inventory_data(self, offset: int) -> List[Dict]:
+    def _fetch_inventory_data(self, offset: int) -> List[PriceRecord]:
         """Obtiene datos de inventario de una página"""
         try:
             url = self.base_url.format(offset)
@@ -96,13 +97,11 @@ class TradeitScraper(BaseScraper):
                 name = item.get('name', 'Unnamed Item')
                 price_for_trade = item.get('priceForTrade', 0)
                 
-                # Convertir precio a float
-                price_for_trade = float(price_for_trade) / 100
-                
-                inventory_data.append({
-                    "Item": name,
-                    "Price": price_for_trade
-                })
+                # Tradeit da el precio en centavos
+                inventory_data.append(self.make_record(
+                    name,
+                    price_minor=int(price_for_trade) * 10
+                ))
             
             return inventory_data
             
@@ -9,6 +9,7 @@ sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from backend.core.base_scraper import BaseScraper
 from backend.core.translator import get_translator
+from backend.core.price_record import PriceRecord
 
 
 class WaxpeerScraper(BaseScraper):
@@ -43,7 +44,7 @@ class WaxpeerScraper(BaseScraper):
         # Configurar traductor
         self.translator = get_translator('waxpeer', self.config_manager.get_language_config())
     
-    def fetch_data(self) -> List[Dict]:
+    def fetch_data(self) -> List[PriceRecord]:
         """
         Obtiene los datos de la API de Waxpeer
         
@@ -60,7 +61,7 @@ class WaxpeerScraper(BaseScraper):
         
         return []
     
-    def parse_response(self, response) -> List[Dict]:
+    def parse_response(self, response) -> List[PriceRecord]:
         """
         Parsea la respuesta de Waxpeer
         
@@ -93,20 +94,13 @@ class WaxpeerScraper(BaseScraper):
                 if not name:
                     continue
                 
-                # Formatear precio (Waxpeer lo da en centavos)
-                price = self._format_price(price_raw)
-                
-                # Crear item con formato estándar
-                formatted_item = {
-                    'Item': name,
-                    'Price': price
-                }
-                
                 # URL opcional si está disponible
+                url = None
                 if item.get('steam_market_hash_name'):
-                    formatted_item['URL'] = f"https://waxpeer.com/es/?game=csgo&search={name}"
+                    url = f"https://waxpeer.com/es/?game=csgo&search={name}"
                 
-                items.append(formatted_item)
+                # Waxpeer da el precio como entero en milésimas de dólar
+                items.append(self.make_record(name, price_minor=price_raw, url=url))
             
             self.logger.info(f"Parseados {len(items)} items de Waxpeer")
             
@@ -120,25 +114,6 @@ class WaxpeerScraper(BaseScraper):
             self.logger.error(f"Error parseando respuesta de Waxpeer: {e}")
             return []
     
-    def _format_price(self, price: int) -> str:
-        """
-        Formatea el precio de Waxpeer (viene en centavos como entero)
-        
-        Args:
-            price: Precio en centavos (ej: 1234 = $12.34)
-            
-        Returns:
-            Precio formateado como string
-        """
-        price_str = str(price)
-        
-        if len(price_str) <= 3:
-            # Precios menores a $1.00
-            return "0." + price_str.zfill(3)
-        else:
-            # Insertar punto decimal
-            return price_str[:-3] + '.' + price_str[-3:]
-
 
     def main():
         """
@@ -7,6 +7,7 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from backend.core.base_scraper import BaseScraper
+from backend.core.price_record import PriceRecord
 
 
 class WhiteScraper(BaseScraper):
@@ -20,23 +21,23 @@ class WhiteScraper(BaseScraper):
             'https://api.white.market/export/v1/prices/730.json'
         )
     
-    def fetch_data(self) -> List[Dict]:
+    def fetch_data(self) -> List[PriceRecord]:
         response = self.make_request(self.api_url)
         if response:
             return self.parse_response(response)
         return []
     
-    def parse_response(self, response) -> List[Dict]:
+    def parse_response(self, response) -> List[PriceRecord]:
         try:
             data = response.json()
             
             items = []
             for item in data:
-                items.append({
-                    "Item": item["market_hash_name"],
-                    "Price": item["price"],
-                    "URL": item["market_product_link"]
-                })
+                items.append(self.make_record(
+                    item["market_hash_name"],
+                    price=item["price"],
+                    url=item["market_product_link"]
+                ))
             
             self.logger.info(f"Parseados {len(items)} items de White")
             print(f"Datos guardados en white_data.json, esperando 5 segundos para el reinicio...", flush=True)
@@ -0,0 +1,397 @@
+# backend/services/arbitrage_service.py
+
+import json
+import threading
+import time
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+from loguru import logger
+
+from backend.core.config_manager import get_config_manager
+from backend.core.item_registry import get_item_registry
+from backend.core.live_prices import LivePrices
+from backend.core.price_record import MINOR_UNITS
+from backend.core.snapshot_store import atomic_write
+from backend.services.notification_service import get_notification_service
+from backend.services.profitability_service import (
+    ProfitabilityService, SteamFeeCalculator, create_analysis_trigger, round_decimals
+)
+
+
+@dataclass
+class PlatformFees:
+    """
+    Modelo de comisiones de una plataforma (fracciones: 0.05 = 5%)
+
+    En Steam la comisión de venta es siempre la tabla de SteamFeeCalculator
+    y sell_fee se ignora.
+    """
+    buy_fee: float = 0.0  # Recargo al comprar (depósito, pasarela de pago)
+    sell_fee: float = 0.0  # Comisión sobre el precio de venta
+    withdrawal_fee: float = 0.0  # Comisión al retirar el saldo de la venta
+    can_buy: bool = True
+    can_sell: bool = False  # Solo se vende donde hay comisiones configuradas
+
+    @classmethod
+    def from_settings(cls, data: Dict) -> 'PlatformFees':
+        known = {field.name for field in fields(cls)}
+        return cls(**{key: value for key, value in data.items() if key in known})
+
+    def buy_cost(self, prices: np.ndarray) -> np.ndarray:
+        """Coste total de compra (USD)"""
+        return prices * (1 + self.buy_fee)
+
+    def net_sell(self, prices: np.ndarray) -> np.ndarray:
+        """Importe neto retirado tras vender (USD)"""
+        return prices * (1 - self.sell_fee) * (1 - self.withdrawal_fee)
+
+
+@dataclass
+class ArbitrageOpportunity:
+    """Comprar un item en una plataforma y venderlo en otra"""
+    name: str
+    buy_platform: str
+    buy_price: float
+    buy_cost: float
+    buy_url: str
+    sell_platform: str
+    sell_price: float
+    net_sell_price: float
+    sell_url: str
+    rentabilidad: float
+
+    @property
+    def rentabilidad_percentage(self) -> float:
+        """Retorna la rentabilidad como porcentaje"""
+        return self.rentabilidad * 100
+
+    @property
+    def profit(self) -> float:
+        """Ganancia neta tras comisiones"""
+        return self.net_sell_price - self.buy_cost
+
+    def to_dict(self) -> dict:
+        """Convierte a diccionario para JSON"""
+        return {
+            'name': self.name,
+            'buy_platform': self.buy_platform,
+            'buy_price': self.buy_price,
+            'buy_cost': self.buy_cost,
+            'buy_url': self.buy_url,
+            'sell_platform': self.sell_platform,
+            'sell_price': self.sell_price,
+            'net_sell_price': self.net_sell_price,
+            'sell_url': self.sell_url,
+            'rentabilidad': self.rentabilidad,
+            'profit': self.profit
+        }
+
+
+class ArbitrageEngine:
+    """
+    Mejor compra contra mejor venta neta de cada item en todas las plataformas
+
+    Guarda dos matrices (plataforma x item_id): coste de compra con
+    comisiones (inf = no se puede comprar) e importe neto de venta (-inf =
+    no se puede vender). Por item se mantiene la mejor pareja de
+    plataformas distintas y su rentabilidad; en cada refresh() solo se
+    recalculan las columnas de los items cuyo precio cambió en alguna
+    plataforma (los cambios llegan de LivePrices).
+    """
+
+    def __init__(self, fees: Optional[Dict[str, PlatformFees]] = None,
+                 min_profit: Optional[float] = None, event_bus=None):
+        settings = get_config_manager().settings.get('arbitrage', {})
+        if fees is None:
+            fees = {platform: PlatformFees.from_settings(data)
+                    for platform, data in settings.get('fees', {}).items()}
+        self.min_profit = settings.get('min_profit', 0.05) if min_profit is None else min_profit
+
+        self.platforms = ('steam',) + ProfitabilityService.PLATFORMS
+        self.fees = [fees.get(platform, PlatformFees()) for platform in self.platforms]
+        self.fee_calculator = SteamFeeCalculator()
+        self.registry = get_item_registry()
+        self.live = LivePrices(self.platforms, event_bus)
+        self.logger = logger.bind(service="ArbitrageEngine")
+
+        count = len(self.platforms)
+        self._buy_cost = np.full((count, 0), np.inf)
+        self._net_sell = np.full((count, 0), -np.inf)
+        self._best_buy = np.zeros(0, dtype=np.int16)
+        self._best_sell = np.zeros(0, dtype=np.int16)
+        self._rentabilidad = np.full(0, np.nan)
+        self._notified: Set[Tuple[str, str, str, float]] = set()
+
+    def start(self):
+        """Escucha los SnapshotDiff de los scrapers que corren en este proceso"""
+        self.live.start()
+
+    def stop(self):
+        self.live.stop()
+
+    # ------------------------------------------------------------------
+    # Recálculo
+    # ------------------------------------------------------------------
+
+    def refresh(self) -> int:
+        """
+        Aplica los cambios de precios y recalcula los items afectados
+
+        Returns:
+            Número de items recalculados
+        """
+        dirty = self.live.refresh()
+        if not dirty:
+            return 0
+
+        item_ids = np.unique(np.concatenate(list(dirty.values())))
+        self._grow(int(item_ids[-1]) + 1)
+
+        for platform, ids in dirty.items():
+            index = self.platforms.index(platform)
+            fees = self.fees[index]
+            prices = self.live.take(platform, ids)
+            listed = prices > 0
+            usd = prices[listed] / MINOR_UNITS
+
+            cost = np.full(len(ids), np.inf)
+            if fees.can_buy:
+                cost[listed] = fees.buy_cost(usd)
+            self._buy_cost[index, ids] = cost
+
+            net = np.full(len(ids), -np.inf)
+            if fees.can_sell:
+                if platform == 'steam':
+                    usd = self.fee_calculator.subtract_fee_array(usd)
+                    net[listed] = usd * (1 - fees.withdrawal_fee)
+                else:
+                    net[listed] = fees.net_sell(usd)
+            self._net_sell[index, ids] = net
+
+        self._recompute(item_ids)
+        return len(item_ids)
+
+    def _grow(self, size: int):
+        current = self._buy_cost.shape[1]
+        if current >= size:
+            return
+        # Crecer con margen: los items nuevos no copian las matrices en cada refresh
+        extra = max(size, current + current // 4) - current
+        count = len(self.platforms)
+        self._buy_cost = np.hstack((self._buy_cost, np.full((count, extra), np.inf)))
+        self._net_sell = np.hstack((self._net_sell, np.full((count, extra), -np.inf)))
+        self._best_buy = np.concatenate((self._best_buy, np.zeros(extra, dtype=np.int16)))
+        self._best_sell = np.concatenate((self._best_sell, np.zeros(extra, dtype=np.int16)))
+        self._rentabilidad = np.concatenate((self._rentabilidad, np.full(extra, np.nan)))
+
+    def _recompute(self, item_ids: np.ndarray):
+        """
+        Mejor pareja (compra, venta) en plataformas distintas para unos items
+
+        La óptima es comprar en la más barata y vender en la mejor de las
+        demás, o vender en la mejor y comprar en la más barata de las demás:
+        basta con evaluar esas dos candidatas por item.
+        """
+        cost = self._buy_cost[:, item_ids]
+        net = self._net_sell[:, item_ids]
+        columns = np.arange(len(item_ids))
+
+        cheapest = cost.argmin(axis=0)
+        best_sell = net.argmax(axis=0)
+
+        # A: comprar en la más barata y vender en la mejor de las demás
+        net_others = net.copy()
+        net_others[cheapest, columns] = -np.inf
+        sell_a = net_others.argmax(axis=0)
+        cost_a, net_a = cost[cheapest, columns], net_others[sell_a, columns]
+
+        # B: vender en la mejor y comprar en la más barata de las demás
+        cost_others = cost.copy()
+        cost_others[best_sell, columns] = np.inf
+        buy_b = cost_others.argmin(axis=0)
+        cost_b, net_b = cost_others[buy_b, columns], net[best_sell, columns]
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            ratio_a = np.where(np.isfinite(cost_a) & np.isfinite(net_a),
+                               (net_a - cost_a) / cost_a, -np.inf)
+            ratio_b = np.where(np.isfinite(cost_b) & np.isfinite(net_b),
+                               (net_b - cost_b) / cost_b, -np.inf)
+
+        use_a = ratio_a >= ratio_b
+        ratio = np.where(use_a, ratio_a, ratio_b)
+        valid = np.isfinite(ratio)
+
+        rentabilidad = np.full(len(item_ids), np.nan)
+        rentabilidad[valid] = round_decimals(ratio[valid], 4)
+        self._best_buy[item_ids] = np.where(use_a, cheapest, buy_b)
+        self._best_sell[item_ids] = np.where(use_a, sell_a, best_sell)
+        self._rentabilidad[item_ids] = rentabilidad
+
+    # ------------------------------------------------------------------
+    # Resultados
+    # ------------------------------------------------------------------
+
+    def opportunities(self, min_profit: Optional[float] = None,
+                      limit: Optional[int] = None) -> List[ArbitrageOpportunity]:
+        """Oportunidades con rentabilidad >= min_profit, de mayor a menor"""
+        threshold = self.min_profit if min_profit is None else min_profit
+        with np.errstate(invalid='ignore'):
+            item_ids = np.flatnonzero(self._rentabilidad >= threshold)
+        order = np.argsort(-self._rentabilidad[item_ids], kind='stable')
+        return self._materialize(item_ids[order][:limit])
+
+    def new_in_top(self, k: int) -> List[ArbitrageOpportunity]:
+        """Oportunidades del top-k que no estaban en el top-k de la llamada anterior"""
+        top = self.opportunities(limit=k)
+        keys = [(item.name, item.buy_platform, item.sell_platform, item.rentabilidad) for item in top]
+        fresh = [item for item, key in zip(top, keys) if key not in self._notified]
+        self._notified = set(keys)
+        return fresh
+
+    def _materialize(self, item_ids: np.ndarray) -> List[ArbitrageOpportunity]:
+        if not len(item_ids):
+            return []
+
+        # Reunir los campos en bloque; solo los objetos se crean uno a uno
+        buy = self._best_buy[item_ids].astype(np.intp)
+        sell = self._best_sell[item_ids].astype(np.intp)
+        buy_prices = np.zeros(len(item_ids), dtype=np.int64)
+        sell_prices = np.zeros(len(item_ids), dtype=np.int64)
+        for index, platform in enumerate(self.platforms):
+            buy_prices[buy == index] = self.live.take(platform, item_ids[buy == index])
+            sell_prices[sell == index] = self.live.take(platform, item_ids[sell == index])
+
+        urls = [ProfitabilityService.STEAM_URL if platform == 'steam'
+                else ProfitabilityService.PLATFORM_URLS.get(platform, '')
+                for platform in self.platforms]
+        labels = [platform.capitalize() for platform in self.platforms]
+        opportunities = []
+        for name, b, s, buy_price, buy_cost, sell_price, net_sell, rent in zip(
+            self.registry.get_names(item_ids), buy.tolist(), sell.tolist(),
+            (buy_prices / MINOR_UNITS).tolist(), self._buy_cost[buy, item_ids].tolist(),
+            (sell_prices / MINOR_UNITS).tolist(), self._net_sell[sell, item_ids].tolist(),
+            self._rentabilidad[item_ids].tolist()
+        ):
+            opportunities.append(ArbitrageOpportunity(
+                name=name,
+                buy_platform=labels[b],
+                buy_price=buy_price,
+                buy_cost=buy_cost,
+                buy_url=urls[b] + name,
+                sell_platform=labels[s],
+                sell_price=sell_price,
+                net_sell_price=net_sell,
+                sell_url=urls[s] + name,
+                rentabilidad=rent
+            ))
+        return opportunities
+
+
+class ArbitrageService:
+    """Análisis de arbitraje entre todas las plataformas con guardado y notificaciones"""
+
+    def __init__(self, engine: Optional[ArbitrageEngine] = None):
+        self.engine = engine or ArbitrageEngine()
+        self.notification_service = get_notification_service()
+        self.output_file = Path('JSON') / 'arbitraje.json'
+        self.logger = logger.bind(service="ArbitrageService")
+
+    def save(self, opportunities: List[ArbitrageOpportunity]):
+        """Guarda las oportunidades en JSON de forma atómica"""
+        try:
+            data = [opportunity.to_dict() for opportunity in opportunities]
+            atomic_write(self.output_file, lambda f: json.dump(data, f, indent=4, ensure_ascii=False))
+            self.logger.info(f"Guardadas {len(data)} oportunidades de arbitraje en JSON")
+        except Exception as e:
+            self.logger.error(f"Error guardando arbitraje: {e}")
+
+    def notify_new(self, k: int):
+        """Notifica las oportunidades que acaban de entrar en el top-k"""
+        for opportunity in self.engine.new_in_top(k):
+            self.notification_service.notify_arbitrage(
+                item_name=opportunity.name,
+                buy_platform=opportunity.buy_platform,
+                buy_price=opportunity.buy_price,
+                sell_platform=opportunity.sell_platform,
+                sell_price=opportunity.sell_price,
+                profit_percentage=opportunity.rentabilidad_percentage,
+                profit_amount=opportunity.profit
+            )
+
+    def run(self):
+        """Ejecuta un análisis completo y muestra las mejores oportunidades"""
+        self.logger.info("Iniciando análisis de arbitraje...")
+        self.engine.refresh()
+        opportunities = self.engine.opportunities()
+        self.save(opportunities)
+
+        if not opportunities:
+            self.logger.warning("No se encontraron oportunidades de arbitraje")
+            return
+
+        self.logger.info(f"Encontradas {len(opportunities)} oportunidades de arbitraje")
+        print("\n" + "="*60)
+        print("TOP 10 OPORTUNIDADES DE ARBITRAJE ENTRE PLATAFORMAS")
+        print("="*60)
+
+        for i, item in enumerate(opportunities[:10], 1):
+            print(f"\n{i}. {item.name}")
+            print(f"   Comprar en: {item.buy_platform} - ${item.buy_price:.2f} (coste: ${item.buy_cost:.2f})")
+            print(f"   Vender en: {item.sell_platform} - ${item.sell_price:.2f} (neto: ${item.net_sell_price:.2f})")
+            print(f"   Rentabilidad: {item.rentabilidad_percentage:.2f}%")
+            print(f"   Ganancia: ${item.profit:.2f}")
+
+
+def run_arbitrage_monitor(cross_process: bool = True,
+                          stop_event: Optional[threading.Event] = None):
+    """
+    Monitor de arbitraje dirigido por eventos
+
+    Cada SNAPSHOT_READY (agrupando ráfagas) recalcula solo los items que
+    cambiaron y notifica las oportunidades que entran en el top. El JSON se
+    actualiza como mucho cada save_interval segundos.
+    """
+    settings = get_config_manager().settings
+    save_interval = settings.get('profitability', {}).get('save_interval', 5.0)
+    notify_top = settings.get('arbitrage', {}).get('notify_top', 5)
+
+    service = ArbitrageService()
+    engine = service.engine
+    stop_event = stop_event or threading.Event()
+    engine.start()
+    trigger, watcher = create_analysis_trigger(cross_process)
+    events = True  # Carga inicial
+    unsaved = False
+    last_save = 0.0
+
+    try:
+        while not stop_event.is_set():
+            try:
+                if events and engine.refresh():
+                    unsaved = True
+                    service.notify_new(notify_top)
+
+                now = time.monotonic()
+                if unsaved and now - last_save >= save_interval:
+                    service.save(engine.opportunities())
+                    unsaved = False
+                    last_save = now
+
+                # Despertar para el guardado pendiente o para revisar stop_event
+                timeout = max(save_interval - (now - last_save), 0.0) if unsaved else 1.0
+                events = trigger.wait(timeout=timeout)
+
+            except KeyboardInterrupt:
+                logger.info("Monitor de arbitraje detenido por el usuario")
+                break
+            except Exception as e:
+                logger.error(f"Error en monitor de arbitraje: {e}")
+                events = trigger.wait(timeout=1.0)
+    finally:
+        trigger.close()
+        if watcher:
+            watcher.stop()
+        engine.stop()
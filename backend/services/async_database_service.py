@@ -0,0 +1,69 @@
+# backend/services/async_database_service.py
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from loguru import logger
+
+from backend.core.config_manager import get_config_manager
+from backend.services.database_service import get_database_service
+
+
+class AsyncDatabaseService:
+    """
+    Acceso a la base de datos para código async (endpoints FastAPI, WebSocket)
+
+    Las sesiones de SQLAlchemy son bloqueantes: ejecutarlas dentro de un
+    handler async detiene el event loop (y con él los WebSocket) mientras
+    dura la consulta. Aquí cada llamada se ejecuta en un pool de hilos
+    dedicado a la base de datos y el handler solo espera el resultado.
+
+    Expone los mismos métodos que DatabaseService como corutinas:
+        opportunities = await async_db.get_profitable_opportunities(limit=100)
+    """
+
+    def __init__(self, db_service=None, max_workers: int = 4):
+        self.db_service = db_service or get_database_service()
+        self.logger = logger.bind(service="AsyncDatabaseService")
+        # Acotado al pool de conexiones: más hilos solo esperarían una conexión libre
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, max_workers), thread_name_prefix="DatabaseReader"
+        )
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """Ejecuta func(*args, **kwargs) en el pool de la base de datos"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(func, *args, **kwargs)
+        )
+
+    def __getattr__(self, name: str):
+        attribute = getattr(self.db_service, name)
+        if not callable(attribute):
+            return attribute
+
+        @functools.wraps(attribute)
+        async def call(*args, **kwargs):
+            return await self.run(attribute, *args, **kwargs)
+
+        return call
+
+    def shutdown(self):
+        """Detiene el pool de hilos"""
+        self._executor.shutdown(wait=False)
+
+
+# Singleton del acceso asíncrono
+_async_db_service = None
+
+def get_async_database_service() -> AsyncDatabaseService:
+    """Obtiene la instancia singleton del AsyncDatabaseService"""
+    global _async_db_service
+    if _async_db_service is None:
+        settings = get_config_manager().settings.get('database', {})
+        _async_db_service = AsyncDatabaseService(
+            max_workers=settings.get('read_workers', 4)
+        )
+    return _async_db_service
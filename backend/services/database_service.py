@@ -1,114 +1,270 @@
 # backend/services/database_service.py
 
-from typing import List, Dict, Optional, Tuple
+from typing import Any, Callable, List, Dict, Optional, Tuple
 from datetime import datetime, timedelta
+from collections import OrderedDict
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_
+from sqlalchemy import (
+    func, and_, or_, case, select, update, delete, exists, literal, true, text,
+    Table, MetaData, Column, Integer, BigInteger, Boolean, String
+)
 from loguru import logger
 import json
+import threading
+import time
 
 from backend.database.models import (
-    Item, PriceHistory, ProfitableOpportunity, 
-    ScraperStatus, get_database_manager
+    Item, PriceRollup, ProfitableOpportunity, 
+    ScraperStatus, DataVersion, get_database_manager
+)
+from backend.core.config_manager import get_config_manager
+from backend.core.price_record import PriceRecord, record_from_dict, from_minor
+from backend.core.snapshot import PriceSnapshot
+from backend.core.item_registry import get_item_registry
+
+# Filas por sentencia en las operaciones en bloque
+BULK_CHUNK_SIZE = 500
+
+# Resoluciones de los rollups: (segundos, ventana máxima en días para la que se usa)
+ROLLUP_RESOLUTIONS = (
+    (300, 2),       # 5 minutos: hasta 2 días (~576 puntos)
+    (3600, 31),     # 1 hora: hasta un mes (~744 puntos)
+    (86400, None),  # 1 día: ventanas mayores
+)
+
+_EPOCH = datetime(1970, 1, 1)
+
+# Tabla temporal de la ingesta con COPY (PostgreSQL): una por conexión, se vacía al confirmar
+_ITEMS_STAGING_DDL = (
+    "CREATE TEMP TABLE IF NOT EXISTS items_staging ("
+    "item_id integer PRIMARY KEY, price_minor bigint NOT NULL, url text, "
+    "changed boolean NOT NULL DEFAULT false"
+    ") ON COMMIT DELETE ROWS"
+)
+_ITEMS_STAGING = Table(
+    'items_staging', MetaData(),
+    Column('item_id', Integer, primary_key=True),
+    Column('price_minor', BigInteger, nullable=False),
+    Column('url', String),
+    Column('changed', Boolean, nullable=False),
 )
 
 
+def rollup_bucket(timestamp: datetime, resolution: int) -> datetime:
+    """Inicio del intervalo de `resolution` segundos que contiene timestamp"""
+    seconds = int((timestamp - _EPOCH).total_seconds())
+    return _EPOCH + timedelta(seconds=seconds - seconds % resolution)
+
+
+def rollup_resolution_for(days: int) -> int:
+    """Resolución de rollup para una ventana de `days` días"""
+    for resolution, max_days in ROLLUP_RESOLUTIONS:
+        if max_days is None or days <= max_days:
+            return resolution
+    return ROLLUP_RESOLUTIONS[-1][0]
+
+
+def latest_prices(snapshot: PriceSnapshot) -> Dict[int, Tuple[int, int]]:
+    """
+    Un precio válido por item del snapshot (el más bajo si aparece varias veces)
+    
+    Returns:
+        {item_id: (price_minor, posición en el snapshot)}
+    """
+    latest = {}
+    rows = zip(snapshot.item_ids.tolist(), snapshot.prices.tolist())
+    for index, (item_id, price_minor) in enumerate(rows):
+        if item_id < 0 or price_minor <= 0:
+            continue
+        current = latest.get(item_id)
+        if current is None or price_minor < current[0]:
+            latest[item_id] = (price_minor, index)
+    return latest
+
+
+def _copy_result(result):
+    """Copia superficial de un resultado cacheado (listas de dicts o dict)"""
+    if isinstance(result, list):
+        return [dict(row) if isinstance(row, dict) else row for row in result]
+    if isinstance(result, dict):
+        return dict(result)
+    return result
+
+
+class ReadModelCache:
+    """
+    Caché de resultados de las consultas de lectura del dashboard
+    
+    Cada resultado se guarda con las versiones de los conjuntos de datos de
+    los que depende (items, opportunities, scrapers). Las escrituras
+    incrementan esas versiones en la tabla data_versions dentro de su
+    transacción, así que también se ven los cambios de otros procesos (los
+    scrapers escriben desde su propio proceso).
+    
+    Las versiones se leen como mucho una vez cada check_interval segundos;
+    las escrituras de este proceso fuerzan la lectura en la siguiente consulta.
+    """
+    
+    def __init__(self, db_manager, enabled: bool = True, check_interval: float = 1.0,
+                 max_entries: int = 256):
+        self.db_manager = db_manager
+        self.enabled = enabled
+        self.check_interval = check_interval
+        self.max_entries = max(1, max_entries)
+        
+        self._entries: "OrderedDict[Tuple, Tuple[Tuple[int, ...], Any]]" = OrderedDict()
+        self._versions: Dict[str, int] = {}
+        self._checked_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0}
+    
+    def versions(self) -> Dict[str, int]:
+        """Versiones actuales de los conjuntos de datos"""
+        with self._lock:
+            if self._checked_at is not None and time.monotonic() - self._checked_at < self.check_interval:
+                return self._versions
+        
+        with self.db_manager.engine.connect() as conn:
+            versions = dict(conn.execute(select(DataVersion.name, DataVersion.version)).all())
+        
+        with self._lock:
+            self._versions = versions
+            self._checked_at = time.monotonic()
+        return versions
+    
+    def get(self, key: Tuple, datasets: Tuple[str, ...], loader: Callable[[], Any]) -> Any:
+        """
+        Resultado de loader() cacheado por key mientras no cambien los datasets
+        
+        Las versiones se leen antes de ejecutar la consulta: si una escritura
+        ocurre en medio, el resultado queda con la versión anterior y se
+        vuelve a consultar en la siguiente llamada.
+        """
+        if not self.enabled:
+            return loader()
+        
+        versions = self.versions()
+        stamp = tuple(versions.get(name, 0) for name in datasets)
+        
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == stamp:
+                self._entries.move_to_end(key)
+                self.stats['hits'] += 1
+                return _copy_result(entry[1])
+            self.stats['misses'] += 1
+        
+        result = loader()
+        
+        with self._lock:
+            self._entries[key] = (stamp, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return _copy_result(result)
+    
+    def bump(self, session: Session, *datasets: str):
+        """Incrementa las versiones dentro de la transacción de escritura (antes del commit)"""
+        table = DataVersion.__table__
+        session.execute(
+            self.db_manager.upsert(
+                table, index_elements=['name'],
+                set_=lambda stmt: {'version': table.c.version + 1}
+            ),
+            [{'name': name, 'version': 1} for name in datasets]
+        )
+    
+    def expire(self):
+        """Fuerza a releer las versiones en la próxima consulta (tras un commit)"""
+        with self._lock:
+            self._checked_at = None
+
+
 class DatabaseService:
     """Servicio para operaciones de base de datos"""
     
     def __init__(self):
         self.db_manager = get_database_manager()
         self.logger = logger.bind(service="DatabaseService")
+        settings = get_config_manager().settings.get('database', {})
+        self.query_cache = ReadModelCache(
+            self.db_manager,
+            enabled=settings.get('query_cache', True),
+            check_interval=settings.get('query_cache_check_interval', 1.0)
+        )
+        self.copy_ingest = (self.db_manager.supports_copy
+                            and settings.get('postgresql', {}).get('copy_ingest', True))
     
-    def save_scraper_data(self, platform: str, items: List[Dict]):
+    def save_scraper_data(self, platform: str, items):
         """
         Guarda los datos de un scraper en la base de datos
         
         Args:
             platform: Nombre de la plataforma
-            items: Lista de items con estructura {'Item': str, 'Price': float}
+            items: PriceSnapshot o lista de PriceRecord
+                   (también acepta dicts {'Item': str, 'Price': float})
+        
+        Raises:
+            Exception: si la transacción falla (el error queda registrado en
+                scraper_status y la excepción se propaga al llamador)
         """
-        session = self.db_manager.get_session()
+        if isinstance(items, PriceSnapshot):
+            snapshot = items
+        else:
+            records = [
+                record if isinstance(record, PriceRecord) else record_from_dict(record, platform)
+                for record in items
+            ]
+            snapshot = PriceSnapshot.from_records(platform, records)
+        
+        platform_id = self.db_manager.platform_id(platform)
+        self.db_manager.run_write(
+            lambda session: self._save_scraper_data(session, platform, platform_id, snapshot)
+        )
+    
+    def save_scraper_batch(self, batch: List[Tuple[str, PriceSnapshot]]):
+        """
+        Guarda los snapshots de varias plataformas en una sola transacción
         
+        Un único commit para todo el lote. Es todo o nada: si falla no se
+        guarda ninguna plataforma y la excepción se propaga (el llamador
+        puede reintentar cada snapshot con save_scraper_data para registrar
+        el error en la plataforma que lo causó).
+        
+        Args:
+            batch: Lista de (plataforma, PriceSnapshot)
+        """
+        batch = [(platform, self.db_manager.platform_id(platform), snapshot)
+                 for platform, snapshot in batch]
+        self.db_manager.run_write(lambda session: self._save_scraper_batch(session, batch))
+    
+    def _save_scraper_batch(self, session: Session, batch: List[Tuple[str, int, PriceSnapshot]]):
+        """Transacción de escritura de save_scraper_batch"""
         try:
-            # Actualizar estado del scraper
-            scraper_status = session.query(ScraperStatus).filter_by(
-                scraper_name=platform
-            ).first()
-            
-            if not scraper_status:
-                scraper_status = ScraperStatus(scraper_name=platform)
-                session.add(scraper_status)
-            
-            scraper_status.status = 'running'
-            scraper_status.last_run = datetime.utcnow()
-            
-            items_saved = 0
+            saved = [
+                (platform, self._apply_scraper_data(session, platform, platform_id, snapshot))
+                for platform, platform_id, snapshot in batch
+            ]
+            self.query_cache.bump(session, 'items', 'scrapers')
+            session.commit()
+            self.query_cache.expire()
             
-            for item_data in items:
-                item_name = item_data.get('Item', '')
-                price = float(item_data.get('Price', 0))
-                
-                if not item_name or price == 0:
-                    continue
-                
-                # Buscar o crear el item
-                item = session.query(Item).filter_by(
-                    name=item_name,
-                    platform=platform
-                ).first()
-                
-                if item:
-                    # Actualizar precio existente
-                    if item.price != price:
-                        # Guardar en histórico
-                        history = PriceHistory(
-                            item_name=item_name,
-                            platform=platform,
-                            price=price
-                        )
-                        session.add(history)
-                    
-                    item.price = price
-                    item.last_updated = datetime.utcnow()
-                    item.is_available = True
-                else:
-                    # Crear nuevo item
-                    item = Item(
-                        name=item_name,
-                        platform=platform,
-                        price=price,
-                        url=item_data.get('url', '')
-                    )
-                    session.add(item)
-                    
-                    # También agregar al histórico
-                    history = PriceHistory(
-                        item_name=item_name,
-                        platform=platform,
-                        price=price
-                    )
-                    session.add(history)
-                
-                items_saved += 1
-            
-            # Marcar items no encontrados como no disponibles
-            session.query(Item).filter(
-                Item.platform == platform,
-                Item.last_updated < datetime.utcnow() - timedelta(minutes=30)
-            ).update({'is_available': False})
-            
-            # Actualizar estado del scraper
-            scraper_status.status = 'idle'
-            scraper_status.last_success = datetime.utcnow()
-            scraper_status.items_found = items_saved
-            if scraper_status.run_count is None:
-                scraper_status.run_count = 1
-            else:
-                scraper_status.run_count += 1
-            scraper_status.error_message = None
+            self.logger.info(
+                "Guardados en un lote: " + ", ".join(f"{platform} ({count})" for platform, count in saved)
+            )
+        except Exception:
+            session.rollback()
+            raise
+    
+    def _save_scraper_data(self, session: Session, platform: str, platform_id: int,
+                           snapshot: PriceSnapshot):
+        """Transacción de escritura de save_scraper_data"""
+        try:
+            items_saved = self._apply_scraper_data(session, platform, platform_id, snapshot)
             
+            self.query_cache.bump(session, 'items', 'scrapers')
             session.commit()
+            self.query_cache.expire()
             
             self.logger.info(f"Guardados {items_saved} items de {platform}")
             
@@ -117,43 +273,423 @@ class DatabaseService:
             self.logger.error(f"Error guardando datos de {platform}: {e}")
             
             # Actualizar estado de error
-            if scraper_status:
-                scraper_status.status = 'error'
-                scraper_status.error_message = str(e)
-                session.commit()
+            try:
+                scraper_status = session.query(ScraperStatus).filter_by(
+                    scraper_name=platform
+                ).first()
+                if scraper_status:
+                    scraper_status.status = 'error'
+                    scraper_status.error_message = str(e)
+                    self.query_cache.bump(session, 'scrapers')
+                    session.commit()
+                    self.query_cache.expire()
+            except Exception as status_error:
+                session.rollback()
+                self.logger.error(f"Error registrando el estado de {platform}: {status_error}")
+            raise
+    
+    def _apply_scraper_data(self, session: Session, platform: str, platform_id: int,
+                            snapshot: PriceSnapshot) -> int:
+        """
+        Aplica el snapshot de una plataforma en la transacción actual (sin commit)
+        
+        Returns:
+            Número de items válidos del snapshot
+        """
+        # Actualizar estado del scraper
+        scraper_status = session.query(ScraperStatus).filter_by(
+            scraper_name=platform
+        ).first()
+        
+        if not scraper_status:
+            scraper_status = ScraperStatus(scraper_name=platform)
+            session.add(scraper_status)
+        
+        scraper_status.status = 'running'
+        scraper_status.last_run = datetime.utcnow()
+        
+        items_saved = self._bulk_upsert_items(session, platform, platform_id, snapshot)
+        
+        # Marcar items no encontrados como no disponibles
+        session.query(Item).filter(
+            Item.platform_id == platform_id,
+            Item.last_updated < datetime.utcnow() - timedelta(minutes=30)
+        ).update({'is_available': False})
+        
+        # Actualizar estado del scraper
+        scraper_status.status = 'idle'
+        scraper_status.last_success = datetime.utcnow()
+        scraper_status.items_found = items_saved
+        if scraper_status.run_count is None:
+            scraper_status.run_count = 1
+        else:
+            scraper_status.run_count += 1
+        scraper_status.error_message = None
+        return items_saved
+    
+    def _bulk_upsert_items(self, session: Session, platform: str, platform_id: int,
+                           snapshot: PriceSnapshot) -> int:
+        """
+        Aplica un snapshot a la tabla items con operaciones en bloque
+        
+        Carga los precios actuales de la plataforma en una sola consulta,
+        inserta/actualiza solo los items nuevos o con precio distinto
+        (INSERT ... ON CONFLICT DO UPDATE por lotes), refresca last_updated
+        del resto y agrega al histórico solo los precios que cambiaron.
+        
+        Returns:
+            Número de items válidos del snapshot
+        """
+        now = datetime.utcnow()
+        latest = latest_prices(snapshot)
+        
+        if self.copy_ingest:
+            return self._copy_ingest_items(session, platform, platform_id, snapshot, latest, now)
+        
+        # Precios actuales en la base de datos (una sola consulta)
+        existing = dict(session.execute(
+            select(Item.item_id, Item.price_minor).where(Item.platform_id == platform_id)
+        ).all())
+        
+        changed_rows = []
+        history_rows = []
+        unchanged_ids = []
+        
+        for item_id, (price_minor, index) in latest.items():
+            if existing.get(item_id) == price_minor:
+                unchanged_ids.append(item_id)
+                continue
+            
+            changed_rows.append({
+                'item_id': item_id,
+                'platform_id': platform_id,
+                'price_minor': price_minor,
+                'url': snapshot.url(index) or '',
+                'last_updated': now,
+                'is_available': True
+            })
+            history_rows.append({
+                'item_id': item_id,
+                'platform_id': platform_id,
+                'ts': now,
+                'price_minor': price_minor
+            })
+        
+        upsert = self.db_manager.upsert(
+            Item.__table__,
+            index_elements=['item_id', 'platform_id'],
+            update_columns=['price_minor', 'last_updated', 'is_available']
+        )
+        for start in range(0, len(changed_rows), BULK_CHUNK_SIZE):
+            session.execute(upsert, changed_rows[start:start + BULK_CHUNK_SIZE])
+        
+        self.db_manager.history.insert(session, history_rows, BULK_CHUNK_SIZE)
+        
+        self._update_rollups(session, history_rows)
+        
+        # Items sin cambios: solo refrescar disponibilidad
+        for start in range(0, len(unchanged_ids), BULK_CHUNK_SIZE):
+            session.execute(
+                update(Item.__table__)
+                .where(Item.platform_id == platform_id,
+                       Item.item_id.in_(unchanged_ids[start:start + BULK_CHUNK_SIZE]))
+                .values(last_updated=now, is_available=True)
+            )
+        
+        self.logger.debug(
+            f"{platform}: {len(changed_rows)} items nuevos/actualizados, "
+            f"{len(unchanged_ids)} sin cambios"
+        )
+        return len(latest)
+    
+    def _copy_ingest_items(self, session: Session, platform: str, platform_id: int,
+                           snapshot: PriceSnapshot, latest: Dict, now: datetime) -> int:
+        """
+        Aplica un snapshot con COPY y un merge en SQL (PostgreSQL)
+        
+        Los precios se cargan con COPY en una tabla temporal y desde ahí,
+        con sentencias INSERT ... SELECT, se actualizan el histórico, los
+        rollups y la tabla items. No hay ida y vuelta por lotes de filas.
+        
+        Returns:
+            Número de items válidos del snapshot
+        """
+        staging = _ITEMS_STAGING
+        session.execute(text(_ITEMS_STAGING_DDL))
+        # En un lote de varias plataformas la tabla aún tiene las filas de la anterior
+        session.execute(delete(staging))
+        self.db_manager.copy_rows(
+            session, staging.name, ('item_id', 'price_minor', 'url'),
+            ((item_id, price_minor, snapshot.url(index) or '')
+             for item_id, (price_minor, index) in latest.items())
+        )
+        
+        # Marcar los items nuevos o con precio distinto
+        items = Item.__table__
+        changed = session.execute(
+            update(staging).where(~exists().where(
+                items.c.item_id == staging.c.item_id,
+                items.c.platform_id == platform_id,
+                items.c.price_minor == staging.c.price_minor
+            )).values(changed=True)
+        ).rowcount
+        
+        # Histórico: solo los precios que cambiaron
+        partition = self.db_manager.history.ensure_partition(session.connection(), now.date())
+        session.execute(partition.insert().from_select(
+            ['item_id', 'platform_id', 'ts', 'price_minor'],
+            select(staging.c.item_id, literal(platform_id), literal(now), staging.c.price_minor)
+            .where(staging.c.changed)
+        ))
+        
+        price = staging.c.price_minor
+        for resolution, _ in ROLLUP_RESOLUTIONS:
+            bucket = rollup_bucket(now, resolution)
+            columns = [
+                staging.c.item_id, literal(platform_id), literal(bucket),
+                price, price, price, price, literal(1)
+            ]
+            if resolution == self.db_manager.rollups_5m.resolution:
+                table = self.db_manager.rollups_5m.ensure_partition(session.connection(), bucket.date())
+            else:
+                table = PriceRollup.__table__
+                columns.insert(0, literal(resolution))
+            session.execute(self.rollup_upsert(table, from_select=(
+                [column.name for column in table.columns],
+                select(*columns).where(staging.c.changed)
+            )))
+        
+        # Items: precio nuevo a los que cambiaron y last_updated a todos
+        session.execute(self.db_manager.upsert(
+            items,
+            index_elements=['item_id', 'platform_id'],
+            update_columns=['price_minor', 'last_updated', 'is_available'],
+            from_select=(
+                ['item_id', 'platform_id', 'price_minor', 'url', 'last_updated', 'is_available'],
+                select(staging.c.item_id, literal(platform_id), staging.c.price_minor,
+                       staging.c.url, literal(now), true())
+            )
+        ))
+        
+        self.logger.debug(
+            f"{platform}: {changed} items nuevos/actualizados, "
+            f"{len(latest) - changed} sin cambios (COPY)"
+        )
+        return len(latest)
+    
+    def rollup_upsert(self, table=None, from_select=None):
+        """
+        Upsert de rollups OHLC: combina high/low y acumula count con el bucket existente
+        
+        Args:
+            table: price_rollups (por defecto) o una partición de 5 minutos
+            from_select: (columnas, select) para INSERT ... SELECT
+        """
+        if table is None:
+            table = PriceRollup.__table__
+        return self.db_manager.upsert(
+            table,
+            index_elements=[column.name for column in table.primary_key.columns],
+            update_columns=['close'],
+            set_=lambda stmt: {
+                'high': self.db_manager.greatest(table.c.high, stmt.excluded.high),
+                'low': self.db_manager.least(table.c.low, stmt.excluded.low),
+                'count': table.c.count + stmt.excluded.count
+            },
+            from_select=from_select
+        )
+    
+    def write_rollups(self, session: Session, rows: List[Dict]):
+        """
+        Combina filas de rollup con las existentes (upsert por lotes)
+        
+        Las filas de 5 minutos van a la partición del día de su intervalo;
+        las horarias y diarias a price_rollups.
+        """
+        partitions = self.db_manager.rollups_5m
+        by_table: Dict[Any, List[Dict]] = {}
+        minute_rows: Dict[Any, List[Dict]] = {}
+        for row in rows:
+            if row['resolution'] == partitions.resolution:
+                minute_row = dict(row)
+                del minute_row['resolution']
+                minute_rows.setdefault(row['bucket'].date(), []).append(minute_row)
+            else:
+                by_table.setdefault(PriceRollup.__table__, []).append(row)
+        
+        connection = session.connection()
+        for day, day_rows in minute_rows.items():
+            by_table[partitions.ensure_partition(connection, day)] = day_rows
+        
+        for table, table_rows in by_table.items():
+            upsert = self.rollup_upsert(table)
+            for start in range(0, len(table_rows), BULK_CHUNK_SIZE):
+                session.execute(upsert, table_rows[start:start + BULK_CHUNK_SIZE])
+    
+    def _update_rollups(self, session: Session, history_rows: List[Dict]):
+        """Actualiza de forma incremental los rollups OHLC con los nuevos precios"""
+        if not history_rows:
+            return
+        
+        rows = []
+        for resolution, _ in ROLLUP_RESOLUTIONS:
+            for row in history_rows:
+                price = row['price_minor']
+                rows.append({
+                    'resolution': resolution,
+                    'item_id': row['item_id'],
+                    'platform_id': row['platform_id'],
+                    'bucket': rollup_bucket(row['ts'], resolution),
+                    'open': price,
+                    'high': price,
+                    'low': price,
+                    'close': price,
+                    'count': 1
+                })
+        self.write_rollups(session, rows)
+    
+    def rebuild_rollups(self) -> int:
+        """
+        Recalcula todos los rollups desde el histórico crudo (compactador)
+        
+        Útil para bases de datos con histórico anterior a los rollups.
+        
+        Returns:
+            Número de rollups generados
+        """
+        return self.db_manager.run_write(self._rebuild_rollups)
+    
+    def _rebuild_rollups(self, session: Session) -> int:
+        """Transacción de escritura de rebuild_rollups"""
+        try:
+            session.execute(delete(PriceRollup.__table__))
+            self.db_manager.rollups_5m.drop_before(session, datetime.max)
+            
+            rollups = {}
+            history = self.db_manager.history.rows(session.connection())
+            
+            for item_id, platform_id, timestamp, price in history:
+                for resolution, _ in ROLLUP_RESOLUTIONS:
+                    key = (resolution, item_id, platform_id, rollup_bucket(timestamp, resolution))
+                    rollup = rollups.get(key)
+                    if rollup is None:
+                        rollups[key] = [price, price, price, price, 1]
+                    else:
+                        rollup[1] = max(rollup[1], price)
+                        rollup[2] = min(rollup[2], price)
+                        rollup[3] = price
+                        rollup[4] += 1
+            
+            rows = [
+                {
+                    'resolution': resolution, 'item_id': item_id, 'platform_id': platform_id,
+                    'bucket': bucket, 'open': o, 'high': h, 'low': l, 'close': c, 'count': n
+                }
+                for (resolution, item_id, platform_id, bucket), (o, h, l, c, n) in rollups.items()
+            ]
+            self.write_rollups(session, rows)
             
-        finally:
-            session.close()
+            session.commit()
+            self.logger.info(f"Rollups reconstruidos: {len(rows)}")
+            return len(rows)
+            
+        except Exception as e:
+            session.rollback()
+            self.logger.error(f"Error reconstruyendo rollups: {e}")
+            return 0
+    
+    def _get_rollups(self, session: Session, item_id: int, platform: Optional[str],
+                     since: datetime, resolution: int) -> List[PriceRollup]:
+        """Rollups de un item desde `since` ordenados por intervalo"""
+        platform_id = None
+        if platform:
+            platform_id = self.db_manager.platform_id(platform, create=False)
+            if platform_id is None:
+                return []
+        
+        since = rollup_bucket(since, resolution)
+        if resolution == self.db_manager.rollups_5m.resolution:
+            # Solo se leen las particiones de 5 minutos de la ventana
+            rows = self.db_manager.rollups_5m.rows(
+                session.connection(), since=since, item_id=item_id, platform_id=platform_id
+            )
+            return [PriceRollup(resolution=resolution, **row._mapping) for row in rows]
+        
+        query = session.query(PriceRollup).filter(
+            PriceRollup.resolution == resolution,
+            PriceRollup.item_id == item_id,
+            PriceRollup.bucket >= since
+        )
+        if platform_id is not None:
+            query = query.filter(PriceRollup.platform_id == platform_id)
+        return query.order_by(PriceRollup.bucket).all()
     
     def save_profitable_opportunities(self, opportunities: List[Dict]):
         """Guarda las oportunidades rentables en la base de datos"""
-        session = self.db_manager.get_session()
-        
+        self.db_manager.run_write(
+            lambda session: self._save_profitable_opportunities(session, opportunities)
+        )
+    
+    def _save_profitable_opportunities(self, session: Session, opportunities: List[Dict]):
+        """Transacción de escritura de save_profitable_opportunities"""
         try:
-            # Marcar todas las oportunidades anteriores como inactivas
-            session.query(ProfitableOpportunity).update({'is_active': False})
+            now = datetime.utcnow()
             
+            # Una fila por (item, plataforma de compra): si se repite, la más rentable
+            rows = {}
             for opp in opportunities:
-                opportunity = ProfitableOpportunity(
-                    item_name=opp['name'],
-                    buy_platform=opp['platform'],
-                    buy_price=opp['buy_price'],
-                    buy_url=opp['link'],
-                    steam_price=opp['steam_price'],
-                    net_steam_price=opp['net_steam_price'],
-                    profitability=opp['rentabilidad'],
-                    profit_amount=opp['net_steam_price'] - opp['buy_price']
-                )
-                session.add(opportunity)
+                key = (opp['name'], opp['platform'])
+                if key in rows and rows[key]['profitability'] >= opp['rentabilidad']:
+                    continue
+                rows[key] = {
+                    'item_name': opp['name'],
+                    'buy_platform': opp['platform'],
+                    'buy_price': opp['buy_price'],
+                    'buy_url': opp['link'],
+                    'steam_price': opp['steam_price'],
+                    'net_steam_price': opp['net_steam_price'],
+                    'profitability': opp['rentabilidad'],
+                    'profit_amount': opp['net_steam_price'] - opp['buy_price'],
+                    'first_seen': now,
+                    'last_seen': now,
+                    'is_active': True
+                }
             
+            table = ProfitableOpportunity.__table__
+            upsert = self.db_manager.upsert(
+                table,
+                index_elements=['item_name', 'buy_platform'],
+                update_columns=['buy_price', 'buy_url', 'steam_price', 'net_steam_price',
+                                'profitability', 'profit_amount', 'last_seen', 'is_active'],
+                # Una oportunidad que reaparece empieza un periodo activo nuevo
+                set_=lambda stmt: {
+                    'first_seen': case(
+                        (table.c.is_active == True, table.c.first_seen),
+                        else_=stmt.excluded.first_seen
+                    )
+                }
+            )
+            rows = list(rows.values())
+            for start in range(0, len(rows), BULK_CHUNK_SIZE):
+                session.execute(upsert, rows[start:start + BULK_CHUNK_SIZE])
+            
+            # Desactivar solo las que dejaron de aparecer en este ciclo
+            expired = session.execute(
+                update(table)
+                .where(table.c.is_active == True, table.c.last_seen < now)
+                .values(is_active=False)
+            ).rowcount
+            
+            self.query_cache.bump(session, 'opportunities')
             session.commit()
-            self.logger.info(f"Guardadas {len(opportunities)} oportunidades rentables")
+            self.query_cache.expire()
+            self.logger.info(
+                f"Guardadas {len(rows)} oportunidades rentables ({expired} ya no disponibles)"
+            )
             
         except Exception as e:
             session.rollback()
             self.logger.error(f"Error guardando oportunidades: {e}")
-        finally:
-            session.close()
     
     def get_profitable_opportunities(self, min_profit: float = 0.05, limit: int = 100):
         """
@@ -163,6 +699,12 @@ class DatabaseService:
             min_profit: Rentabilidad mínima (0.05 = 5%)
             limit: Número máximo de resultados
         """
+        return self.query_cache.get(
+            ('profitable_opportunities', min_profit, limit), ('opportunities',),
+            lambda: self._query_profitable_opportunities(min_profit, limit)
+        )
+    
+    def _query_profitable_opportunities(self, min_profit: float, limit: int) -> List[Dict]:
         session = self.db_manager.get_session()
         
         try:
@@ -182,7 +724,8 @@ class DatabaseService:
                     'steam_price': opp.steam_price,
                     'profit_percentage': opp.profitability * 100,
                     'profit_amount': opp.profit_amount,
-                    'found_at': opp.found_at
+                    'found_at': opp.first_seen,
+                    'last_seen': opp.last_seen
                 }
                 for opp in opportunities
             ]
@@ -190,28 +733,88 @@ class DatabaseService:
         finally:
             session.close()
     
-    def get_price_history(self, item_name: str, platform: Optional[str] = None, days: int = 7):
-        """Obtiene el histórico de precios de un item"""
+    def get_system_stats(self) -> Dict:
+        """Contadores generales: items, oportunidades activas y mejor rentabilidad"""
+        return self.query_cache.get(
+            ('system_stats',), ('items', 'opportunities'), self._query_system_stats
+        )
+    
+    def _query_system_stats(self) -> Dict:
         session = self.db_manager.get_session()
         
         try:
-            since = datetime.utcnow() - timedelta(days=days)
-            
-            query = session.query(PriceHistory).filter(
-                PriceHistory.item_name == item_name,
-                PriceHistory.timestamp >= since
+            active = session.query(ProfitableOpportunity).filter(
+                ProfitableOpportunity.is_active == True
             )
+            best = active.with_entities(func.max(ProfitableOpportunity.profitability)).scalar()
             
-            if platform:
-                query = query.filter(PriceHistory.platform == platform)
+            return {
+                'total_items': session.query(Item).count(),
+                'active_opportunities': active.count(),
+                'best_profit_percentage': best * 100 if best else 0
+            }
+            
+        finally:
+            session.close()
+    
+    def find_item_id(self, item_name: str) -> Optional[int]:
+        """Id del catálogo de un item (None si no existe; puede consultar la DB)"""
+        return get_item_registry().find_id(item_name)
+    
+    def get_price_history(self, item_name: str, platform: Optional[str] = None, days: int = 7,
+                          resolution: Optional[str] = 'auto'):
+        """
+        Obtiene el histórico de precios de un item
+        
+        Args:
+            item_name: Nombre del item
+            platform: Filtrar por plataforma (None = todas)
+            days: Ventana en días
+            resolution: 'auto' usa el rollup adecuado para la ventana
+                        (5 min, 1 hora o 1 día); 'raw' lee el histórico crudo
+        """
+        item_id = get_item_registry().find_id(item_name)
+        if item_id is None:
+            return []
+        
+        session = self.db_manager.get_session()
+        
+        try:
+            since = datetime.utcnow() - timedelta(days=days)
             
-            history = query.order_by(PriceHistory.timestamp).all()
+            if resolution != 'raw':
+                rollups = self._get_rollups(session, item_id, platform, since,
+                                            rollup_resolution_for(days))
+                if rollups:
+                    return [
+                        {
+                            'platform': self.db_manager.platform_name(r.platform_id),
+                            'price': from_minor(r.close),
+                            'open': from_minor(r.open),
+                            'high': from_minor(r.high),
+                            'low': from_minor(r.low),
+                            'count': r.count,
+                            'timestamp': r.bucket.isoformat()
+                        }
+                        for r in rollups
+                    ]
+            
+            # Sin rollups (histórico anterior o resolución 'raw'): leer filas crudas
+            # solo de las particiones de la ventana
+            platform_id = None
+            if platform:
+                platform_id = self.db_manager.platform_id(platform, create=False)
+                if platform_id is None:
+                    return []
+            history = self.db_manager.history.rows(
+                session.connection(), since=since, item_id=item_id, platform_id=platform_id
+            )
             
             return [
                 {
-                    'platform': h.platform,
-                    'price': h.price,
-                    'timestamp': h.timestamp.isoformat()
+                    'platform': self.db_manager.platform_name(h.platform_id),
+                    'price': from_minor(h.price_minor),
+                    'timestamp': h.ts.isoformat()
                 }
                 for h in history
             ]
@@ -220,31 +823,41 @@ class DatabaseService:
             session.close()
     
     def get_price_trends(self, item_name: str, platform: str, days: int = 7):
-        """Calcula las tendencias de precio de un item"""
+        """Calcula las tendencias de precio de un item (desde los rollups si existen)"""
+        item_id = get_item_registry().find_id(item_name)
+        if item_id is None:
+            return None
+        
         session = self.db_manager.get_session()
         
         try:
             since = datetime.utcnow() - timedelta(days=days)
             
-            # Obtener precios históricos
-            prices = session.query(
-                PriceHistory.price,
-                PriceHistory.timestamp
-            ).filter(
-                PriceHistory.item_name == item_name,
-                PriceHistory.platform == platform,
-                PriceHistory.timestamp >= since
-            ).order_by(PriceHistory.timestamp).all()
-            
-            if len(prices) < 2:
+            rollups = self._get_rollups(session, item_id, platform, since,
+                                        rollup_resolution_for(days))
+            # Con menos de dos intervalos no hay tendencia: usar las filas crudas
+            if len(rollups) >= 2:
+                price_values = [from_minor(r.close) for r in rollups]
+                min_price = from_minor(min(r.low for r in rollups))
+                max_price = from_minor(max(r.high for r in rollups))
+                price_count = sum(r.count for r in rollups)
+            else:
+                # Obtener precios históricos de las particiones de la ventana
+                platform_id = self.db_manager.platform_id(platform, create=False)
+                prices = self.db_manager.history.rows(
+                    session.connection(), since=since, item_id=item_id, platform_id=platform_id
+                ) if platform_id is not None else ()
+                
+                price_values = [from_minor(p.price_minor) for p in prices]
+                min_price = min(price_values, default=0)
+                max_price = max(price_values, default=0)
+                price_count = len(price_values)
+            
+            if len(price_values) < 2:
                 return None
             
             # Calcular estadísticas
-            price_values = [p.price for p in prices]
-            
             current_price = price_values[-1]
-            min_price = min(price_values)
-            max_price = max(price_values)
             avg_price = sum(price_values) / len(price_values)
             
             # Calcular tendencia (positiva/negativa)
@@ -261,7 +874,7 @@ class DatabaseService:
                 'avg_price': avg_price,
                 'trend': trend,
                 'trend_percentage': trend_percentage,
-                'price_count': len(prices)
+                'price_count': price_count
             }
             
         finally:
@@ -269,6 +882,9 @@ class DatabaseService:
     
     def get_scrapers_status(self):
         """Obtiene el estado de todos los scrapers"""
+        return self.query_cache.get(('scrapers_status',), ('scrapers',), self._query_scrapers_status)
+    
+    def _query_scrapers_status(self) -> List[Dict]:
         session = self.db_manager.get_session()
         
         try:
@@ -292,34 +908,38 @@ class DatabaseService:
     
     def cleanup_old_data(self, days: int = 30):
         """Limpia datos antiguos de la base de datos"""
-        session = self.db_manager.get_session()
-        
+        self.db_manager.run_write(lambda session: self._cleanup_old_data(session, days))
+    
+    def _cleanup_old_data(self, session: Session, days: int):
+        """Transacción de escritura de cleanup_old_data"""
         try:
             cutoff_date = datetime.utcnow() - timedelta(days=days)
             
-            # Eliminar histórico antiguo
-            deleted = session.query(PriceHistory).filter(
-                PriceHistory.timestamp < cutoff_date
-            ).delete()
+            # Eliminar histórico antiguo: borrar particiones diarias completas
+            dropped = self.db_manager.history.drop_before(session, cutoff_date)
+            
+            # Los rollups de 5 minutos siguen la retención del histórico crudo
+            # (también por particiones); los horarios y diarios se conservan
+            # para gráficas largas
+            dropped_rollups = self.db_manager.rollups_5m.drop_before(session, cutoff_date)
             
             # Eliminar oportunidades antiguas inactivas
             deleted_opps = session.query(ProfitableOpportunity).filter(
-                ProfitableOpportunity.found_at < cutoff_date,
+                ProfitableOpportunity.last_seen < cutoff_date,
                 ProfitableOpportunity.is_active == False
             ).delete()
             
             session.commit()
             
             self.logger.info(
-                f"Limpieza completada: {deleted} registros de histórico, "
+                f"Limpieza completada: {dropped} particiones de histórico, "
+                f"{dropped_rollups} de rollups de 5 minutos, "
                 f"{deleted_opps} oportunidades antiguas eliminadas"
             )
             
         except Exception as e:
             session.rollback()
             self.logger.error(f"Error en limpieza: {e}")
-        finally:
-            session.close()
 
 
 # Singleton para el servicio de base de datos
@@ -0,0 +1,445 @@
+# backend/services/import_service.py
+
+import json
+import os
+import re
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+from loguru import logger
+from sqlalchemy import case, select
+from sqlalchemy.orm import Session
+
+from backend.core.item_registry import get_item_registry
+from backend.core.price_record import record_from_dict
+from backend.core.snapshot import PriceSnapshot, PRICE_DTYPE, INVALID_PRICE
+from backend.core.snapshot_store import read_binary_columns, read_binary_header
+from backend.database.models import Item, SnapshotImport
+from backend.database.partitions import HISTORY_COLUMNS
+from backend.services.database_service import (
+    BULK_CHUNK_SIZE, ROLLUP_RESOLUTIONS, get_database_service, latest_prices, rollup_bucket
+)
+
+# <plataforma>_data[_<fecha>].json|snap, p. ej. waxpeer_data_20250101_120000.snap
+_FILE_RE = re.compile(r'^(?P<platform>.+?)_data(?:[_.-](?P<stamp>[\w.-]+?))?\.(?P<ext>json|snap)$')
+_EXTENSIONS = ('.json', '.snap')
+
+# Carpetas con archivos .json que no son snapshots (manifiestos del SnapshotStore)
+_IGNORED_DIRS = ('manifests',)
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+@dataclass
+class ArchivedSnapshot:
+    """Archivo de snapshot de una plataforma pendiente de importar"""
+    path: Path
+    platform: str
+    timestamp: float
+
+    @property
+    def snapshot_at(self) -> datetime:
+        return _EPOCH + timedelta(seconds=self.timestamp)
+
+    @property
+    def key(self) -> Tuple[str, datetime]:
+        """Identificador del archivo en snapshot_imports"""
+        return str(self.path), self.snapshot_at
+
+
+@dataclass
+class _Batch:
+    """Cambios de varios archivos de una plataforma que se escriben en una transacción"""
+    files: List[Tuple[ArchivedSnapshot, int, int]] = field(default_factory=list)
+    history: List[Dict] = field(default_factory=list)
+    # (resolución, item_id, bucket) -> [open, high, low, close, count] en milésimas
+    rollups: Dict[Tuple[int, int, datetime], List] = field(default_factory=dict)
+    items: Dict[int, Tuple[int, str, datetime]] = field(default_factory=dict)
+
+
+def _stamp_timestamp(stamp: Optional[str]) -> Optional[float]:
+    """Timestamp UTC codificado en el nombre del archivo (YYYYMMDD[HHMMSS] o epoch)"""
+    if not stamp:
+        return None
+    digits = re.sub(r'\D', '', stamp)
+    for size, pattern in ((14, '%Y%m%d%H%M%S'), (12, '%Y%m%d%H%M'), (8, '%Y%m%d')):
+        if len(digits) == size:
+            try:
+                return (datetime.strptime(digits, pattern) - _EPOCH).total_seconds()
+            except ValueError:
+                return None
+    if len(digits) == 10:
+        return float(digits)
+    return None
+
+
+def parse_snapshot_file(path: str, platform: str) -> Tuple[Optional[np.ndarray], Optional[List[str]],
+                                                         np.ndarray, Optional[np.ndarray], str]:
+    """
+    Lee un archivo de snapshot sin usar el catálogo (apto para procesos auxiliares)
+
+    Los .snap v2 traen los ids de item_catalog y sus nombres no se
+    decodifican; los .snap v1 y los JSON traen solo nombres.
+
+    Returns:
+        (item_ids o None, nombres o None, precios en milésimas, url_offsets, url_data)
+    """
+    if path.endswith('.snap'):
+        columns = read_binary_columns(Path(path))
+        names = columns.names() if columns.item_ids is None else None
+        return columns.item_ids, names, columns.prices, columns.url_offsets, columns.url_data
+
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    source = sys.intern(platform)
+    records = [record_from_dict(item, source, 0.0) for item in data or []]
+    prices = np.fromiter(
+        (INVALID_PRICE if record.price_minor is None else record.price_minor for record in records),
+        dtype=PRICE_DTYPE, count=len(records)
+    )
+
+    url_offsets = None
+    url_data = ''
+    if any(record.url for record in records):
+        urls = [record.url or '' for record in records]
+        url_offsets = np.zeros(len(records) + 1, dtype=np.int64)
+        np.cumsum([len(url) for url in urls], out=url_offsets[1:])
+        url_data = ''.join(urls)
+
+    return None, [record.name for record in records], prices, url_offsets, url_data
+
+
+class SnapshotImporter:
+    """
+    Importación en bloque de snapshots archivados (backfill)
+
+    Recorre un directorio con snapshots de plataforma (.json o .snap) en
+    orden cronológico y por cada archivo guarda en el histórico solo los
+    precios distintos del último conocido de cada item, igual que la
+    ingesta en vivo (que compara con la tabla items): un item que falta en
+    un archivo y vuelve con el mismo precio no genera histórico. Los rollups OHLC se construyen en memoria y se escriben junto con
+    el histórico, sin tener que recalcularlos después.
+
+    - Los archivos se parsean en paralelo en procesos auxiliares; la
+      escritura es secuencial y conserva el orden por plataforma.
+    - Los .snap v2 traen los ids del catálogo; en el resto los ids se
+      resuelven por lotes (un lote por archivo).
+    - Cada grupo de archivos se escribe en una transacción con COPY
+      (PostgreSQL) o executemany (SQLite).
+    - Los archivos importados se registran en snapshot_imports en la misma
+      transacción: si se interrumpe, al volver a ejecutar se continúa.
+    """
+
+    def __init__(self, db_service=None, workers: Optional[int] = None, batch_files: int = 20):
+        self.db_service = db_service or get_database_service()
+        self.db_manager = self.db_service.db_manager
+        self.registry = get_item_registry()
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.batch_files = max(1, batch_files)
+        self.logger = logger.bind(service="SnapshotImporter")
+
+    # ------------------------------------------------------------------
+    # Descubrimiento de archivos
+    # ------------------------------------------------------------------
+
+    def scan(self, directory: Path, platforms: Optional[Iterable[str]] = None) -> List[ArchivedSnapshot]:
+        """
+        Archivos de snapshot de un directorio (recursivo) ordenados por plataforma y fecha
+
+        La plataforma sale del nombre (<plataforma>_data...) o, si no sigue
+        ese formato, de la carpeta que lo contiene. La fecha sale del nombre,
+        de la cabecera de los .snap o de la fecha de modificación.
+        """
+        directory = Path(directory)
+        wanted = set(platforms) if platforms else None
+        files = []
+
+        for path in directory.rglob('*'):
+            if path.suffix not in _EXTENSIONS or not path.is_file() or path.name.startswith('.'):
+                continue
+
+            if any(part in _IGNORED_DIRS for part in path.relative_to(directory).parts[:-1]):
+                continue
+
+            match = _FILE_RE.match(path.name)
+            if match:
+                platform = match.group('platform')
+            elif path.parent != directory:
+                platform = path.parent.name
+            else:
+                continue
+            if wanted is not None and platform not in wanted:
+                continue
+
+            timestamp = _stamp_timestamp(match.group('stamp')) if match else None
+            if timestamp is None and path.suffix == '.snap':
+                try:
+                    timestamp = read_binary_header(path)[1]
+                except (OSError, ValueError) as e:
+                    self.logger.warning(f"Se omite {path}: {e}")
+                    continue
+            if timestamp is None:
+                timestamp = path.stat().st_mtime
+
+            # El SnapshotStore exporta también el JSON del .snap: importar solo el binario
+            if path.suffix == '.json' and path.with_suffix('.snap').exists():
+                continue
+
+            files.append(ArchivedSnapshot(path.resolve(), platform, timestamp))
+
+        files.sort(key=lambda file: (file.platform, file.timestamp, str(file.path)))
+        return files
+
+    def _imported(self) -> Set[Tuple[str, datetime]]:
+        """Archivos ya importados: {(ruta, fecha del snapshot)}"""
+        with self.db_manager.engine.connect() as conn:
+            rows = conn.execute(select(SnapshotImport.path, SnapshotImport.snapshot_at)).all()
+        return {(path, snapshot_at) for path, snapshot_at in rows}
+
+    # ------------------------------------------------------------------
+    # Importación
+    # ------------------------------------------------------------------
+
+    def run(self, directory: Path, platforms: Optional[Iterable[str]] = None,
+            progress: Optional[Callable[[int, int, ArchivedSnapshot, int, int], None]] = None) -> Dict[str, int]:
+        """
+        Importa los snapshots pendientes de un directorio
+
+        Args:
+            directory: Directorio con los snapshots archivados
+            platforms: Limitar a estas plataformas (None = todas)
+            progress: Función (hechos, total, archivo, items, cambios) llamada por archivo
+
+        Returns:
+            Estadísticas: {'files', 'skipped', 'items', 'history'}
+        """
+        files = self.scan(directory, platforms)
+        imported = self._imported()
+        pending = [file for file in files if file.key not in imported]
+        stats = {'files': 0, 'skipped': len(files) - len(pending), 'items': 0, 'history': 0}
+
+        if not pending:
+            return stats
+
+        by_platform: Dict[str, List[ArchivedSnapshot]] = {}
+        for file in files:
+            by_platform.setdefault(file.platform, []).append(file)
+
+        # Último precio conocido de cada item por plataforma: al continuar una
+        # importación se reconstruye con los archivos ya importados
+        prices: Dict[str, Dict[int, int]] = {}
+        for platform, platform_files in by_platform.items():
+            first = next((file for file in platform_files if file.key not in imported), None)
+            if first is None:
+                continue
+            done = [
+                file for file in platform_files
+                if file.timestamp < first.timestamp and file.key in imported
+            ]
+            prices[platform] = self._known_prices(done)
+
+        batch = _Batch()
+        batch_platform = None
+
+        for done_count, (file, columns) in enumerate(self._parse_in_order(pending), start=1):
+            if batch_platform is not None and (file.platform != batch_platform
+                                               or len(batch.files) >= self.batch_files):
+                stats['history'] += self._flush(batch_platform, batch)
+                batch = _Batch()
+            batch_platform = file.platform
+
+            snapshot = self._snapshot(file, columns)
+            changes = self._collect(batch, file, snapshot, prices[file.platform])
+
+            stats['files'] += 1
+            stats['items'] += len(snapshot)
+            if progress:
+                progress(done_count, len(pending), file, len(snapshot), changes)
+
+        stats['history'] += self._flush(batch_platform, batch)
+        return stats
+
+    def _parse_in_order(self, files: List[ArchivedSnapshot]) -> Iterator[Tuple[ArchivedSnapshot, Tuple]]:
+        """
+        Parsea los archivos en procesos auxiliares y los entrega en orden
+
+        Solo se adelantan unos pocos archivos por proceso para no acumular
+        en memoria snapshots pendientes de escribir.
+        """
+        if self.workers == 1:
+            for file in files:
+                yield file, parse_snapshot_file(str(file.path), file.platform)
+            return
+
+        window = self.workers * 2
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            queued = deque()
+            remaining = iter(files)
+            for file in remaining:
+                queued.append((file, executor.submit(parse_snapshot_file, str(file.path), file.platform)))
+                if len(queued) >= window:
+                    break
+            while queued:
+                file, future = queued.popleft()
+                next_file = next(remaining, None)
+                if next_file is not None:
+                    queued.append((next_file, executor.submit(
+                        parse_snapshot_file, str(next_file.path), next_file.platform
+                    )))
+                yield file, future.result()
+
+    def _snapshot(self, file: ArchivedSnapshot, columns: Tuple) -> PriceSnapshot:
+        """Snapshot con los ids resueltos (un solo lote por archivo si solo hay nombres)"""
+        item_ids, names, prices, url_offsets, url_data = columns
+        if item_ids is None:
+            item_ids = self.registry.get_ids(names)
+        return PriceSnapshot(file.platform, item_ids, prices,
+                             file.timestamp, url_offsets, url_data, self.registry)
+
+    def _known_prices(self, files: List[ArchivedSnapshot]) -> Dict[int, int]:
+        """Último precio de cada item tras aplicar archivos ya importados (en orden)"""
+        prices: Dict[int, int] = {}
+        if not files:
+            return prices
+        self.logger.info(f"Releyendo {len(files)} archivos ya importados de {files[0].platform}")
+        try:
+            for file, columns in self._parse_in_order(files):
+                snapshot = self._snapshot(file, columns)
+                prices.update((item_id, price) for item_id, (price, _) in latest_prices(snapshot).items())
+        except Exception as e:
+            self.logger.warning(f"No se pudieron releer los archivos importados: {e}")
+        return prices
+
+    def _collect(self, batch: _Batch, file: ArchivedSnapshot, snapshot: PriceSnapshot,
+                 prices: Dict[int, int]) -> int:
+        """
+        Agrega al lote los cambios de un archivo respecto al último precio de cada item
+
+        Actualiza `prices` con los precios del archivo.
+        """
+        # Un precio válido por item, igual que la ingesta en vivo
+        latest = latest_prices(snapshot)
+        ts = file.snapshot_at
+
+        changes = [(item_id, price) for item_id, (price, _) in latest.items()
+                   if prices.get(item_id) != price]
+        prices.update(changes)
+        for item_id, price_minor in changes:
+            batch.history.append({
+                'item_id': item_id, 'platform_id': None, 'ts': ts, 'price_minor': price_minor
+            })
+
+        for resolution, _ in ROLLUP_RESOLUTIONS:
+            bucket = rollup_bucket(ts, resolution)
+            for item_id, price in changes:
+                key = (resolution, item_id, bucket)
+                rollup = batch.rollups.get(key)
+                if rollup is None:
+                    batch.rollups[key] = [price, price, price, price, 1]
+                else:
+                    rollup[1] = max(rollup[1], price)
+                    rollup[2] = min(rollup[2], price)
+                    rollup[3] = price
+                    rollup[4] += 1
+
+        for item_id, (price_minor, index) in latest.items():
+            batch.items[item_id] = (price_minor, snapshot.url(index) or '', ts)
+
+        batch.files.append((file, len(snapshot), len(changes)))
+        return len(changes)
+
+    # ------------------------------------------------------------------
+    # Escritura
+    # ------------------------------------------------------------------
+
+    def _flush(self, platform: str, batch: _Batch) -> int:
+        """Escribe un lote en una sola transacción. Retorna las filas de histórico escritas"""
+        if not batch.files:
+            return 0
+        platform_id = self.db_manager.platform_id(platform)
+        return self.db_manager.run_write(
+            lambda session: self._write_batch(session, platform, platform_id, batch)
+        )
+
+    def _write_batch(self, session: Session, platform: str, platform_id: int, batch: _Batch) -> int:
+        try:
+            for row in batch.history:
+                row['platform_id'] = platform_id
+            self._write_history(session, batch.history)
+            self._write_rollups(session, platform_id, batch.rollups)
+            self._write_items(session, platform_id, batch.items)
+
+            session.execute(
+                self.db_manager.insert_ignore(SnapshotImport.__table__),
+                [{
+                    'path': str(file.path),
+                    'platform': platform,
+                    'snapshot_at': file.snapshot_at,
+                    'items': items,
+                    'changes': changes,
+                    'imported_at': datetime.utcnow()
+                } for file, items, changes in batch.files]
+            )
+            self.db_service.query_cache.bump(session, 'items')
+            session.commit()
+            self.db_service.query_cache.expire()
+            return len(batch.history)
+        except Exception:
+            session.rollback()
+            raise
+
+    def _write_history(self, session: Session, rows: List[Dict]):
+        """Histórico por COPY en PostgreSQL; executemany por lotes en el resto"""
+        if not self.db_manager.supports_copy:
+            self.db_manager.history.insert(session, rows, BULK_CHUNK_SIZE)
+            return
+
+        by_day: Dict = {}
+        for row in rows:
+            by_day.setdefault(row['ts'].date(), []).append(row)
+        for day, day_rows in by_day.items():
+            table = self.db_manager.history.ensure_partition(session.connection(), day)
+            self.db_manager.copy_rows(
+                session, table.name, HISTORY_COLUMNS,
+                ((row[column] for column in HISTORY_COLUMNS) for row in day_rows)
+            )
+
+    def _write_rollups(self, session: Session, platform_id: int, rollups: Dict):
+        """Combina los rollups del lote con los existentes (high/low/count)"""
+        self.db_service.write_rollups(session, [{
+            'resolution': resolution, 'item_id': item_id, 'platform_id': platform_id, 'bucket': bucket,
+            'open': open_, 'high': high, 'low': low, 'close': close, 'count': count
+        } for (resolution, item_id, bucket), (open_, high, low, close, count) in rollups.items()])
+
+    def _write_items(self, session: Session, platform_id: int, items: Dict):
+        """Precio actual de cada item, sin pisar datos más recientes (p. ej. de los scrapers)"""
+        table = Item.__table__
+
+        def newer(stmt, column):
+            return case(
+                (stmt.excluded.last_updated > table.c.last_updated, stmt.excluded[column]),
+                else_=table.c[column]
+            )
+
+        upsert = self.db_manager.upsert(
+            table,
+            index_elements=['item_id', 'platform_id'],
+            set_=lambda stmt: {
+                'price_minor': newer(stmt, 'price_minor'),
+                'is_available': newer(stmt, 'is_available'),
+                'last_updated': self.db_manager.greatest(table.c.last_updated, stmt.excluded.last_updated)
+            }
+        )
+        rows = [{
+            'item_id': item_id, 'platform_id': platform_id, 'price_minor': price_minor,
+            'url': url, 'last_updated': ts, 'is_available': True
+        } for item_id, (price_minor, url, ts) in items.items()]
+        for start in range(0, len(rows), BULK_CHUNK_SIZE):
+            session.execute(upsert, rows[start:start + BULK_CHUNK_SIZE])
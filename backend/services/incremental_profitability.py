@@ -0,0 +1,238 @@
+# backend/services/incremental_profitability.py
+
+import threading
+import time
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+from loguru import logger
+
+from backend.core.config_manager import get_config_manager
+from backend.core.item_registry import get_item_registry
+from backend.core.live_prices import LivePrices
+from backend.core.price_record import MINOR_UNITS
+from backend.services.profitability_service import (
+    ProfitabilityService, ProfitableItem, create_analysis_trigger, round_decimals
+)
+
+# Clave de una entrada del ranking: (-rentabilidad, índice de plataforma, item_id)
+RankKey = Tuple[float, int, int]
+
+
+class IncrementalProfitability:
+    """
+    Rentabilidad incremental por (item, plataforma) con ranking en vivo
+
+    Los precios de Steam y de cada plataforma se mantienen con LivePrices y
+    las entradas que superan el umbral se guardan en un ranking ordenado.
+    En cada refresh() solo se recalculan las entradas cuyo precio de
+    plataforma o de Steam cambió desde la pasada anterior.
+    """
+
+    def __init__(self, service: Optional[ProfitabilityService] = None, event_bus=None):
+        self.service = service or ProfitabilityService()
+        self.registry = get_item_registry()
+        self.logger = logger.bind(service="IncrementalProfitability")
+
+        self.platforms = ProfitabilityService.PLATFORMS
+        self._platform_index = {platform: index for index, platform in enumerate(self.platforms)}
+        self._thresholds = [
+            self.service.thresholds.get(f'profitability_{platform}', 0.05)
+            for platform in self.platforms
+        ]
+        self.live = LivePrices(('steam',) + self.platforms, event_bus)
+
+        # Ranking: lista ordenada de claves + entrada actual de cada (plataforma, item)
+        self._ranking: List[RankKey] = []
+        self._entries: Dict[Tuple[int, int], RankKey] = {}
+        self._ranked = [np.zeros(0, dtype=bool) for _ in self.platforms]
+        self._notified: Set[RankKey] = set()
+
+    def start(self):
+        """Escucha los SnapshotDiff de los scrapers que corren en este proceso"""
+        self.live.start()
+
+    def stop(self):
+        self.live.stop()
+
+    # ------------------------------------------------------------------
+    # Recálculo
+    # ------------------------------------------------------------------
+
+    def refresh(self) -> int:
+        """
+        Aplica los cambios pendientes y recalcula solo las entradas afectadas
+
+        Returns:
+            Número de entradas del ranking que cambiaron
+        """
+        dirty = self.live.refresh()
+
+        # Un cambio en Steam afecta a ese item en todas las plataformas
+        steam_dirty = dirty.pop('steam', None)
+        updated = 0
+        for platform in self.platforms:
+            parts = [ids for ids in (dirty.get(platform), steam_dirty) if ids is not None]
+            if parts:
+                updated += self._recompute(platform, np.unique(np.concatenate(parts)))
+        return updated
+
+    def _recompute(self, platform: str, item_ids: np.ndarray) -> int:
+        """Recalcula la rentabilidad de unos items de una plataforma (vectorizado)"""
+        index = self._platform_index[platform]
+        buy_minor = self.live.take(platform, item_ids)
+        steam_minor = self.live.take('steam', item_ids)
+        valid = (buy_minor > 0) & (steam_minor > 0)
+
+        # Mismo cálculo que ProfitabilityService.compute_profitability
+        rentabilidad = np.full(len(item_ids), np.nan)
+        buy_prices = buy_minor[valid] / MINOR_UNITS
+        net_steam = self.service.fee_calculator.subtract_fee_array(steam_minor[valid] / MINOR_UNITS)
+        rentabilidad[valid] = round_decimals((net_steam - buy_prices) / buy_prices, 4)
+        passing = valid & (rentabilidad >= self._thresholds[index])
+
+        # Solo tocan el ranking las entradas que entran, salen o ya estaban en él
+        ranked = self._ranked[index]
+        size = int(item_ids[-1]) + 1  # item_ids viene ordenado de np.unique
+        if len(ranked) < size:
+            grown = np.zeros(size, dtype=bool)
+            grown[:len(ranked)] = ranked
+            self._ranked[index] = ranked = grown
+        touched = np.flatnonzero(passing | ranked[item_ids])
+
+        updated = 0
+        for item_id, ok, value in zip(item_ids[touched].tolist(), passing[touched].tolist(),
+                                      rentabilidad[touched].tolist()):
+            if self._update_entry(index, item_id, value if ok else None):
+                updated += 1
+        ranked[item_ids[touched]] = passing[touched]
+        return updated
+
+    def _update_entry(self, index: int, item_id: int, rentabilidad: Optional[float]) -> bool:
+        """Actualiza la posición de una entrada en el ranking (None = sale del ranking)"""
+        old = self._entries.get((index, item_id))
+        new = (-rentabilidad, index, item_id) if rentabilidad is not None else None
+        if old == new:
+            return False
+
+        if old is not None:
+            del self._ranking[bisect_left(self._ranking, old)]
+            del self._entries[(index, item_id)]
+        if new is not None:
+            insort(self._ranking, new)
+            self._entries[(index, item_id)] = new
+        return True
+
+    # ------------------------------------------------------------------
+    # Resultados
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._ranking)
+
+    def top(self, k: Optional[int] = None) -> List[ProfitableItem]:
+        """Las k mejores oportunidades (todas si k es None), ordenadas por rentabilidad"""
+        return self._materialize(self._ranking[:k] if k is not None else list(self._ranking))
+
+    def new_in_top(self, k: int) -> List[ProfitableItem]:
+        """
+        Entradas del top-k que no estaban en el top-k de la llamada anterior
+
+        Una entrada vuelve a contar como nueva si su rentabilidad cambió.
+        Pensado para notificar solo lo que acaba de aparecer.
+        """
+        keys = self._ranking[:k]
+        fresh = [key for key in keys if key not in self._notified]
+        self._notified = set(keys)
+        return self._materialize(fresh)
+
+    def _materialize(self, keys: List[RankKey]) -> List[ProfitableItem]:
+        if not keys:
+            return []
+
+        service = self.service
+        names = self.registry.get_names(np.array([key[2] for key in keys], dtype=np.int64))
+        steam_prices = self.live['steam']
+        items = []
+        for (negative, index, item_id), name in zip(keys, names):
+            platform = self.platforms[index]
+            buy_price = int(self.live[platform][item_id]) / MINOR_UNITS
+            steam_price = int(steam_prices[item_id]) / MINOR_UNITS
+            items.append(ProfitableItem(
+                name=name,
+                buy_price=buy_price,
+                buy_platform=platform.capitalize(),
+                buy_url=service.PLATFORM_URLS.get(platform, '') + name,
+                steam_price=steam_price,
+                net_steam_price=service.fee_calculator.subtract_fee(steam_price),
+                rentabilidad=-negative,
+                steam_link=service.STEAM_URL + name
+            ))
+        return items
+
+
+def run_incremental_once():
+    """Una pasada del motor incremental (carga completa) con el mismo informe que run()"""
+    engine = IncrementalProfitability()
+    engine.refresh()
+    engine.service.report(engine.top())
+
+
+def run_incremental_monitor(cross_process: bool = True,
+                            stop_event: Optional[threading.Event] = None):
+    """
+    Monitor de rentabilidad incremental dirigido por eventos
+
+    Cada SNAPSHOT_READY (agrupando ráfagas) dispara un refresh() y se
+    notifica en cuanto una oportunidad entra en el top. El JSON y la base
+    de datos se actualizan como mucho cada save_interval segundos.
+    """
+    settings = get_config_manager().settings.get('profitability', {})
+    save_interval = settings.get('save_interval', 5.0)
+    notify_top = settings.get('notify_top', 5)
+
+    engine = IncrementalProfitability()
+    service = engine.service
+    stop_event = stop_event or threading.Event()
+    engine.start()
+    trigger, watcher = create_analysis_trigger(cross_process)
+    events = True  # Carga inicial
+    unsaved = False
+    last_save = 0.0
+
+    try:
+        while not stop_event.is_set():
+            try:
+                if events and engine.refresh():
+                    unsaved = True
+                    for item in engine.new_in_top(notify_top):
+                        service.notification_service.notify_opportunity(
+                            item_name=item.name,
+                            buy_platform=item.buy_platform,
+                            buy_price=item.buy_price,
+                            profit_percentage=item.rentabilidad_percentage,
+                            profit_amount=item.profit
+                        )
+
+                now = time.monotonic()
+                if unsaved and now - last_save >= save_interval:
+                    service.save_profitable_items(engine.top())
+                    unsaved = False
+                    last_save = now
+
+                # Despertar para el guardado pendiente o para revisar stop_event
+                timeout = max(save_interval - (now - last_save), 0.0) if unsaved else 1.0
+                events = trigger.wait(timeout=timeout)
+
+            except KeyboardInterrupt:
+                logger.info("Monitor de rentabilidad incremental detenido por el usuario")
+                break
+            except Exception as e:
+                logger.error(f"Error en monitor de rentabilidad incremental: {e}")
+                events = trigger.wait(timeout=1.0)
+    finally:
+        trigger.close()
+        if watcher:
+            watcher.stop()
+        engine.stop()
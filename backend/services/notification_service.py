@@ -181,6 +181,27 @@ class NotificationService:
         
         self.send(title, message, "OPPORTUNITY", data)
     
+    def notify_arbitrage(self, item_name: str, buy_platform: str, buy_price: float,
+                         sell_platform: str, sell_price: float,
+                         profit_percentage: float, profit_amount: float):
+        """Notifica una oportunidad de arbitraje entre dos plataformas"""
+        if profit_percentage < self.min_profit_alert:
+            return
+        
+        title = f"🔁 ARBITRAJE: {profit_percentage:.1f}%"
+        message = (f"{item_name} - Comprar en {buy_platform} por ${buy_price:.2f}, "
+                   f"vender en {sell_platform} por ${sell_price:.2f}")
+        
+        data = {
+            "Item": item_name,
+            "Comprar en": f"{buy_platform} (${buy_price:.2f})",
+            "Vender en": f"{sell_platform} (${sell_price:.2f})",
+            "Rentabilidad": f"{profit_percentage:.1f}%",
+            "Ganancia": f"${profit_amount:.2f}"
+        }
+        
+        self.send(title, message, "OPPORTUNITY", data)
+    
     def notify_scraper_error(self, scraper_name: str, error: str):
         """Notifica un error en un scraper"""
         title = f"⚠️ ERROR EN SCRAPER: {scraper_name}"
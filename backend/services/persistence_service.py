@@ -0,0 +1,218 @@
+# backend/services/persistence_service.py
+
+import atexit
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from loguru import logger
+
+from backend.core.config_manager import get_config_manager
+from backend.core.snapshot import PriceSnapshot
+from backend.services.database_service import get_database_service
+
+
+class PersistenceWorker:
+    """
+    Escritura diferida (write-behind) de snapshots en la base de datos
+
+    Los scrapers encolan el snapshot y siguen con el siguiente fetch; un hilo
+    en segundo plano hace las escrituras. La cola está acotada y agrupa por
+    plataforma: si llega un snapshot nuevo de una plataforma que aún no se
+    escribió, reemplaza al pendiente (gana el último). Si la cola está llena
+    submit() bloquea al productor hasta que haya sitio (backpressure).
+
+    Los snapshots pendientes de varias plataformas (hasta batch_size) se
+    escriben en una sola transacción. Si el lote falla, cada snapshot se
+    reintenta por separado para que el error quede registrado solo en la
+    plataforma que lo causó.
+    """
+
+    def __init__(self,
+                 db_service=None,
+                 max_pending: int = 16,
+                 batch_size: int = 4,
+                 submit_timeout: float = 30.0):
+        self.db_service = db_service or get_database_service()
+        self.max_pending = max(1, max_pending)
+        self.batch_size = max(1, batch_size)
+        self.submit_timeout = submit_timeout
+        self.logger = logger.bind(service="PersistenceWorker")
+
+        self._pending: "OrderedDict[str, PriceSnapshot]" = OrderedDict()
+        self._in_flight = 0
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+        self.stats = {
+            'submitted': 0,
+            'coalesced': 0,
+            'written': 0,
+            'failed': 0,
+            'dropped': 0,
+            'last_write_seconds': None
+        }
+
+    # ------------------------------------------------------------------
+    # Productores
+    # ------------------------------------------------------------------
+
+    def submit(self, platform: str, snapshot: PriceSnapshot,
+               timeout: Optional[float] = None) -> bool:
+        """
+        Encola un snapshot para guardarlo en la base de datos
+
+        Args:
+            platform: Plataforma del snapshot
+            snapshot: Snapshot validado
+            timeout: Segundos máximos de espera si la cola está llena (None = submit_timeout)
+
+        Returns:
+            False si se descartó por timeout con la cola llena
+        """
+        self._ensure_started()
+        timeout = self.submit_timeout if timeout is None else timeout
+
+        with self._condition:
+            self.stats['submitted'] += 1
+
+            if platform in self._pending:
+                # Gana el último: el snapshot anterior aún no escrito se descarta
+                self._pending[platform] = snapshot
+                self.stats['coalesced'] += 1
+                return True
+
+            deadline = time.monotonic() + timeout
+            while len(self._pending) >= self.max_pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._condition.wait(remaining):
+                    self.stats['dropped'] += 1
+                    self.logger.warning(
+                        f"Cola de persistencia llena ({self.queue_depth}), "
+                        f"snapshot de {platform} descartado"
+                    )
+                    return False
+
+            self._pending[platform] = snapshot
+            self._condition.notify_all()
+            return True
+
+    @property
+    def queue_depth(self) -> int:
+        """Snapshots pendientes de escribir (incluye los que se están escribiendo)"""
+        return len(self._pending) + self._in_flight
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Estadísticas del worker"""
+        with self._condition:
+            return {**self.stats, 'queue_depth': self.queue_depth}
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Espera a que se escriban todos los snapshots pendientes
+
+        Returns:
+            True si la cola quedó vacía
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        with self._condition:
+            while self.queue_depth:
+                if not self._running:
+                    return False
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    def stop(self, timeout: Optional[float] = 30.0):
+        """Escribe lo pendiente y detiene el hilo"""
+        self.flush(timeout)
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    # ------------------------------------------------------------------
+    # Hilo de escritura
+    # ------------------------------------------------------------------
+
+    def _ensure_started(self):
+        if self._running:
+            return
+        with self._condition:
+            if self._running:
+                return
+            self._running = True
+            self._thread = threading.Thread(
+                target=self._run, name="PersistenceWorker", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._running and not self._pending:
+                    self._condition.wait()
+                if not self._pending:
+                    return
+
+                batch = []
+                while self._pending and len(batch) < self.batch_size:
+                    batch.append(self._pending.popitem(last=False))
+                self._in_flight = len(batch)
+                # Hay sitio en la cola: despertar a los productores bloqueados
+                self._condition.notify_all()
+
+            started = time.perf_counter()
+            self._write(batch)
+
+            with self._condition:
+                self.stats['last_write_seconds'] = round(time.perf_counter() - started, 3)
+                self._in_flight = 0
+                self._condition.notify_all()
+
+
+    def _write(self, batch):
+        """Escribe un lote en una transacción (o uno a uno si el lote falla)"""
+        if len(batch) > 1:
+            try:
+                self.db_service.save_scraper_batch(batch)
+                self.stats['written'] += len(batch)
+                return
+            except Exception as e:
+                self.logger.warning(
+                    f"Error guardando un lote de {len(batch)} plataformas, "
+                    f"se reintenta por plataforma: {e}"
+                )
+
+        for platform, snapshot in batch:
+            try:
+                self.db_service.save_scraper_data(platform, snapshot)
+                self.stats['written'] += 1
+            except Exception as e:
+                self.stats['failed'] += 1
+                self.logger.error(f"Error guardando {platform} en base de datos: {e}")
+
+
+# Singleton del worker de persistencia
+_persistence_worker = None
+
+def get_persistence_worker() -> PersistenceWorker:
+    """Obtiene la instancia singleton del PersistenceWorker"""
+    global _persistence_worker
+    if _persistence_worker is None:
+        settings = get_config_manager().settings.get('database', {})
+        _persistence_worker = PersistenceWorker(
+            max_pending=settings.get('write_queue_size', 16),
+            batch_size=settings.get('write_batch_size', 4),
+            submit_timeout=settings.get('write_submit_timeout', 30)
+        )
+        # Escribir lo pendiente antes de salir del proceso
+        atexit.register(_persistence_worker.stop)
+    return _persistence_worker
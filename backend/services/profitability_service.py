@@ -1,13 +1,16 @@
 # backend/services/profitability_service.py
 
 import json
+import math
 import os
-import time
+import threading
 from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 from datetime import datetime
 from dataclasses import dataclass
 import asyncio
+from bisect import bisect_left
+import numpy as np
 from loguru import logger
 
 # Importar nuestras clases base
@@ -15,9 +18,19 @@ import sys
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from backend.core.config_manager import get_config_manager
+from backend.core.event_bus import get_event_bus, DebouncedTrigger, SNAPSHOT_READY
+from backend.core.snapshot_watcher import SnapshotWatcher
 from backend.core.translator import get_translator
+from backend.core.price_record import MINOR_UNITS
+from backend.core.snapshot import PriceSnapshot
+from backend.core.snapshot_store import get_snapshot_store, atomic_write
 from backend.services.database_service import get_database_service
 from backend.services.notification_service import get_notification_service
+
+# Precio máximo (USD) cubierto inicialmente por las tablas de comisiones de Steam
+FEE_TABLE_MAX_PRICE = 10000.0
+
+
 @dataclass
 class ProfitableItem:
     """Representa un item con oportunidad de arbitraje"""
@@ -55,40 +68,129 @@ class ProfitableItem:
 
 
 class SteamFeeCalculator:
-    """Calcula las comisiones de Steam de forma precisa"""
-    
-    @staticmethod
-    def subtract_fee(input_value: float) -> float:
-        """
-        Calcula el precio neto después de las comisiones de Steam
-        Usa el algoritmo exacto del proyecto original
-        """
-        intervals = [0.02, 0.21, 0.32, 0.43]
-        fees = [0.02, 0.03, 0.04, 0.05, 0.07, 0.09]
-        
-        # Extender intervalos según sea necesario
-        while input_value > intervals[-1]:
+    """
+    Calcula las comisiones de Steam de forma precisa
+
+    Usa el algoritmo exacto del proyecto original: los límites de los
+    intervalos crecen alternando +0.12 y +0.11 y la comisión de cada
+    intervalo alternando +0.01 y +0.02 (redondeando en cada paso). Las
+    tablas se generan una sola vez hasta max_price y cada consulta es una
+    búsqueda binaria; si llega un precio mayor, las tablas se amplían.
+    """
+
+    # Tablas iniciales del algoritmo original
+    BASE_INTERVALS = (0.02, 0.21, 0.32, 0.43)
+    BASE_FEES = (0.02, 0.03, 0.04, 0.05, 0.07, 0.09)
+
+    def __init__(self, max_price: float = FEE_TABLE_MAX_PRICE):
+        self.intervals: List[float] = []
+        self.fees: List[float] = []
+        self._build(max_price)
+
+    def _build(self, max_price: float):
+        """Genera los límites de intervalo y las comisiones hasta cubrir max_price"""
+        intervals = list(self.BASE_INTERVALS)
+        fees = list(self.BASE_FEES)
+
+        while max_price > intervals[-1]:
             last_element = intervals[-1]
             if len(intervals) % 2 == 0:
                 intervals.append(round(last_element + 0.12, 2))
             else:
                 intervals.append(round(last_element + 0.11, 2))
-        
-        # Extender fees según sea necesario
+
         while len(intervals) > len(fees):
             last_element = fees[-1]
             if len(fees) % 2 == 0:
                 fees.append(round(last_element + 0.01, 2))
             else:
                 fees.append(round(last_element + 0.02, 2))
-        
-        # Encontrar el primer intervalo mayor o igual
-        first_greater = next((value for value in intervals if value >= input_value), None)
-        index_of_first_greater = intervals.index(first_greater)
-        
-        # Calcular precio neto
-        fee_subtraction = round(input_value - fees[index_of_first_greater - 1], 2)
-        return fee_subtraction
+
+        self.intervals = intervals
+        self.fees = fees
+        self._intervals_array = np.array(intervals)
+        # Comisión por índice del primer límite >= precio. Con índice 0 el
+        # original toma fees[-1] de sus tablas sin ampliar: BASE_FEES[-1]
+        self._fee_by_index = np.array([self.BASE_FEES[-1]] + fees[:len(intervals) - 1])
+
+    def _ensure_covers(self, value: float):
+        """Amplía las tablas si value supera el último límite (NaN/inf no son precios válidos)"""
+        if not math.isfinite(value):
+            raise ValueError(f"Precio de Steam inválido: {value}")
+        if value > self.intervals[-1]:
+            self._build(max(value, self.intervals[-1] * 2))
+
+    def subtract_fee(self, input_value: float) -> float:
+        """
+        Calcula el precio neto después de las comisiones de Steam
+        Usa el algoritmo exacto del proyecto original
+        """
+        self._ensure_covers(input_value)
+
+        # Primer límite mayor o igual al precio
+        index = bisect_left(self.intervals, input_value)
+        fee = self.fees[index - 1] if index else self.BASE_FEES[-1]
+        return round(input_value - fee, 2)
+
+    def subtract_fee_array(self, values: np.ndarray) -> np.ndarray:
+        """
+        Versión vectorizada de subtract_fee para un array de precios
+
+        Da exactamente el mismo resultado que subtract_fee elemento a
+        elemento (incluido el redondeo de round(x, 2)).
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if not values.size:
+            return values.copy()
+        if not np.isfinite(values).all():
+            raise ValueError("Precio de Steam inválido: nan/inf")
+        self._ensure_covers(float(values.max()))
+
+        indices = self._first_boundary_at_least(values)
+        return round_decimals(values - self._fee_by_index[indices], 2)
+
+    def _first_boundary_at_least(self, values: np.ndarray) -> np.ndarray:
+        """
+        Índice del primer límite >= cada valor (como searchsorted side='left')
+
+        Desde 0.43 los límites avanzan 0.23 cada dos pasos: la posición se
+        estima con aritmética y se corrige comparando con la tabla real, lo
+        que evita la búsqueda binaria sobre una tabla grande.
+        """
+        intervals = self._intervals_array
+        last = len(intervals) - 1
+        estimate = np.floor((values - intervals[3]) / 0.115).astype(np.int64) + 3
+        indices = np.clip(estimate, 0, last)
+
+        # La estimación queda a uno o dos pasos del índice exacto
+        while True:
+            low = (intervals[indices] < values) & (indices < last)
+            if not low.any():
+                break
+            indices[low] += 1
+        while True:
+            high = (indices > 0) & (intervals[indices - 1] >= values)
+            if not high.any():
+                break
+            indices[high] -= 1
+        return indices
+
+
+def round_decimals(values: np.ndarray, decimals: int) -> np.ndarray:
+    """
+    round(x, decimals) de Python sobre un array, con el mismo resultado bit a bit
+
+    np.round escala y redondea, lo que difiere del redondeo decimal exacto
+    de Python cuando el valor escalado queda a medio camino entre dos
+    enteros; esos casos (muy pocos) se resuelven con round().
+    """
+    factor = 10.0 ** decimals
+    scaled = values * factor
+    rounded = np.rint(scaled) / factor
+    ties = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if ties.any():
+        rounded[ties] = [round(value, decimals) for value in values[ties].tolist()]
+    return rounded
 
 
 class ProfitabilityService:
@@ -122,8 +224,9 @@ class ProfitabilityService:
         
         # Rutas de archivos JSON
         self.json_path = Path('JSON')
+        self.snapshot_store = get_snapshot_store()
         
-        # Cache para evitar recálculos innecesarios
+        # Snapshots en memoria por plataforma y versión del manifiesto cargada
         self._cache = {}
         self._last_update = {}
         
@@ -151,105 +254,145 @@ class ProfitabilityService:
         rentabilidad = round((net_steam_price - buy_price) / buy_price, 4)
         return rentabilidad, net_steam_price
     
-    def load_platform_data(self, platform: str) -> List[Dict]:
-        """Carga los datos de una plataforma desde JSON"""
-        filename = f"{platform}_data.json"
-        filepath = self.json_path / filename
+    def load_platform_data(self, platform: str) -> PriceSnapshot:
+        """
+        Carga el snapshot de una plataforma (binario vía mmap o JSON)
         
-        if not filepath.exists():
-            self.logger.warning(f"No se encontró archivo: {filename}")
-            return []
-            
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception as e:
-            self.logger.error(f"Error cargando {filename}: {e}")
-            return []
+        Los snapshots se guardan en memoria junto con su versión del
+        manifiesto y solo se vuelven a leer cuando la versión cambia.
+        """
+        version = self.snapshot_store.get_version(platform)
+        if version is None:
+            self._cache.pop(platform, None)
+            self._last_update.pop(platform, None)
+            return PriceSnapshot.empty(platform)
+        
+        if self._last_update.get(platform) == version:
+            return self._cache[platform]
+        
+        snapshot = self.snapshot_store.load(platform)
+        self._cache[platform] = snapshot
+        self._last_update[platform] = version
+        return snapshot
     
-    def load_steam_prices(self) -> Dict[str, float]:
-        """Carga los precios de Steam desde JSON"""
-        steam_file = self.json_path / 'steam_data.json'
+    def load_steam_prices(self) -> np.ndarray:
+        """
+        Carga los precios de Steam
         
-        if not steam_file.exists():
-            self.logger.error("No se encontró steam_data.json")
-            return {}
-            
-        try:
-            with open(steam_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                # Convertir lista a diccionario para búsqueda rápida
-                return {item['Item']: item['Price'] for item in data}
-        except Exception as e:
-            self.logger.error(f"Error cargando steam_data.json: {e}")
-            return {}
+        Returns:
+            Array denso indexado por item_id con el precio de Steam en
+            milésimas de dólar (0 = sin precio)
+        """
+        snapshot = self.load_platform_data('steam')
+        
+        if not len(snapshot):
+            self.logger.error("No hay snapshot de Steam disponible")
+            return np.zeros(0, dtype=np.int64)
+        
+        cached = self._cache.get('steam_prices')
+        if cached is not None and cached[0] is snapshot:
+            return cached[1]
+        
+        # Convertir a array indexado por id para búsqueda vectorizada
+        valid = snapshot.prices > 0
+        steam_prices = np.zeros(len(snapshot.registry), dtype=np.int64)
+        steam_prices[snapshot.item_ids[valid]] = snapshot.prices[valid]
+        self._cache['steam_prices'] = (snapshot, steam_prices)
+        return steam_prices
+    
+    def _lookup_steam_prices(self, steam_prices: np.ndarray, snapshot: PriceSnapshot) -> np.ndarray:
+        """Obtiene el precio de Steam de cada item del snapshot (0 = sin precio)"""
+        item_ids = snapshot.item_ids
+        result = np.zeros(len(item_ids), dtype=np.int64)
+        
+        # Los items que Steam no conoce pueden tener ids posteriores a la carga de Steam
+        known = item_ids < len(steam_prices)
+        result[known] = steam_prices[item_ids[known]]
+        return result
+    
+    # Plataformas a analizar
+    PLATFORMS = (
+        'waxpeer', 'csdeals', 'empire', 'skinport', 'manncostore',
+        'cstrade', 'bitskins', 'tradeit', 'marketcsgo', 'skinout',
+        'skindeck', 'white', 'lisskins', 'shadowpay'
+    )
+    
+    def compute_profitability(self, steam_prices: np.ndarray,
+                              snapshot: PriceSnapshot) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Rentabilidad de todas las filas de un snapshot en bloque
+        
+        Mismo cálculo que calculate_profitability, pero sobre arrays: join
+        con Steam por item_id, precio neto y rentabilidad redondeada.
+        
+        Returns:
+            (índices de fila, precio de compra, precio de Steam, precio neto,
+             rentabilidad) solo para las filas con precio en ambos lados
+        """
+        platform_steam_prices = self._lookup_steam_prices(steam_prices, snapshot)
+        rows = np.flatnonzero((platform_steam_prices > 0) & (snapshot.prices > 0))
+        
+        buy_prices = snapshot.prices[rows] / MINOR_UNITS
+        steam = platform_steam_prices[rows] / MINOR_UNITS
+        net_steam = self.fee_calculator.subtract_fee_array(steam)
+        rentabilidad = round_decimals((net_steam - buy_prices) / buy_prices, 4)
+        return rows, buy_prices, steam, net_steam, rentabilidad
     
     def find_profitable_items(self) -> List[ProfitableItem]:
-        """Encuentra todos los items rentables comparando todas las plataformas"""
+        """
+        Encuentra todos los items rentables comparando todas las plataformas
+        
+        El cálculo es vectorizado por plataforma; los ProfitableItem solo se
+        construyen para las filas que superan el umbral.
+        """
         profitable_items = []
         
         # Cargar precios de Steam
         steam_prices = self.load_steam_prices()
-        if not steam_prices:
+        if not steam_prices.any():
             self.logger.error("No hay precios de Steam disponibles")
             return []
         
-        # Plataformas a analizar
-        platforms = [
-            'waxpeer', 'csdeals', 'empire', 'skinport', 'manncostore',
-            'cstrade', 'bitskins', 'tradeit', 'marketcsgo', 'skinout',
-            'skindeck', 'white', 'lisskins', 'shadowpay'
-        ]
-        
         # Analizar cada plataforma
-        for platform in platforms:
+        for platform in self.PLATFORMS:
             # Obtener umbral de rentabilidad para esta plataforma
             threshold_key = f'profitability_{platform}'
             min_profitability = self.thresholds.get(threshold_key, 0.05)  # 5% por defecto
             
             # Cargar datos de la plataforma
-            platform_data = self.load_platform_data(platform)
+            snapshot = self.load_platform_data(platform)
+            if not len(snapshot):
+                continue
             
-            for item in platform_data:
-                try:
-                    name = item.get('Item', '')
-                    buy_price = float(item.get('Price', 0))
-                    
-                    if not name or buy_price == 0:
-                        continue
-                    
-                    # Buscar precio en Steam
-                    steam_price = steam_prices.get(name)
-                    if not steam_price:
-                        continue
-                    
-                    # Calcular rentabilidad
-                    rentabilidad, net_steam_price = self.calculate_profitability(
-                        steam_price, buy_price
-                    )
-                    
-                    # Si es rentable según el umbral
-                    if rentabilidad >= min_profitability:
-                        # Construir URL del item
-                        item_url = self.PLATFORM_URLS.get(platform, '') + name
-                        steam_url = self.STEAM_URL + name
-                        
-                        profitable_item = ProfitableItem(
-                            name=name,
-                            buy_price=buy_price,
-                            buy_platform=platform.capitalize(),
-                            buy_url=item_url,
-                            steam_price=steam_price,
-                            net_steam_price=net_steam_price,
-                            rentabilidad=rentabilidad,
-                            steam_link=steam_url
-                        )
-                        
-                        profitable_items.append(profitable_item)
-                        
-                except Exception as e:
-                    self.logger.error(f"Error procesando item {item} de {platform}: {e}")
-                    continue
+            try:
+                rows, buy_prices, steam, net_steam, rentabilidad = self.compute_profitability(
+                    steam_prices, snapshot
+                )
+            except Exception as e:
+                self.logger.error(f"Error analizando {platform}: {e}")
+                continue
+            
+            passing = np.flatnonzero(rentabilidad >= min_profitability)
+            if not len(passing):
+                continue
+            
+            buy_platform = platform.capitalize()
+            platform_url = self.PLATFORM_URLS.get(platform, '')
+            names = snapshot.registry.get_names(snapshot.item_ids[rows[passing]])
+            for name, buy_price, steam_price, net_steam_price, rent in zip(
+                names, buy_prices[passing].tolist(), steam[passing].tolist(),
+                net_steam[passing].tolist(), rentabilidad[passing].tolist()
+            ):
+                profitable_items.append(ProfitableItem(
+                    name=name,
+                    buy_price=buy_price,
+                    buy_platform=buy_platform,
+                    buy_url=platform_url + name,
+                    steam_price=steam_price,
+                    net_steam_price=net_steam_price,
+                    rentabilidad=rent,
+                    steam_link=self.STEAM_URL + name
+                ))
         
         # Ordenar por rentabilidad descendente
         profitable_items.sort(key=lambda x: x.rentabilidad, reverse=True)
@@ -264,9 +407,8 @@ class ProfitabilityService:
             # Convertir a lista de diccionarios
             data = [item.to_dict() for item in items]
             
-            # Guardar en JSON (mantener compatibilidad)
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=4, ensure_ascii=False)
+            # Guardar en JSON (mantener compatibilidad), de forma atómica para los lectores
+            atomic_write(output_file, lambda f: json.dump(data, f, indent=4, ensure_ascii=False))
                 
             self.logger.info(f"Guardadas {len(items)} oportunidades rentables en JSON")
             
@@ -280,10 +422,10 @@ class ProfitabilityService:
             
         except Exception as e:
             self.logger.error(f"Error guardando rentabilidad: {e}")
-    def load_platform_data_from_db(self, platform: str) -> List[Dict]:
+    def load_platform_data_from_db(self, platform: str) -> PriceSnapshot:
         """Carga los datos de una plataforma desde la base de datos"""
         if not self.use_database:
-            return []
+            return PriceSnapshot.empty(platform)
             
         try:
             # Implementar lógica para cargar desde DB
@@ -291,14 +433,16 @@ class ProfitabilityService:
             return self.load_platform_data(platform)
         except Exception as e:
             self.logger.error(f"Error cargando desde DB: {e}")
-            return []
+            return PriceSnapshot.empty(platform)
     def run(self):
         """Ejecuta el análisis de rentabilidad con notificaciones"""
         self.logger.info("Iniciando análisis de rentabilidad...")
         
         # Encontrar items rentables
-        profitable_items = self.find_profitable_items()
-        
+        self.report(self.find_profitable_items())
+    
+    def report(self, profitable_items: List[ProfitableItem]):
+        """Guarda, notifica y muestra el resultado de un análisis"""
         if profitable_items:
             self.logger.info(f"Encontradas {len(profitable_items)} oportunidades rentables")
             
@@ -320,7 +464,7 @@ class ProfitabilityService:
             self.notification_service.notify_summary(
                 opportunities_count=len(profitable_items),
                 best_profit=best_profit,
-                total_scrapers=len(self.platforms)
+                total_scrapers=len(self.PLATFORMS)
             )
             
             # Mostrar las mejores oportunidades
@@ -343,24 +487,63 @@ class ProfitabilityService:
             )
 
 
-def run_profitability_monitor():
-    """Función para ejecutar el monitor de rentabilidad continuamente"""
+def create_analysis_trigger(cross_process: bool = True) -> Tuple[DebouncedTrigger, Optional[SnapshotWatcher]]:
+    """
+    Disparador de análisis: SNAPSHOT_READY de Steam y de las plataformas analizadas
+
+    Con cross_process=True arranca además un SnapshotWatcher para enterarse
+    de los snapshots que publican scrapers de otros procesos.
+    """
+    settings = get_config_manager().settings.get('profitability', {})
+    sources = ('steam',) + ProfitabilityService.PLATFORMS
+    trigger = DebouncedTrigger(
+        get_event_bus(), SNAPSHOT_READY,
+        debounce=settings.get('debounce', 0.25),
+        max_delay=settings.get('max_delay', 2.0),
+        accept=lambda ready: ready.platform in sources
+    )
+    watcher = None
+    if cross_process:
+        watcher = SnapshotWatcher(sources, settings.get('watch_interval', 0.2))
+        watcher.start()
+    return trigger, watcher
+
+
+def run_profitability_monitor(cross_process: bool = True,
+                              stop_event: Optional[threading.Event] = None):
+    """
+    Monitor de rentabilidad dirigido por eventos
+
+    Analiza al arrancar y después cada vez que se publica un snapshot de
+    Steam o de una plataforma, agrupando en un solo análisis los scrapers
+    que terminan casi a la vez.
+    """
     service = ProfitabilityService()
+    stop_event = stop_event or threading.Event()
+    trigger, watcher = create_analysis_trigger(cross_process)
     
-    while True:
-        try:
-            # Ejecutar análisis
-            service.run()
-            
-            # Esperar 60 segundos antes del próximo análisis
-            time.sleep(60)
-            
-        except KeyboardInterrupt:
-            logger.info("Monitor de rentabilidad detenido por el usuario")
-            break
-        except Exception as e:
-            logger.error(f"Error en monitor de rentabilidad: {e}")
-            time.sleep(60)  # Esperar antes de reintentar
+    try:
+        service.run()
+        
+        while not stop_event.is_set():
+            try:
+                # El timeout solo sirve para revisar stop_event
+                events = trigger.wait(timeout=1.0)
+                if not events:
+                    continue
+                
+                logger.info(f"Snapshots nuevos: {', '.join(sorted({e.platform for e in events}))}")
+                service.run()
+                
+            except KeyboardInterrupt:
+                logger.info("Monitor de rentabilidad detenido por el usuario")
+                break
+            except Exception as e:
+                logger.error(f"Error en monitor de rentabilidad: {e}")
+    finally:
+        trigger.close()
+        if watcher:
+            watcher.stop()
 
 
 if __name__ == "__main__":
@@ -11,6 +11,7 @@ import threading
 import sys
 sys.path.append(str(Path(__file__).parent.parent.parent))
 from backend.services.database_service import get_database_service
+from backend.services.async_database_service import get_async_database_service
 from backend.services.notification_service import get_notification_service
 
 
@@ -22,6 +23,7 @@ class WebSocketService:
         self.port = port
         self.clients: Set[websockets.WebSocketServerProtocol] = set()
         self.db_service = get_database_service()
+        self.async_db = get_async_database_service()
         self.notification_service = get_notification_service()
         self.logger = logger.bind(service="WebSocketService")
         self.server = None
@@ -44,8 +46,8 @@ class WebSocketService:
         """Envía el estado inicial a un nuevo cliente"""
         try:
             # Obtener datos actuales
-            opportunities = self.db_service.get_profitable_opportunities(limit=20)
-            scrapers_status = self.db_service.get_scrapers_status()
+            opportunities = await self.async_db.get_profitable_opportunities(limit=20)
+            scrapers_status = await self.async_db.get_scrapers_status()
             
             initial_data = {
                 "type": "initial_state",
@@ -53,7 +55,7 @@ class WebSocketService:
                 "data": {
                     "opportunities": opportunities,
                     "scrapers": scrapers_status,
-                    "stats": self.get_current_stats()
+                    "stats": await self.async_db.run(self.get_current_stats)
                 }
             }
             
@@ -118,7 +120,7 @@ class WebSocketService:
             
         elif msg_type == "get_opportunities":
             # Enviar oportunidades actualizadas
-            opportunities = self.db_service.get_profitable_opportunities(
+            opportunities = await self.async_db.get_profitable_opportunities(
                 limit=data.get("limit", 50)
             )
             await websocket.send(json.dumps({
@@ -130,30 +132,14 @@ class WebSocketService:
             # Enviar estadísticas
             await websocket.send(json.dumps({
                 "type": "stats_update",
-                "data": self.get_current_stats()
+                "data": await self.async_db.run(self.get_current_stats)
             }))
     
     def get_current_stats(self) -> Dict[str, Any]:
         """Obtiene las estadísticas actuales del sistema"""
         try:
-            session = self.db_service.db_manager.get_session()
-            from backend.database.models import Item, ProfitableOpportunity
-            
-            total_items = session.query(Item).count()
-            active_opportunities = session.query(ProfitableOpportunity).filter_by(
-                is_active=True
-            ).count()
-            
-            best_opp = session.query(ProfitableOpportunity).filter_by(
-                is_active=True
-            ).order_by(ProfitableOpportunity.profitability.desc()).first()
-            
-            session.close()
-            
             return {
-                "total_items": total_items,
-                "active_opportunities": active_opportunities,
-                "best_profit_percentage": best_opp.profitability * 100 if best_opp else 0,
+                **self.db_service.get_system_stats(),
                 "last_update": datetime.now().isoformat()
             }
             
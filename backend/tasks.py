@@ -11,4 +11,5 @@ def run_scraper_task(scraper_name: str):
     scraper_class = SCRAPERS.get(scraper_name)
     if scraper_class:
         scraper = scraper_class()
-        return scraper.run_once()
\ No newline at end of file
+        # Celery necesita un resultado serializable
+        return scraper.run_once().to_dicts()
\ No newline at end of file
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# import_snapshots.py - Importación en bloque de snapshots archivados
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+sys.path.append(str(Path(__file__).parent))
+
+from backend.services.import_service import SnapshotImporter
+
+
+def main():
+    """Importa un directorio de snapshots archivados en la base de datos"""
+    parser = argparse.ArgumentParser(
+        description='Importación en bloque de snapshots archivados - BOT-vCSGO-Beta',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Ejemplos:
+  python import_snapshots.py archive/                  # Importar todo el archivo
+  python import_snapshots.py archive/ -p waxpeer empire
+  python import_snapshots.py archive/ --workers 8      # Más procesos de parseo
+
+Los archivos admitidos son <plataforma>_data[_<fecha>].json|snap o cualquier
+.json/.snap dentro de una carpeta con el nombre de la plataforma. Si se
+interrumpe, volver a ejecutar el mismo comando continúa donde se quedó.
+        """
+    )
+    parser.add_argument('directory', type=Path, help='Directorio con los snapshots')
+    parser.add_argument('-p', '--platforms', nargs='+', help='Importar solo estas plataformas')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Procesos de parseo en paralelo (por defecto, uno por CPU)')
+    parser.add_argument('--batch-files', type=int, default=20,
+                        help='Archivos por transacción (por defecto 20)')
+
+    args = parser.parse_args()
+
+    if not args.directory.is_dir():
+        print(f"❌ No existe el directorio {args.directory}")
+        sys.exit(1)
+
+    importer = SnapshotImporter(workers=args.workers, batch_files=args.batch_files)
+    started = time.perf_counter()
+    last_report = 0.0
+
+    def progress(done, total, file, items, changes):
+        nonlocal last_report
+        now = time.perf_counter()
+        if now - last_report < 1 and done < total:
+            return
+        last_report = now
+        rate = done / (now - started)
+        eta = (total - done) / rate if rate else 0
+        print(f"   [{done}/{total}] {file.platform} {file.snapshot_at:%Y-%m-%d %H:%M} "
+              f"- {items} items, {changes} cambios ({rate:.1f} archivos/s, quedan {eta:.0f}s)")
+
+    print(f"\nImportando snapshots de {args.directory}...")
+    stats = importer.run(args.directory, args.platforms, progress)
+
+    elapsed = time.perf_counter() - started
+    print(f"\n✓ {stats['files']} archivos importados en {elapsed:.1f}s "
+          f"({stats['items']} items, {stats['history']} registros de histórico)")
+    if stats['skipped']:
+        print(f"   → {stats['skipped']} archivos ya importados anteriormente")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,6 @@
 # run_profitability.py - Monitor de Rentabilidad para BOT-vCSGO-Beta
 
 import sys
-import time
 import argparse
 from pathlib import Path
 from loguru import logger
@@ -11,6 +10,8 @@ from loguru import logger
 sys.path.append(str(Path(__file__).parent))
 
 from backend.services.profitability_service import ProfitabilityService, run_profitability_monitor
+from backend.services.incremental_profitability import run_incremental_monitor, run_incremental_once
+from backend.services.arbitrage_service import ArbitrageService, run_arbitrage_monitor
 from backend.core.config_manager import get_config_manager
 
 
@@ -30,8 +31,8 @@ def main():
     parser.add_argument(
         '--interval',
         type=int,
-        default=60,
-        help='Intervalo de actualización en segundos (default: 60)'
+        default=None,
+        help='Obsoleto: se ignora, el análisis se ejecuta al publicarse cada snapshot'
     )
     
     parser.add_argument(
@@ -40,8 +41,24 @@ def main():
         help='Mostrar todas las oportunidades, no solo el top 10'
     )
     
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Recalcular solo los precios que cambian y notificar al instante'
+    )
+    
+    parser.add_argument(
+        '--arbitrage',
+        action='store_true',
+        help='Arbitraje entre todas las plataformas (no solo contra Steam)'
+    )
+    
     args = parser.parse_args()
     
+    if args.interval is not None:
+        print("⚠️  --interval está obsoleto y se ignora: el análisis se ejecuta "
+              "cada vez que un scraper publica un snapshot")
+    
     # Configurar logger
     logger.add(
         "logs/profitability_{time}.log",
@@ -56,22 +73,25 @@ def main():
     print("\nBuscando oportunidades de arbitraje...")
     print("Presiona Ctrl+C para detener\n")
     
-    # Crear servicio
-    service = ProfitabilityService()
-    
     try:
-        if args.once:
+        if args.arbitrage:
+            # Mejor compra contra mejor venta neta en todas las plataformas
+            if args.once:
+                ArbitrageService().run()
+            else:
+                run_arbitrage_monitor()
+        elif args.incremental:
+            # Motor incremental: coste proporcional a los cambios
+            if args.once:
+                run_incremental_once()
+            else:
+                run_incremental_monitor()
+        elif args.once:
             # Ejecutar una sola vez
-            service.run()
+            ProfitabilityService().run()
         else:
-            # Ejecutar continuamente
-            while True:
-                service.run()
-                
-                print(f"\nPróxima actualización en {args.interval} segundos...")
-                print("Presiona Ctrl+C para detener")
-                
-                time.sleep(args.interval)
+            # Analizar cada vez que un scraper publica un snapshot
+            run_profitability_monitor()
                 
     except KeyboardInterrupt:
         print("\n\nMonitor detenido por el usuario")
@@ -5,6 +5,7 @@ import argparse
 from pathlib import Path
 from loguru import logger
 import asyncio
+import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import time
 
@@ -12,7 +13,7 @@ import time
 sys.path.append(str(Path(__file__).parent))
 
 from backend.core.config_manager import get_config_manager
-from backend.services.profitability_service import ProfitabilityService
+from backend.services.profitability_service import ProfitabilityService, run_profitability_monitor
 # Importar todos los scrapers migrados
 from backend.scrapers.waxpeer_scraper import WaxpeerScraper
 from backend.scrapers.csdeals_scraper import CSDealsScraper
@@ -319,6 +320,45 @@ def run_profitability_analysis():
         logger.error(f"Error en análisis de rentabilidad: {e}")
         print(f"Error: {e}")
 
+def run_monitor(interval: int):
+    """
+    Ejecuta los scrapers esenciales en ciclo con análisis dirigido por eventos
+    
+    El análisis corre en un hilo suscrito a SNAPSHOT_READY: empieza en cuanto
+    un scraper guarda su snapshot (agrupando los que terminan a la vez), sin
+    esperar a que termine el ciclo completo.
+    """
+    print("\n" + "="*60)
+    print("MODO MONITOR ACTIVADO")
+    print("="*60)
+    print(f"Intervalo: {interval} segundos")
+    print("Presiona Ctrl+C para detener\n")
+    
+    stop_event = threading.Event()
+    analyzer = threading.Thread(
+        target=run_profitability_monitor,
+        kwargs={'cross_process': False, 'stop_event': stop_event},
+        name="ProfitabilityMonitor",
+        daemon=True
+    )
+    analyzer.start()
+    
+    try:
+        while True:
+            # Ejecutar scrapers esenciales (cada uno dispara el análisis al guardar)
+            for scraper_name in SCRAPER_GROUPS['essential']:
+                run_single_scraper(scraper_name, use_proxy=None, once=True)
+            
+            # Esperar intervalo
+            print(f"\nPróximo ciclo en {interval} segundos...")
+            time.sleep(interval)
+            
+    except KeyboardInterrupt:
+        print("\nMonitor detenido")
+    finally:
+        stop_event.set()
+        analyzer.join(timeout=5)
+
 def main():
     """Función principal con argumentos mejorados"""
     parser = argparse.ArgumentParser(
@@ -422,6 +462,9 @@ Ejemplos:
     if args.target == 'profitability':
         run_profitability_analysis()
         return
+    if args.target == 'monitor':
+        run_monitor(args.monitor_interval)
+        return
     if args.target == 'status':
         show_status()
     elif args.target == 'toggle-proxy':
@@ -445,35 +488,8 @@ Ejemplos:
         print(f"Scrapers disponibles: {', '.join(list(SCRAPERS.keys())[:10])}...")
         print(f"Grupos disponibles: {', '.join(SCRAPER_GROUPS.keys())}")
         print("Usa 'python run_scrapers.py status' para ver todas las opciones")
-    if args.target == 'monitor':
-        print("\n" + "="*60)
-        print("MODO MONITOR ACTIVADO")
-        print("="*60)
-        print(f"Intervalo: {args.monitor_interval} segundos")
-        print("Presiona Ctrl+C para detener\n")
-        
-        try:
-            while True:
-                # Ejecutar scrapers esenciales
-                for scraper_name in SCRAPER_GROUPS['essential']:
-                    run_single_scraper(scraper_name, use_proxy=None, once=True)
-                
-                # Esperar un poco para que se guarden los JSON
-                time.sleep(5)
-                
-                # Ejecutar análisis de rentabilidad
-                run_profitability_analysis()
-                
-                # Esperar intervalo
-                print(f"\nPróximo ciclo en {args.monitor_interval} segundos...")
-                time.sleep(args.monitor_interval)
-                
-        except KeyboardInterrupt:
-            print("\nMonitor detenido")
-        return
     if args.with_profitability:
-        print("\nEsperando 5 segundos antes de analizar rentabilidad...")
-        time.sleep(5)
+        # run_once guarda el snapshot antes de retornar: se puede analizar ya
         run_profitability_analysis()
 if __name__ == "__main__":
     main()
\ No newline at end of file
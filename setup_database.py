@@ -7,8 +7,8 @@ sys.path.append(str(Path(__file__).parent))
 
 from backend.database.models import get_database_manager, Base
 from backend.services.database_service import get_database_service
+from backend.services.import_service import SnapshotImporter
 from loguru import logger
-import json
 
 
 def setup_database():
@@ -25,8 +25,9 @@ def setup_database():
         print("\n1. Creando tablas...")
         db_manager = get_database_manager()
         
-        print("   ✓ Tabla 'items' creada")
-        print("   ✓ Tabla 'price_history' creada")
+        print("   ✓ Tablas 'items', 'item_catalog' y 'platforms' creadas")
+        print("   ✓ Histórico 'price_history' particionado por día")
+        print("   ✓ Tabla 'price_rollups' creada")
         print("   ✓ Tabla 'profitable_opportunities' creada")
         print("   ✓ Tabla 'scraper_status' creada")
         
@@ -44,22 +45,14 @@ def setup_database():
         imported = 0
         
         if json_path.exists():
-            db_service = get_database_service()
+            def progress(done, total, file, items, changes):
+                print(f"   → {file.platform}: {items} items importados")
             
-            for json_file in json_path.glob("*_data.json"):
-                platform = json_file.stem.replace("_data", "")
-                
-                try:
-                    with open(json_file, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                    
-                    if data:
-                        print(f"   → Importando {len(data)} items de {platform}...")
-                        db_service.save_scraper_data(platform, data)
-                        imported += len(data)
-                        
-                except Exception as e:
-                    print(f"   ✗ Error importando {platform}: {e}")
+            try:
+                stats = SnapshotImporter(workers=1).run(json_path, progress=progress)
+                imported = stats['items']
+            except Exception as e:
+                print(f"   ✗ Error importando snapshots: {e}")
         
         if imported > 0:
             print(f"\n   ✓ {imported} items importados exitosamente")
@@ -94,15 +87,16 @@ def check_database():
         session = db_service.db_manager.get_session()
         
         # Contar items
-        from backend.database.models import Item, PriceHistory, ProfitableOpportunity
+        from backend.database.models import Item, ProfitableOpportunity
         
         items_count = session.query(Item).count()
-        history_count = session.query(PriceHistory).count()
+        history_count = db_service.db_manager.history.count(session.connection())
+        partitions_count = len(db_service.db_manager.history.partition_days(session.connection()))
         opportunities_count = session.query(ProfitableOpportunity).filter_by(is_active=True).count()
         
         print(f"\n📊 Estadísticas:")
         print(f"   Items totales: {items_count}")
-        print(f"   Registros de histórico: {history_count}")
+        print(f"   Registros de histórico: {history_count} ({partitions_count} particiones diarias)")
         print(f"   Oportunidades activas: {opportunities_count}")
         
         # Estado de scrapers
@@ -119,12 +113,36 @@ def check_database():
         print(f"\n❌ Error verificando base de datos: {e}")
 
 
+def normalize_database():
+    """Convierte la base de datos al esquema normalizado y recupera el espacio libre"""
+    db_path = Path("data/csgo_arbitrage.db")
+    size_before = db_path.stat().st_size if db_path.exists() else 0
+    
+    # La conversión se aplica al abrir la base de datos
+    db_manager = get_database_manager()
+    
+    if db_manager.engine.dialect.name == 'sqlite':
+        from sqlalchemy import text
+        with db_manager.engine.connect() as conn:
+            conn.execution_options(isolation_level="AUTOCOMMIT").execute(text("VACUUM"))
+    
+    print("✓ Esquema normalizado")
+    if size_before and db_path.exists():
+        size_after = db_path.stat().st_size
+        print(f"   Tamaño: {size_before / 1e6:.1f} MB -> {size_after / 1e6:.1f} MB "
+              f"({(1 - size_after / size_before) * 100:.0f}% menos)")
+
+
 if __name__ == "__main__":
     import argparse
     
     parser = argparse.ArgumentParser(description='Configuración de base de datos')
     parser.add_argument('--check', action='store_true', help='Verificar estado de la base de datos')
     parser.add_argument('--cleanup', type=int, help='Limpiar datos antiguos (días)')
+    parser.add_argument('--rebuild-rollups', action='store_true',
+                        help='Recalcular los rollups OHLC desde el histórico de precios')
+    parser.add_argument('--normalize', action='store_true',
+                        help='Convertir una base de datos antigua al esquema normalizado y compactarla')
     
     args = parser.parse_args()
     
@@ -134,5 +152,11 @@ if __name__ == "__main__":
         db_service = get_database_service()
         db_service.cleanup_old_data(args.cleanup)
         print(f"✓ Limpieza completada (datos más antiguos de {args.cleanup} días)")
+    elif args.rebuild_rollups:
+        db_service = get_database_service()
+        count = db_service.rebuild_rollups()
+        print(f"✓ Rollups reconstruidos: {count}")
+    elif args.normalize:
+        normalize_database()
     else:
         setup_database()
\ No newline at end of file
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# test_arbitrage.py - ArbitrageEngine contra fuerza bruta sobre todas las parejas de plataformas
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent))
+
+# Base de datos y snapshots temporales: la prueba no toca data/ ni JSON/
+_tmp = Path(tempfile.mkdtemp(prefix='test_arbitrage_'))
+os.environ['DATABASE_URL'] = f"sqlite:///{(_tmp / 'test.db').as_posix()}"
+
+import numpy as np
+
+import backend.core.snapshot_store as snapshot_store
+from backend.core.item_registry import get_item_registry
+from backend.core.price_record import MINOR_UNITS
+from backend.core.snapshot import PriceSnapshot
+from backend.services.arbitrage_service import ArbitrageEngine, PlatformFees
+from backend.services.profitability_service import (
+    ProfitabilityService, SteamFeeCalculator, round_decimals
+)
+
+snapshot_store._snapshot_store = snapshot_store.SnapshotStore(_tmp / 'JSON')
+
+N = 3000
+PLATFORMS = ('steam',) + ProfitabilityService.PLATFORMS
+
+# Comisiones variadas: varias plataformas de venta, una sin compra
+FEES = {
+    'steam': PlatformFees(withdrawal_fee=0.0, can_buy=False, can_sell=True),
+    'waxpeer': PlatformFees(buy_fee=0.02, sell_fee=0.06, withdrawal_fee=0.01, can_sell=True),
+    'skinport': PlatformFees(sell_fee=0.12, withdrawal_fee=0.02, can_sell=True),
+    'csdeals': PlatformFees(buy_fee=0.03, sell_fee=0.02, can_sell=True),
+    'empire': PlatformFees(buy_fee=0.01),
+    'bitskins': PlatformFees(can_buy=False, sell_fee=0.05, can_sell=True),
+}
+
+
+def publish_random_snapshots(registry, rng):
+    """Guarda un snapshot por plataforma con precios alrededor de un precio base"""
+    ids = registry.get_ids([f"Item {i} | Skin (Field-Tested)" for i in range(N)])
+    base = rng.integers(30, 2_000_000, N)
+    store = snapshot_store.get_snapshot_store()
+    snapshots = {}
+    for platform in PLATFORMS:
+        listed = rng.random(N) < 0.6
+        factor = 1.15 if platform == 'steam' else rng.uniform(0.8, 1.1, listed.sum())
+        prices = (base[listed] * factor).astype(np.int64)
+        snapshots[platform] = PriceSnapshot(platform, ids[listed], prices, registry=registry)
+        store.save(snapshots[platform])
+    return ids, snapshots
+
+
+def brute_force(engine: ArbitrageEngine, ids: np.ndarray, fees) -> np.ndarray:
+    """Mejor rentabilidad por item probando todas las parejas (compra, venta) distintas"""
+    calculator = SteamFeeCalculator()
+    cost, net = [], []
+    for platform in PLATFORMS:
+        platform_fees = fees.get(platform, PlatformFees())
+        usd = engine.live.take(platform, ids) / MINOR_UNITS
+        listed = usd > 0
+
+        platform_cost = np.full(len(ids), np.inf)
+        if platform_fees.can_buy:
+            platform_cost[listed] = usd[listed] * (1 + platform_fees.buy_fee)
+        cost.append(platform_cost)
+
+        platform_net = np.full(len(ids), -np.inf)
+        if platform_fees.can_sell:
+            if platform == 'steam':
+                steam_net = np.array([calculator.subtract_fee(v) for v in usd[listed].tolist()])
+                platform_net[listed] = steam_net * (1 - platform_fees.withdrawal_fee)
+            else:
+                platform_net[listed] = platform_fees.net_sell(usd[listed])
+        net.append(platform_net)
+
+    best = np.full(len(ids), -np.inf)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        for buy in range(len(PLATFORMS)):
+            for sell in range(len(PLATFORMS)):
+                if buy == sell:
+                    continue
+                valid = np.isfinite(cost[buy]) & np.isfinite(net[sell])
+                ratio = np.where(valid, (net[sell] - cost[buy]) / cost[buy], -np.inf)
+                best = np.maximum(best, ratio)
+
+    result = np.full(len(ids), np.nan)
+    finite = np.isfinite(best)
+    result[finite] = round_decimals(best[finite], 4)
+    return result
+
+
+def check(name: str, ok: bool) -> bool:
+    print(f"{'✓' if ok else '❌'} {name}")
+    return ok
+
+
+def same(a: np.ndarray, b: np.ndarray) -> bool:
+    return np.array_equal(np.nan_to_num(a, nan=-99.0), np.nan_to_num(b, nan=-99.0))
+
+
+def main() -> bool:
+    ok = True
+    registry = get_item_registry()
+    rng = np.random.default_rng(11)
+    ids, snapshots = publish_random_snapshots(registry, rng)
+
+    engine = ArbitrageEngine(fees=FEES, min_profit=0.02)
+    engine.refresh()
+    expected = brute_force(engine, ids, FEES)
+    ok &= check(f"Mejor pareja de {N} items igual que la fuerza bruta",
+                same(engine._rentabilidad[ids], expected))
+
+    opportunities = engine.opportunities()
+    ok &= check(f"opportunities(): {len(opportunities)} items sobre el umbral, ordenados",
+                len(opportunities) == int((np.nan_to_num(expected, nan=-99.0) >= 0.02).sum())
+                and all(a.rentabilidad >= b.rentabilidad
+                        for a, b in zip(opportunities, opportunities[1:])))
+    ok &= check("Cada oportunidad compra y vende en plataformas distintas y cuadra su rentabilidad",
+                all(o.buy_platform != o.sell_platform
+                    and round((o.net_sell_price - o.buy_cost) / o.buy_cost, 4) == o.rentabilidad
+                    for o in opportunities))
+    ok &= check("No se compra donde can_buy es False ni se vende donde can_sell es False",
+                all(o.buy_platform not in ('Steam', 'Bitskins')
+                    and FEES.get(o.sell_platform.lower(), PlatformFees()).can_sell
+                    for o in opportunities))
+
+    # Solo Steam como venta: mismo resultado que el análisis contra Steam
+    steam_only = ArbitrageEngine(fees={'steam': PlatformFees(can_buy=False, can_sell=True)},
+                                 min_profit=-10)
+    steam_only.refresh()
+    service = ProfitabilityService()
+    service.thresholds = {f'profitability_{platform}': -10 for platform in service.PLATFORMS}
+    best = {}
+    for item in service.find_profitable_items():
+        best[item.name] = max(best.get(item.name, -99.0), item.rentabilidad)
+    mine = {o.name: o.rentabilidad for o in steam_only.opportunities()}
+    ok &= check("Solo Steam: igual que la mejor plataforma de find_profitable_items",
+                mine == best and len(mine) > 0)
+
+    # Cambios en una plataforma y en Steam: el recálculo incremental coincide con uno completo
+    store = snapshot_store.get_snapshot_store()
+    for platform, factor in (('waxpeer', 0.5), ('steam', 2.0)):
+        snapshot = snapshots[platform]
+        prices = snapshot.prices.copy()
+        changed = rng.choice(len(prices), 100, replace=False)
+        prices[changed] = (prices[changed] * factor).astype(np.int64)
+        store.save(PriceSnapshot(platform, snapshot.item_ids[5:], prices[5:], registry=registry))
+
+    recalculated = engine.refresh()
+    fresh = ArbitrageEngine(fees=FEES, min_profit=0.02)
+    fresh.refresh()
+    ok &= check(f"Recálculo incremental ({recalculated} items) igual que uno completo",
+                [o.to_dict() for o in engine.opportunities()]
+                == [o.to_dict() for o in fresh.opportunities()]
+                and same(engine._rentabilidad[ids], brute_force(fresh, ids, FEES)))
+    return bool(ok)
+
+
+if __name__ == "__main__":
+    try:
+        if main():
+            print("\n✅ Arbitraje entre plataformas correcto!")
+            sys.exit(0)
+        print("\n❌ Hay pruebas de arbitraje que fallan")
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+    sys.exit(1)
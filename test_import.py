@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# test_import.py - Importación de snapshots archivados: interrupción, reanudación y equivalencia con la ingesta en vivo
+
+import json
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent))
+
+# Base de datos y snapshots temporales: la prueba no toca data/ ni JSON/
+_tmp = Path(tempfile.mkdtemp(prefix='test_import_'))
+os.environ['DATABASE_URL'] = f"sqlite:///{(_tmp / 'test.db').as_posix()}"
+
+import numpy as np
+from sqlalchemy import select
+
+import backend.services.database_service as database_service
+from backend.core.item_registry import get_item_registry
+from backend.core.price_record import from_minor
+from backend.core.snapshot import PriceSnapshot, INVALID_PRICE
+from backend.core.snapshot_store import SnapshotStore
+from backend.database.models import Item, PriceRollup, SnapshotImport
+from backend.services.database_service import get_database_service
+from backend.services.import_service import SnapshotImporter, parse_snapshot_file
+
+N = 300
+FILES = 6
+BATCH_FILES = 2
+
+# Un archivo cada 2 minutos: los intervalos de 5 minutos y la hora quedan
+# repartidos entre lotes distintos
+START = datetime(2026, 3, 10, 11, 57, 0)
+STEP = timedelta(minutes=2)
+
+# Plataformas del archivo y su copia alimentada con save_scraper_data
+JSON_PLATFORM = 'waxpeer'
+SNAP_PLATFORM = 'skinport'
+LIVE_SUFFIX = '_live'
+
+
+class FrozenDatetime(datetime):
+    """datetime.utcnow() fijo: la ingesta en vivo usa la fecha de cada archivo"""
+    frozen = None
+
+    @classmethod
+    def utcnow(cls):
+        return cls.frozen
+
+
+def check(name: str, ok: bool) -> bool:
+    print(f"{'✓' if ok else '❌'} {name}")
+    return ok
+
+
+def archive_snapshots(directory: Path, names, rng):
+    """
+    Snapshots archivados de dos plataformas (JSON y .snap v2)
+
+    Entre archivos cambian precios, desaparecen items que luego vuelven con
+    el mismo precio y hay duplicados, uno de ellos sin precio válido.
+    """
+    ids = get_item_registry().get_ids(names)
+    writer = SnapshotStore(_tmp / 'store')
+    for platform in (JSON_PLATFORM, SNAP_PLATFORM):
+        prices = rng.integers(10, 2_000_000, N)
+        for index in range(FILES):
+            moved = rng.choice(N, 30, replace=False)
+            prices[moved] = rng.integers(10, 2_000_000, 30)
+            listed = np.flatnonzero(rng.random(N) > 0.1)
+
+            # Duplicados: uno más caro y uno sin precio válido
+            item_prices = prices[listed]
+            duplicates = listed[:3]
+            listed = np.concatenate((listed, duplicates))
+            item_prices = np.concatenate((item_prices, prices[duplicates] + 5))
+            item_prices[-1] = INVALID_PRICE
+
+            stamp = f"{START + STEP * index:%Y%m%d_%H%M%S}"
+            if platform == JSON_PLATFORM:
+                data = [
+                    {'Item': names[i],
+                     'Price': 'n/a' if price == INVALID_PRICE else from_minor(price),
+                     'URL': f"https://{platform}/{i}"}
+                    for i, price in zip(listed.tolist(), item_prices.tolist())
+                ]
+                path = directory / f"{platform}_data_{stamp}.json"
+                path.write_text(json.dumps(data), encoding='utf-8')
+            else:
+                snapshot = PriceSnapshot(platform, ids[listed], item_prices,
+                                         (START + STEP * index - datetime(1970, 1, 1)).total_seconds())
+                writer.write_binary(snapshot, directory / f"{platform}_data_{stamp}.snap")
+
+
+def ingest_live(importer: SnapshotImporter, directory: Path):
+    """Los mismos archivos, uno a uno, por save_scraper_data con la fecha de cada archivo"""
+    service = get_database_service()
+    original = database_service.datetime
+    database_service.datetime = FrozenDatetime
+    try:
+        for file in importer.scan(directory):
+            FrozenDatetime.frozen = file.snapshot_at
+            snapshot = importer._snapshot(file, parse_snapshot_file(str(file.path), file.platform))
+            service.save_scraper_data(file.platform + LIVE_SUFFIX, snapshot)
+    finally:
+        database_service.datetime = original
+
+
+def stored(db_manager, platform: str):
+    """(histórico, rollups, items) de una plataforma, sin su platform_id"""
+    platform_id = db_manager.platform_id(platform)
+    rollups, items = PriceRollup.__table__, Item.__table__
+    with db_manager.engine.connect() as conn:
+        history = sorted((item_id, ts, price) for item_id, _, ts, price
+                         in db_manager.history.rows(conn, platform_id=platform_id))
+        rollup_rows = {(300, item_id, bucket): tuple(ohlc) for item_id, _, bucket, *ohlc
+                       in db_manager.rollups_5m.rows(conn, platform_id=platform_id)}
+        rollup_rows.update({
+            (resolution, item_id, bucket): tuple(ohlc)
+            for resolution, item_id, bucket, *ohlc in conn.execute(select(
+                rollups.c.resolution, rollups.c.item_id, rollups.c.bucket,
+                rollups.c.open, rollups.c.high, rollups.c.low, rollups.c.close, rollups.c.count
+            ).where(rollups.c.platform_id == platform_id))
+        })
+        item_rows = {
+            item_id: (price, url, last_updated)
+            for item_id, price, url, last_updated in conn.execute(
+                select(items.c.item_id, items.c.price_minor, items.c.url, items.c.last_updated)
+                .where(items.c.platform_id == platform_id)
+            )
+        }
+    return history, rollup_rows, item_rows
+
+
+def imported_count(db_manager) -> int:
+    with db_manager.engine.connect() as conn:
+        return len(conn.execute(select(SnapshotImport.path)).all())
+
+
+def main() -> bool:
+    ok = True
+    rng = np.random.default_rng(44)
+    directory = _tmp / 'archive'
+    directory.mkdir()
+    names = [f"Item {i} | Skin (Field-Tested)" for i in range(N)]
+    archive_snapshots(directory, names, rng)
+
+    # Primera ejecución interrumpida tras escribir el primer lote
+    importer = SnapshotImporter(workers=1, batch_files=BATCH_FILES)
+    db_manager = importer.db_manager
+    flush = importer._flush
+    flushed = []
+
+    def interrupted_flush(platform, batch):
+        if flushed:
+            raise RuntimeError("importación interrumpida")
+        flushed.append(platform)
+        return flush(platform, batch)
+
+    importer._flush = interrupted_flush
+    try:
+        importer.run(directory)
+        interrupted = False
+    except RuntimeError:
+        interrupted = True
+    ok &= check("La importación se interrumpe tras el primer lote",
+                interrupted and imported_count(db_manager) == BATCH_FILES)
+
+    # Reanudar con varios procesos: se continúa desde el último archivo importado
+    stats = SnapshotImporter(workers=2, batch_files=BATCH_FILES).run(directory)
+    ok &= check(f"Reanudar importa los {stats['files']} archivos restantes",
+                stats['skipped'] == BATCH_FILES and stats['files'] == 2 * FILES - BATCH_FILES)
+    ok &= check("Una tercera ejecución no importa nada",
+                SnapshotImporter(workers=1).run(directory)['files'] == 0)
+
+    # Referencia: los mismos archivos por la ingesta en vivo
+    ingest_live(importer, directory)
+    for platform in (JSON_PLATFORM, SNAP_PLATFORM):
+        history, rollups, items = stored(db_manager, platform)
+        live_history, live_rollups, live_items = stored(db_manager, platform + LIVE_SUFFIX)
+        ok &= check(f"{platform}: histórico igual que con save_scraper_data ({len(history)} precios)",
+                    history == live_history and len(history) > N)
+        ok &= check(f"{platform}: rollups iguales ({len(rollups)} intervalos)",
+                    rollups == live_rollups)
+        ok &= check(f"{platform}: items con el mismo precio, URL y fecha", items == live_items)
+    return bool(ok)
+
+
+if __name__ == "__main__":
+    try:
+        if main():
+            print("\n✅ Importación de snapshots correcta!")
+            sys.exit(0)
+        print("\n❌ Hay pruebas de importación que fallan")
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+    sys.exit(1)
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# test_incremental.py - Rentabilidad incremental (LivePrices + ranking) contra el análisis completo
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent))
+
+# Base de datos y snapshots temporales: la prueba no toca data/ ni JSON/
+_tmp = Path(tempfile.mkdtemp(prefix='test_incremental_'))
+os.environ['DATABASE_URL'] = f"sqlite:///{(_tmp / 'test.db').as_posix()}"
+
+import numpy as np
+
+import backend.core.snapshot_store as snapshot_store
+from backend.core.event_bus import EventBus, SNAPSHOT_DIFF
+from backend.core.item_registry import get_item_registry
+from backend.core.snapshot import PriceSnapshot, INVALID_PRICE
+from backend.core.snapshot_diff import diff_snapshots
+from backend.services.incremental_profitability import IncrementalProfitability
+from backend.services.profitability_service import ProfitabilityService
+
+snapshot_store._snapshot_store = snapshot_store.SnapshotStore(_tmp / 'JSON')
+
+N = 1500
+THRESHOLDS = {'waxpeer': 0.05, 'skinport': 0.10, 'csdeals': 0.0, 'empire': 0.20}
+
+
+def check(name: str, ok: bool) -> bool:
+    print(f"{'✓' if ok else '❌'} {name}")
+    return ok
+
+
+def new_service() -> ProfitabilityService:
+    service = ProfitabilityService()
+    service.thresholds = {f'profitability_{platform}': value for platform, value in THRESHOLDS.items()}
+    return service
+
+
+class Market:
+    """Precios densos por plataforma (0 = sin publicar) y sus snapshots guardados"""
+
+    def __init__(self, ids: np.ndarray, bus: EventBus):
+        self.ids = ids
+        self.bus = bus
+        self.store = snapshot_store.get_snapshot_store()
+        self.saved = {}
+
+    def snapshot(self, platform: str, prices: np.ndarray) -> PriceSnapshot:
+        # Filas ordenadas por item_id: mismo orden de empate que el ranking
+        listed = np.flatnonzero(prices != 0)
+        return PriceSnapshot(platform, self.ids[listed], prices[listed])
+
+    def save(self, platform: str, prices: np.ndarray) -> PriceSnapshot:
+        """Guarda un snapshot como un scraper de otro proceso (sin diff en el bus)"""
+        snapshot = self.snapshot(platform, prices)
+        self.store.save(snapshot)
+        self.saved[platform] = snapshot
+        return snapshot
+
+    def publish(self, old: PriceSnapshot, new: PriceSnapshot):
+        self.bus.publish(SNAPSHOT_DIFF, diff_snapshots(old, new))
+
+
+def same_as_full(engine: IncrementalProfitability) -> bool:
+    """top() idéntico (orden, precios y rentabilidad) a find_profitable_items"""
+    engine.refresh()
+    expected = [item.to_dict() for item in new_service().find_profitable_items()]
+    return [item.to_dict() for item in engine.top()] == expected and len(expected) > 0
+
+
+def ranked(engine: IncrementalProfitability, platform: str) -> dict:
+    """Entradas del ranking de una plataforma: {item_id: rentabilidad}"""
+    index = engine.platforms.index(platform)
+    return {item_id: -key[0] for (i, item_id), key in engine._entries.items() if i == index}
+
+
+def main() -> bool:
+    ok = True
+    rng = np.random.default_rng(48)
+    ids = get_item_registry().get_ids([f"Item {i} | Skin (Field-Tested)" for i in range(N)])
+    assert np.all(np.diff(ids) > 0)
+
+    bus = EventBus()
+    market = Market(ids, bus)
+
+    # Estado inicial: Steam ~25% por encima, plataformas alrededor del precio base
+    base = rng.integers(50, 2_000_000, N)
+    steam = (base * 1.25).astype(np.int64)
+    steam[rng.random(N) < 0.1] = 0
+    prices = {}
+    for platform in THRESHOLDS:
+        platform_prices = (base * rng.uniform(0.8, 1.15, N)).astype(np.int64)
+        platform_prices[rng.random(N) < 0.3] = 0
+        platform_prices[rng.choice(N, 5, replace=False)] = INVALID_PRICE
+        prices[platform] = platform_prices
+        market.save(platform, platform_prices)
+    market.save('steam', steam)
+
+    engine = IncrementalProfitability(new_service(), event_bus=bus)
+    engine.start()
+    ok &= check(f"Carga inicial: {len(new_service().find_profitable_items())} oportunidades iguales",
+                same_as_full(engine))
+
+    # Diff publicado en el mismo proceso, en orden
+    old = market.saved['waxpeer']
+    changed = rng.choice(N, 200, replace=False)
+    prices['waxpeer'][changed] = (base[changed] * rng.uniform(0.7, 1.3, 200)).astype(np.int64)
+    prices['waxpeer'][changed[:20]] = 0
+    market.publish(old, market.save('waxpeer', prices['waxpeer']))
+    ok &= check("Diff aplicado en orden igual que el análisis completo", same_as_full(engine))
+
+    # Diffs fuera de orden: el segundo llega antes que el primero y _sync debe recargar.
+    # El segundo deshace la mitad del primero: aplicado después, el primero cuadra
+    # con el estado en memoria aunque el resultado ya no es el snapshot publicado
+    s0 = market.saved['skinport']
+    first = prices['skinport'].copy()
+    moved = rng.choice(np.flatnonzero(first > 0), 150, replace=False)
+    first[moved] = (base[moved] * rng.uniform(0.7, 1.3, 150)).astype(np.int64)
+    s1 = market.save('skinport', first)
+    second = first.copy()
+    second[moved[:75]] = prices['skinport'][moved[:75]]
+    s2 = market.save('skinport', second)
+    prices['skinport'] = second
+    market.publish(s1, s2)
+    market.publish(s0, s1)
+    ok &= check("Diffs fuera de orden: se recarga el snapshot y coincide", same_as_full(engine))
+
+    # Un diff de un snapshot que no llegó a guardarse y después otro proceso guarda uno nuevo
+    s3 = market.snapshot('csdeals', prices['csdeals'] // 2)
+    market.publish(market.saved['csdeals'], s3)
+    prices['csdeals'] = prices['csdeals'] * 2 // 3
+    market.save('csdeals', prices['csdeals'])
+    ok &= check("Diff sin guardar seguido de una versión nueva en disco: coincide", same_as_full(engine))
+
+    # Steam cambia: afecta a esos items en todas las plataformas
+    before = {platform: ranked(engine, platform) for platform in THRESHOLDS}
+    moved = rng.choice(np.flatnonzero(steam > 0), 300, replace=False)
+    steam[moved] = (steam[moved] * rng.uniform(0.6, 1.4, 300)).astype(np.int64)
+    market.save('steam', steam)
+    ok &= check("Cambio en Steam: todas las plataformas coinciden", same_as_full(engine))
+    after = {platform: ranked(engine, platform) for platform in THRESHOLDS}
+    ok &= check("El cambio en Steam recalcula entradas de cada plataforma",
+                all(before[platform] != after[platform] for platform in THRESHOLDS))
+
+    # Entradas que salen del ranking: bajan de umbral o dejan de publicarse
+    leaving = sorted(ranked(engine, 'empire'))[:40]
+    positions = np.searchsorted(ids, leaving)
+    prices['empire'][positions[:20]] = steam[positions[:20]] * 2
+    prices['empire'][positions[20:]] = 0
+    old = market.saved['empire']
+    market.publish(old, market.save('empire', prices['empire']))
+    ok &= check("Entradas que salen del ranking: coincide", same_as_full(engine))
+    ok &= check(f"Las {len(leaving)} entradas de empire salen del ranking",
+                len(leaving) == 40 and not ranked(engine, 'empire').keys() & set(leaving))
+
+    # Steam deja de publicar: el ranking se vacía
+    market.store.save(PriceSnapshot.empty('steam'))
+    engine.refresh()
+    ok &= check("Sin precios de Steam el ranking se vacía", len(engine) == 0)
+    engine.stop()
+    return bool(ok)
+
+
+if __name__ == "__main__":
+    try:
+        if main():
+            print("\n✅ Rentabilidad incremental idéntica al análisis completo!")
+            sys.exit(0)
+        print("\n❌ Hay pruebas de rentabilidad incremental que fallan")
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+    sys.exit(1)
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+# test_normalize.py - Migración del esquema antiguo (nombres como texto) al normalizado
+
+import os
+import sys
+import sqlite3
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent))
+
+# Base de datos temporal: la prueba no toca data/
+_tmp = Path(tempfile.mkdtemp(prefix='test_normalize_'))
+DB_PATH = _tmp / 'legacy.db'
+os.environ['DATABASE_URL'] = f"sqlite:///{DB_PATH.as_posix()}"
+
+from sqlalchemy import inspect, select
+
+from backend.database.models import DatabaseManager, ItemCatalog, Platform, Item, PriceRollup
+from backend.database.normalize import normalize_schema
+
+NAMES = [
+    'AK-47 | Redline (Field-Tested)',
+    '★ Karambit | Doppler (Factory New)',
+    'StatTrak™ M4A1-S | Hyper Beast (Minimal Wear)',
+    'Sticker | Crown (Foil)',
+]
+PLATFORMS = ('waxpeer', 'skinport')
+NOW = datetime(2026, 3, 10, 12, 0, 0)
+
+# Variante antigua de NAMES[2]: se canonicaliza y se fusiona con él
+VARIANT = 'StatTrak(TM)  M4A1-S | Hyper Beast (minimal wear)'
+
+# item_catalog ya existía (con estos ids) cuando se guardaban los rollups antiguos
+CATALOG_IDS = {name: 100 + index for index, name in enumerate(NAMES)}
+
+
+def create_legacy_database():
+    """
+    Base de datos con el esquema anterior
+
+    items y price_history guardan nombre y plataforma como texto; además hay
+    una partición diaria del formato intermedio (también con texto) y
+    rollups con plataforma como texto y precios en dólares. Retorna lo que
+    debería quedar tras la migración.
+    """
+    conn = sqlite3.connect(DB_PATH)
+    conn.executescript("""
+        CREATE TABLE items (
+            id INTEGER PRIMARY KEY, item_id INTEGER, name VARCHAR NOT NULL,
+            platform VARCHAR NOT NULL, price FLOAT NOT NULL, steam_price FLOAT,
+            profitability FLOAT, url VARCHAR, last_updated DATETIME, is_available BOOLEAN,
+            CONSTRAINT _name_platform_uc UNIQUE (name, platform)
+        );
+        CREATE TABLE price_history (
+            id INTEGER PRIMARY KEY, item_id INTEGER, item_name VARCHAR NOT NULL,
+            platform VARCHAR NOT NULL, price FLOAT NOT NULL, timestamp DATETIME
+        );
+        CREATE TABLE price_history_20260301 (
+            item_id INTEGER NOT NULL, item_name VARCHAR NOT NULL, platform VARCHAR NOT NULL,
+            price FLOAT NOT NULL, timestamp DATETIME NOT NULL
+        );
+        CREATE TABLE item_catalog (id INTEGER PRIMARY KEY, name VARCHAR NOT NULL UNIQUE);
+        CREATE TABLE price_rollups (
+            resolution INTEGER NOT NULL, item_id INTEGER NOT NULL, platform VARCHAR NOT NULL,
+            bucket DATETIME NOT NULL, open FLOAT NOT NULL, high FLOAT NOT NULL,
+            low FLOAT NOT NULL, close FLOAT NOT NULL, count INTEGER NOT NULL,
+            PRIMARY KEY (resolution, item_id, platform, bucket)
+        );
+    """)
+    conn.executemany("INSERT INTO item_catalog (id, name) VALUES (?, ?)",
+                     [(item_id, name) for name, item_id in CATALOG_IDS.items()])
+
+    expected_items = {}
+    expected_history = []
+    expected_rollups = []
+    for index, name in enumerate(NAMES):
+        for platform in PLATFORMS:
+            # Un item sin precio: no se migra
+            price = 0.0 if (index, platform) == (3, 'skinport') else round(1.5 + index * 10.37, 2)
+            conn.execute(
+                "INSERT INTO items (item_id, name, platform, price, url, last_updated, is_available) "
+                "VALUES (?, ?, ?, ?, ?, ?, 1)",
+                (index, name, platform, price, f"https://{platform}/{index}", NOW.isoformat(sep=' '))
+            )
+            if price > 0:
+                expected_items[(name, platform)] = (round(price * 1000), f"https://{platform}/{index}")
+
+            # Tres días de histórico, con un registro a precio 0 que se descarta
+            for hours in (0, 20, 30, 50):
+                timestamp = NOW - timedelta(hours=hours)
+                row_price = 0.0 if hours == 30 and index == 0 else round(price + hours / 100, 3)
+                conn.execute(
+                    "INSERT INTO price_history (item_id, item_name, platform, price, timestamp) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (index, name, platform, row_price, timestamp.isoformat(sep=' '))
+                )
+                if row_price > 0:
+                    expected_history.append((name, platform, timestamp, round(row_price * 1000)))
+
+            for resolution in (300, 3600):
+                conn.execute(
+                    "INSERT INTO price_rollups VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (resolution, CATALOG_IDS[name], platform, NOW.isoformat(sep=' '),
+                     1.1, 2.345, 0.5, 1.999, 3)
+                )
+                expected_rollups.append(
+                    (resolution, name, platform, NOW, 1100, 2345, 500, 1999, 3)
+                )
+
+            partition_ts = datetime(2026, 3, 1, 8, 30)
+            conn.execute(
+                "INSERT INTO price_history_20260301 (item_id, item_name, platform, price, timestamp) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (index, name, platform, 3.25, partition_ts.isoformat(sep=' '))
+            )
+            expected_history.append((name, platform, partition_ts, 3250))
+
+    # Variante con otro nombre del mismo item: su histórico se fusiona y en
+    # items gana la fila más reciente (la del nombre canónico)
+    older = NOW - timedelta(days=1)
+    conn.execute(
+        "INSERT INTO items (item_id, name, platform, price, url, last_updated, is_available) "
+        "VALUES (?, ?, ?, ?, ?, ?, 1)",
+        (99, VARIANT, 'waxpeer', 7.77, "https://waxpeer/variant", older.isoformat(sep=' '))
+    )
+    conn.execute(
+        "INSERT INTO price_history (item_id, item_name, platform, price, timestamp) "
+        "VALUES (?, ?, ?, ?, ?)",
+        (99, VARIANT, 'waxpeer', 7.77, older.isoformat(sep=' '))
+    )
+    expected_history.append((NAMES[2], 'waxpeer', older, 7770))
+
+    conn.commit()
+    conn.close()
+    return expected_items, expected_history, expected_rollups
+
+
+def check(name: str, ok: bool) -> bool:
+    print(f"{'✓' if ok else '❌'} {name}")
+    return ok
+
+
+def main() -> bool:
+    ok = True
+    expected_items, expected_history, expected_rollups = create_legacy_database()
+
+    # La migración se aplica al abrir la base de datos
+    db_manager = DatabaseManager(os.environ['DATABASE_URL'])
+    catalog, platforms, items = ItemCatalog.__table__, Platform.__table__, Item.__table__
+    rollups = PriceRollup.__table__
+
+    with db_manager.engine.connect() as conn:
+        names = dict(conn.execute(select(catalog.c.id, catalog.c.name)).all())
+        platform_names = dict(conn.execute(select(platforms.c.id, platforms.c.name)).all())
+
+        ok &= check("Las variantes de nombre se canonicalizan y no crean items nuevos",
+                    sorted(names.values()) == sorted(NAMES)
+                    and all(names[item_id] == name for name, item_id in CATALOG_IDS.items()))
+
+        migrated_items = {
+            (names[item_id], platform_names[platform_id]): (price_minor, url)
+            for item_id, platform_id, price_minor, url in conn.execute(
+                select(items.c.item_id, items.c.platform_id, items.c.price_minor, items.c.url)
+            )
+        }
+        ok &= check(f"items: {len(migrated_items)} filas con precio en milésimas y URL",
+                    migrated_items == expected_items)
+
+        migrated_history = sorted(
+            (names[item_id], platform_names[platform_id], ts, price_minor)
+            for item_id, platform_id, ts, price_minor in db_manager.history.rows(conn)
+        )
+        ok &= check(f"price_history: {len(migrated_history)} registros repartidos por día",
+                    migrated_history == sorted(expected_history))
+
+        days = [f"{day:%Y%m%d}" for day in db_manager.history.partition_days(conn)]
+        ok &= check("Solo se crean particiones para los días con datos",
+                    days == ['20260301', '20260308', '20260309', '20260310'])
+
+        # Los de 5 minutos pasan a su partición diaria; el resto queda en price_rollups
+        rows = [(300, *row) for row in db_manager.rollups_5m.rows(conn)] + conn.execute(select(
+            rollups.c.resolution, rollups.c.item_id, rollups.c.platform_id, rollups.c.bucket,
+            rollups.c.open, rollups.c.high, rollups.c.low, rollups.c.close, rollups.c.count
+        )).all()
+        migrated_rollups = sorted(
+            (resolution, names[item_id], platform_names[platform_id], bucket, o, h, l, c, n)
+            for resolution, item_id, platform_id, bucket, o, h, l, c, n in rows
+        )
+        ok &= check(f"price_rollups: {len(migrated_rollups)} rollups con platform_id y OHLC en milésimas",
+                    migrated_rollups == sorted(expected_rollups))
+        ok &= check("Los rollups de 5 minutos quedan en particiones diarias, no en price_rollups",
+                    db_manager.rollups_5m.partition_days(conn) == [NOW.date()]
+                    and 300 not in conn.execute(select(rollups.c.resolution).distinct()).scalars().all())
+
+    tables = set(inspect(db_manager.engine).get_table_names())
+    ok &= check("Las tablas antiguas se eliminan",
+                not tables & {'items_legacy', 'price_history', 'price_history_20260301_old',
+                              'price_rollups_legacy', 'legacy_item_names'})
+    ok &= check("Las columnas de texto desaparecen de price_rollups",
+                'platform' not in {c['name'] for c in inspect(db_manager.engine).get_columns('price_rollups')})
+    ok &= check("Las columnas de texto desaparecen de items",
+                'name' not in {c['name'] for c in inspect(db_manager.engine).get_columns('items')})
+
+    # Volver a abrirla no repite la conversión
+    ok &= check("Una segunda ejecución no convierte nada",
+                normalize_schema(db_manager) == {'items': 0, 'history': 0, 'rollups': 0})
+    db_manager.close()
+
+    reopened = DatabaseManager(os.environ['DATABASE_URL'])
+    with reopened.engine.connect() as conn:
+        ok &= check("Reabrir la base de datos no duplica filas",
+                    reopened.history.count(conn) == len(expected_history))
+    reopened.close()
+    return bool(ok)
+
+
+if __name__ == "__main__":
+    try:
+        if main():
+            print("\n✅ Migración al esquema normalizado correcta!")
+            sys.exit(0)
+        print("\n❌ Hay pruebas de migración que fallan")
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+    sys.exit(1)
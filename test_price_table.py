@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# test_price_table.py - Tabla de precios compartida: publish, lecturas con seqlock y restore
+
+import os
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent))
+
+# Base de datos y snapshots temporales: la prueba no toca data/ ni JSON/
+_tmp = Path(tempfile.mkdtemp(prefix='test_price_table_'))
+os.environ['DATABASE_URL'] = f"sqlite:///{(_tmp / 'test.db').as_posix()}"
+
+import numpy as np
+
+import backend.core.price_table as price_table
+from backend.core.item_registry import get_item_registry
+from backend.core.price_table import SharedPriceTable
+from backend.core.snapshot import PriceSnapshot, INVALID_PRICE
+from backend.core.snapshot_store import SnapshotStore
+
+CAPACITY = 5000
+
+
+def check(name: str, ok: bool) -> bool:
+    print(f"{'✓' if ok else '❌'} {name}")
+    return ok
+
+
+def new_table() -> SharedPriceTable:
+    return SharedPriceTable(f"test_prices_{uuid.uuid4().hex[:8]}", capacity=CAPACITY)
+
+
+def random_snapshot(platform: str, ids: np.ndarray, rng, timestamp: float) -> PriceSnapshot:
+    listed = rng.random(len(ids)) < 0.7
+    prices = rng.integers(10, 2_000_000, int(listed.sum()))
+    prices[:3] = INVALID_PRICE  # sin precio válido: la tabla no los guarda
+    return PriceSnapshot(platform, ids[listed], prices, timestamp)
+
+
+def expected_row(snapshot: PriceSnapshot) -> np.ndarray:
+    row = np.zeros(CAPACITY, dtype=np.int64)
+    valid = snapshot.prices > 0
+    row[snapshot.item_ids[valid]] = snapshot.prices[valid]
+    return row
+
+
+def test_publish_and_read(ids: np.ndarray, rng) -> bool:
+    ok = True
+    table = new_table()
+    try:
+        snapshot = random_snapshot('waxpeer', ids, rng, 1_700_000_000.5)
+        table.publish(snapshot)
+
+        row, timestamp = table.read_platform('waxpeer')
+        ok &= check("read_platform devuelve la fila publicada y su timestamp",
+                    np.array_equal(row, expected_row(snapshot)) and timestamp == snapshot.timestamp)
+
+        item_id = int(snapshot.item_ids[-1])
+        ok &= check("get_price / get_prices leen el precio del item",
+                    table.get_price(item_id, 'waxpeer') == int(snapshot.prices[-1])
+                    and table.get_prices(item_id) == {'waxpeer': int(snapshot.prices[-1])})
+        ok &= check("Versión par y distinta de 0 tras publicar", table.version('waxpeer') == 2)
+
+        # Lecturas concurrentes con publicaciones: nunca una fila a medias
+        snapshots = [random_snapshot('waxpeer', ids, rng, float(i)) for i in range(4)]
+        rows = {snap.timestamp: expected_row(snap) for snap in snapshots}
+        stop = threading.Event()
+
+        def writer():
+            while not stop.is_set():
+                for snap in snapshots:
+                    table.publish(snap)
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        consistent = True
+        try:
+            for _ in range(300):
+                row, timestamp = table.read_platform('waxpeer')
+                consistent &= np.array_equal(row, rows[timestamp])
+        finally:
+            stop.set()
+            thread.join()
+        ok &= check("Lecturas durante publicaciones continuas siempre consistentes", consistent)
+
+        # Un escritor que no termina: la lectura acaba en TimeoutError (el endpoint responde 503)
+        index = table.platform_index['waxpeer']
+        table._seq[index] += 1
+        started = time.monotonic()
+        try:
+            table.get_prices(item_id)
+            timed_out = False
+        except TimeoutError:
+            timed_out = True
+        ok &= check(f"Escritor bloqueado: TimeoutError en {time.monotonic() - started:.2f}s",
+                    timed_out and time.monotonic() - started < 5)
+
+        # publish() espera _WRITER_WAIT y reinicia el seqlock del escritor interrumpido
+        table.publish(snapshots[0])
+        ok &= check("publish() recupera la fila tras un escritor interrumpido",
+                    table.version('waxpeer') % 2 == 0
+                    and np.array_equal(table.read_platform('waxpeer')[0], rows[snapshots[0].timestamp]))
+    finally:
+        table.close()
+        table.unlink()
+    return ok
+
+
+def test_restore(ids: np.ndarray, rng) -> bool:
+    ok = True
+    store = SnapshotStore(_tmp / 'snapshots')
+    on_disk = {
+        platform: random_snapshot(platform, ids, rng, 1_700_000_100.0)
+        for platform in ('steam', 'waxpeer', 'skinport')
+    }
+    for snapshot in on_disk.values():
+        store.save(snapshot)
+
+    table = new_table()
+    try:
+        # waxpeer ya publicó antes de restaurar: su fila no se toca
+        published = random_snapshot('waxpeer', ids, rng, 1_700_000_200.0)
+        table.publish(published)
+
+        restored = table.restore(store)
+        ok &= check("restore() rellena solo las filas sin publicar", restored == 2)
+        ok &= check("Filas restauradas iguales a los snapshots en disco",
+                    all(np.array_equal(table.read_platform(p)[0], expected_row(on_disk[p]))
+                        for p in ('steam', 'skinport')))
+        ok &= check("La fila publicada por el scraper se conserva",
+                    np.array_equal(table.read_platform('waxpeer')[0], expected_row(published)))
+        ok &= check("Un segundo restore() no cambia nada", table.restore(store) == 0)
+
+        # Un scraper publica mientras otro proceso tiene la fila en escritura (restore):
+        # publish() espera a que termine en lugar de escribir a la vez
+        index = table.platform_index['csdeals']
+        fresh = random_snapshot('csdeals', ids, rng, 1_700_000_300.0)
+        table._seq[index] += 1  # escritura en curso
+
+        def finish_restore():
+            time.sleep(0.1)
+            table._prices[index][:] = 7
+            table._seq[index] += 1
+
+        thread = threading.Thread(target=finish_restore)
+        thread.start()
+        table.publish(fresh)
+        thread.join()
+        ok &= check("publish() espera a la escritura en curso y su fila gana",
+                    table.version('csdeals') == 4
+                    and np.array_equal(table.read_platform('csdeals')[0], expected_row(fresh)))
+    finally:
+        table.close()
+        table.unlink()
+    return ok
+
+
+def main() -> bool:
+    registry = get_item_registry()
+    rng = np.random.default_rng(3)
+    ids = registry.get_ids([f"Item {i} | Skin (Field-Tested)" for i in range(2000)])
+
+    # Esperas cortas para que la prueba no tarde
+    price_table._WRITER_WAIT = 0.2
+
+    ok = test_publish_and_read(ids, rng)
+    ok &= test_restore(ids, rng)
+    return bool(ok)
+
+
+if __name__ == "__main__":
+    try:
+        if main():
+            print("\n✅ Tabla de precios compartida correcta!")
+            sys.exit(0)
+        print("\n❌ Hay pruebas de la tabla compartida que fallan")
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+    sys.exit(1)
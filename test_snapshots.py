@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# test_snapshots.py - Ida y vuelta de snapshots: binario .snap, manifiesto, diffs y DeltaLog
+
+import os
+import struct
+import sys
+import tempfile
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent))
+
+# Base de datos y archivos temporales: la prueba no toca data/ ni JSON/
+_tmp = Path(tempfile.mkdtemp(prefix='test_snapshots_'))
+os.environ['DATABASE_URL'] = f"sqlite:///{(_tmp / 'test.db').as_posix()}"
+
+import numpy as np
+
+from backend.core.item_registry import ItemRegistry
+from backend.core.price_record import make_record
+from backend.core.snapshot import PriceSnapshot, INVALID_PRICE
+from backend.core.snapshot_store import (
+    SnapshotStore, FORMAT_BINARY, FORMAT_JSON, read_binary_columns
+)
+from backend.core.snapshot_diff import DeltaLog, diff_snapshots, price_by_item
+
+NAMES = [
+    'AK-47 | Redline (Field-Tested)',
+    '★ Karambit | Doppler (Factory New)',
+    'StatTrak™ M4A1-S | Hyper Beast (Minimal Wear)',
+    'Sticker | Crown (Foil)',
+    'Souvenir AWP | Dragon Lore (Battle-Scarred)',
+]
+
+
+def build_snapshot(platform: str, prices, timestamp: float) -> PriceSnapshot:
+    """Snapshot con URLs en algunos items y un precio sin parsear"""
+    records = [
+        make_record(name, platform, price=price,
+                    url=f"https://example.com/{index}" if index % 2 == 0 else None,
+                    timestamp=timestamp)
+        for index, (name, price) in enumerate(zip(NAMES, prices))
+    ]
+    return PriceSnapshot.from_records(platform, records, timestamp)
+
+
+def same_snapshot(a: PriceSnapshot, b: PriceSnapshot) -> bool:
+    return (a.names == b.names
+            and np.array_equal(a.prices, b.prices)
+            and [a.url(i) for i in range(len(a))] == [b.url(i) for i in range(len(b))])
+
+
+def check(name: str, ok: bool) -> bool:
+    print(f"{'✓' if ok else '❌'} {name}")
+    return ok
+
+
+def test_round_trip(store: SnapshotStore) -> bool:
+    ok = True
+    snapshot = build_snapshot('waxpeer', [12.5, 1520.0, 'n/a', 0.03, 99999.999], 1_700_000_000.25)
+
+    path = store.save(snapshot)
+    ok &= check("El snapshot se escribe en formato binario (.snap)", path.suffix == '.snap')
+
+    loaded = store.load('waxpeer')
+    ok &= check("Binario: nombres, precios y URLs idénticos", same_snapshot(snapshot, loaded))
+    ok &= check("Binario: timestamp exacto", loaded.timestamp == snapshot.timestamp)
+    ok &= check("Binario: el precio sin parsear sigue marcado como inválido",
+                int(loaded.prices[2]) == INVALID_PRICE)
+
+    # El JSON histórico no distingue un precio inválido (lo escribe como 0): se comparan los válidos
+    exported = SnapshotStore(_tmp / 'snapshots', snapshot_format=FORMAT_JSON).load('waxpeer')
+    valid = snapshot.prices != INVALID_PRICE
+    ok &= check("JSON de exportación equivalente al binario",
+                same_snapshot(snapshot.take(valid), exported.take(valid)))
+
+    empty = PriceSnapshot.empty('csdeals')
+    store.save(empty)
+    ok &= check("Snapshot vacío", len(store.load('csdeals')) == 0)
+    return ok
+
+
+def test_manifest(store: SnapshotStore) -> bool:
+    ok = True
+    ok &= check("Plataforma sin publicar: versión None", store.get_version('empire') is None)
+
+    store.save(build_snapshot('empire', [1, 2, 3, 4, 5], 1.0))
+    first = store.get_version('empire')
+    store.save(build_snapshot('empire', [1, 2, 3, 4, 6], 2.0))
+    second = store.get_version('empire')
+    ok &= check("La versión empieza en 1 y sube en cada publicación", (first, second) == (1, 2))
+
+    manifest = store.read_manifest('empire')
+    ok &= check("El manifiesto describe el último snapshot",
+                manifest['items'] == len(NAMES) and manifest['timestamp'] == 2.0
+                and manifest['file'] == 'empire_data.snap')
+    ok &= check("Otra plataforma no cambia de versión", store.get_version('waxpeer') == 1)
+    return ok
+
+
+def write_v1(snapshot: PriceSnapshot, path: Path):
+    """Archivo .snap de la versión 1 (sin columna item_ids)"""
+    names = '\n'.join(snapshot.names).encode('utf-8')
+    urls = snapshot.url_data.encode('utf-8')
+    with open(path, 'wb') as f:
+        f.write(struct.pack('<4sHHQdQQ', b'CSNP', 1, 1, len(snapshot), snapshot.timestamp,
+                            len(names), len(urls)))
+        f.write(snapshot.prices.astype('<i8').tobytes())
+        f.write(snapshot.url_offsets.astype('<i8').tobytes())
+        f.write(names)
+        f.write(urls)
+
+
+def test_binary_ids(store: SnapshotStore) -> bool:
+    ok = True
+    snapshot = build_snapshot('skinport', [1.5, 2.5, 3.5, 'n/a', 5.5], 1_700_000_100.0)
+    path = store.save(snapshot)
+
+    columns = read_binary_columns(path)
+    ok &= check("v2: los ids se leen de la columna item_ids",
+                columns.item_ids is not None and np.array_equal(columns.item_ids, snapshot.item_ids))
+    ok &= check("v2: los nombres solo se decodifican al pedirlos",
+                isinstance(columns.names_data, bytes) and columns.names() == snapshot.names)
+
+    # Un registro cargado antes de que otro proceso registre los nombres los busca en la DB
+    stale = ItemRegistry()
+    names = [f"Nuevo item {i} | Skin (Minimal Wear)" for i in range(3)]
+    fresh = PriceSnapshot('skinport', snapshot.registry.get_ids(names), [10, 20, 30],
+                          registry=snapshot.registry)
+    loaded = read_binary_columns(store.save(fresh))
+    ok &= check("Ids registrados por otro proceso: get_names los resuelve",
+                stale.get_names(loaded.item_ids) == names)
+
+    v1_path = _tmp / 'v1' / 'skinport_data.snap'
+    v1_path.parent.mkdir()
+    write_v1(snapshot, v1_path)
+    ok &= check("Los archivos v1 (sin item_ids) se siguen leyendo por nombre",
+                same_snapshot(snapshot, SnapshotStore(v1_path.parent).load('skinport'))
+                and read_binary_columns(v1_path).item_ids is None)
+    return ok
+
+
+def apply_diff(state: dict, diff) -> dict:
+    state = dict(state)
+    for item_id in diff.removed_ids.tolist():
+        del state[item_id]
+    state.update(zip(diff.added_ids.tolist(), diff.added_prices.tolist()))
+    for item_id, old, new in zip(diff.changed_ids.tolist(), diff.old_prices.tolist(),
+                                 diff.new_prices.tolist()):
+        assert state[item_id] == old
+        state[item_id] = new
+    return state
+
+
+def as_state(snapshot: PriceSnapshot) -> dict:
+    item_ids, prices = price_by_item(snapshot)
+    return dict(zip(item_ids.tolist(), prices.tolist()))
+
+
+def test_diff_and_delta_log() -> bool:
+    rng = np.random.default_rng(7)
+    registry = build_snapshot('steam', [1] * len(NAMES), 0.0).registry
+    names = [f"Item {i} | Skin (Field-Tested)" for i in range(400)]
+    ids = registry.get_ids(names)
+
+    log = DeltaLog(_tmp / 'history', checkpoint_interval=3)
+    previous = None
+    diffs_ok = True
+    for run in range(8):
+        # Cada ejecución cambia precios, quita y agrega items (con algún duplicado)
+        present = rng.random(len(ids)) < 0.8
+        prices = rng.integers(10, 500_000, len(ids))
+        item_ids = np.concatenate((ids[present], ids[present][:5]))
+        item_prices = np.concatenate((prices[present], prices[present][:5] + 1))
+        snapshot = PriceSnapshot('skinport', item_ids, item_prices, float(run), registry=registry)
+
+        diff = diff_snapshots(previous, snapshot)
+        expected = as_state(snapshot)
+        diffs_ok &= apply_diff(as_state(previous) if previous else {}, diff) == expected
+        log.append(snapshot, diff)
+        previous = snapshot
+
+    ok = check("Aplicar cada SnapshotDiff reproduce el snapshot siguiente", diffs_ok)
+
+    replay_ids, replay_prices, timestamp = log.replay('skinport')
+    ok &= check("DeltaLog.replay reconstruye el último snapshot",
+                dict(zip(replay_ids.tolist(), replay_prices.tolist())) == as_state(previous)
+                and timestamp == previous.timestamp)
+
+    kinds = sorted(path.name.split('.')[1] for path in (_tmp / 'history' / 'skinport').iterdir())
+    ok &= check("Checkpoints cada 3 ejecuciones y deltas antiguos eliminados",
+                kinds.count('checkpoint') == 2 and len(kinds) < 8)
+    return ok
+
+
+def main() -> bool:
+    store = SnapshotStore(_tmp / 'snapshots', snapshot_format=FORMAT_BINARY, json_export=True)
+    ok = test_round_trip(store)
+    ok &= test_manifest(store)
+    ok &= test_binary_ids(store)
+    ok &= test_diff_and_delta_log()
+    return bool(ok)
+
+
+if __name__ == "__main__":
+    try:
+        if main():
+            print("\n✅ Snapshots funcionando correctamente!")
+            sys.exit(0)
+        print("\n❌ Hay pruebas de snapshots que fallan")
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+    sys.exit(1)
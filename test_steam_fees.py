@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# test_steam_fees.py - Comprueba SteamFeeCalculator contra el algoritmo original
+
+import sys
+import struct
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent))
+
+import numpy as np
+
+from backend.services.profitability_service import SteamFeeCalculator, FEE_TABLE_MAX_PRICE
+
+
+def original_subtract_fee(input_value: float) -> float:
+    """Algoritmo original (antes de las tablas precalculadas), copiado tal cual"""
+    intervals = [0.02, 0.21, 0.32, 0.43]
+    fees = [0.02, 0.03, 0.04, 0.05, 0.07, 0.09]
+
+    while input_value > intervals[-1]:
+        last_element = intervals[-1]
+        if len(intervals) % 2 == 0:
+            intervals.append(round(last_element + 0.12, 2))
+        else:
+            intervals.append(round(last_element + 0.11, 2))
+
+    while len(intervals) > len(fees):
+        last_element = fees[-1]
+        if len(fees) % 2 == 0:
+            fees.append(round(last_element + 0.01, 2))
+        else:
+            fees.append(round(last_element + 0.02, 2))
+
+    first_greater = next((value for value in intervals if value >= input_value), None)
+    index_of_first_greater = intervals.index(first_greater)
+
+    fee_subtraction = round(input_value - fees[index_of_first_greater - 1], 2)
+    return fee_subtraction
+
+
+def same_bits(a: float, b: float) -> bool:
+    return struct.pack('<d', a) == struct.pack('<d', b)
+
+
+def check(name: str, values, calculator: SteamFeeCalculator) -> bool:
+    """Compara subtract_fee y subtract_fee_array con el original, bit a bit"""
+    expected = [original_subtract_fee(v) for v in values]
+    scalar = [calculator.subtract_fee(v) for v in values]
+    vector = calculator.subtract_fee_array(np.array(values)).tolist()
+
+    bad_scalar = [(v, e, s) for v, e, s in zip(values, expected, scalar) if not same_bits(e, s)]
+    bad_vector = [(v, e, s) for v, e, s in zip(values, expected, vector) if not same_bits(e, s)]
+    if bad_scalar or bad_vector:
+        print(f"❌ {name}: {len(bad_scalar)} diferencias en subtract_fee, "
+              f"{len(bad_vector)} en subtract_fee_array")
+        for v, e, s in (bad_scalar + bad_vector)[:5]:
+            print(f"   precio {v!r}: esperado {e!r}, obtenido {s!r}")
+        return False
+    print(f"✓ {name}: {len(values)} precios idénticos")
+    return True
+
+
+def main() -> bool:
+    ok = True
+    calculator = SteamFeeCalculator()
+
+    # Rejilla de centavos y de milésimas (precios tal como llegan de los scrapers)
+    ok &= check("Centavos hasta $100", [c / 100 for c in range(0, 10001)], calculator)
+    ok &= check("Milésimas hasta $15", [m / 1000 for m in range(0, 15001)], calculator)
+
+    # Borde inferior: precios <= $0.02 usan la última comisión de la tabla base
+    ok &= check("Precios <= $0.02", [0.0, 0.001, 0.005, 0.01, 0.015, 0.019, 0.02], calculator)
+
+    # Justo en los límites de intervalo y a un ulp de ellos
+    boundaries = calculator.intervals[:600]
+    ok &= check("Límites de intervalo",
+                boundaries + [float(np.nextafter(v, np.inf)) for v in boundaries]
+                + [float(np.nextafter(v, -np.inf)) for v in boundaries], calculator)
+
+    # Por encima de FEE_TABLE_MAX_PRICE las tablas se amplían (_ensure_covers),
+    # tanto desde subtract_fee como desde subtract_fee_array
+    beyond = [FEE_TABLE_MAX_PRICE + 0.01, FEE_TABLE_MAX_PRICE + 0.5, 12345.67, 20000.0]
+    ok &= check("Por encima de FEE_TABLE_MAX_PRICE (escalar)", beyond, SteamFeeCalculator())
+
+    fresh = SteamFeeCalculator()
+    vector = fresh.subtract_fee_array(np.array(beyond)).tolist()
+    if fresh.intervals[-1] >= max(beyond) and all(
+            same_bits(original_subtract_fee(v), s) for v, s in zip(beyond, vector)):
+        print(f"✓ Tablas ampliadas desde subtract_fee_array hasta ${fresh.intervals[-1]:.2f}")
+    else:
+        print("❌ subtract_fee_array no amplía las tablas correctamente")
+        ok = False
+
+    # NaN/inf no son precios válidos
+    for value in (float('nan'), float('inf')):
+        try:
+            calculator.subtract_fee(value)
+            print(f"❌ subtract_fee({value}) no lanzó ValueError")
+            ok = False
+        except ValueError:
+            pass
+    print("✓ NaN/inf rechazados")
+
+    return bool(ok)
+
+
+if __name__ == "__main__":
+    try:
+        if main():
+            print("\n✅ Comisiones de Steam idénticas al algoritmo original!")
+            sys.exit(0)
+        print("\n❌ Hay diferencias con el algoritmo original")
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+    sys.exit(1)
@@ -20,7 +20,11 @@ from loguru import logger
 sys.path.append(str(Path(__file__).parent))
 
 from backend.core.config_manager import get_config_manager
+from backend.core.name_index import get_name_index
+from backend.core.price_record import from_minor
+from backend.core.price_table import get_price_table
 from backend.services.database_service import get_database_service
+from backend.services.async_database_service import get_async_database_service
 from backend.services.profitability_service import ProfitabilityService
 from backend.scrapers import *
 
@@ -66,6 +70,11 @@ class ScraperManager:
         self.websocket_clients = set()
         self.config_manager = get_config_manager()
         self.db_service = get_database_service()
+        self.async_db = get_async_database_service()
+        
+        # Mantener abierta la tabla compartida mientras viva el servidor
+        # (en Windows se libera al cerrarse el último proceso que la usa)
+        self.price_table = get_price_table()
         
         # Cargar configuraciones guardadas
         self.load_scraper_configs()
@@ -199,21 +208,21 @@ class ScraperManager:
         
         return {"status": "stopped", "scraper": scraper_name}
     
-    def get_scraper_status(self, scraper_name: str):
-        """Obtiene el estado de un scraper"""
+    def get_scraper_status(self, scraper_name: str, db_status: Optional[Dict] = None):
+        """
+        Obtiene el estado de un scraper
+        
+        Args:
+            scraper_name: Nombre del scraper
+            db_status: Estados de la base de datos por scraper (None = consultarlos)
+        """
         is_running = scraper_name in self.processes
         config = self.configs.get(scraper_name, {})
         
         # Obtener estadísticas de la base de datos
-        db_stats = {}
-        try:
-            scrapers_status = self.db_service.get_scrapers_status()
-            for status in scrapers_status:
-                if status['name'] == scraper_name:
-                    db_stats = status
-                    break
-        except:
-            pass
+        if db_status is None:
+            db_status = self._get_db_status()
+        db_stats = db_status.get(scraper_name, {})
         
         return {
             'name': scraper_name,
@@ -225,12 +234,20 @@ class ScraperManager:
     
     def get_all_scrapers_status(self):
         """Obtiene el estado de todos los scrapers"""
-        status_list = []
-        
-        for scraper_name in self.available_scrapers:
-            status_list.append(self.get_scraper_status(scraper_name))
+        # Una sola consulta para todos los scrapers
+        db_status = self._get_db_status()
         
-        return status_list
+        return [
+            self.get_scraper_status(scraper_name, db_status)
+            for scraper_name in self.available_scrapers
+        ]
+    
+    def _get_db_status(self) -> Dict[str, Dict]:
+        """Estado de los scrapers en la base de datos indexado por nombre"""
+        try:
+            return {status['name']: status for status in self.db_service.get_scrapers_status()}
+        except Exception:
+            return {}
     
     def _detect_log_level(self, line: str) -> str:
         """Detecta el nivel de log de una línea"""
@@ -275,7 +292,7 @@ async def root():
 @app.get("/api/scrapers")
 async def get_scrapers():
     """Obtiene la lista de todos los scrapers y su estado"""
-    return scraper_manager.get_all_scrapers_status()
+    return await scraper_manager.async_db.run(scraper_manager.get_all_scrapers_status)
 
 @app.get("/api/scrapers/{scraper_name}")
 async def get_scraper(scraper_name: str):
@@ -283,7 +300,7 @@ async def get_scraper(scraper_name: str):
     if scraper_name not in scraper_manager.available_scrapers:
         raise HTTPException(status_code=404, detail="Scraper no encontrado")
     
-    return scraper_manager.get_scraper_status(scraper_name)
+    return await scraper_manager.async_db.run(scraper_manager.get_scraper_status, scraper_name)
 
 @app.post("/api/scrapers/{scraper_name}/start")
 async def start_scraper(scraper_name: str, config: Optional[ScraperConfig] = None):
@@ -306,7 +323,7 @@ async def restart_scraper(scraper_name: str):
     except:
         pass
     
-    time.sleep(2)
+    await asyncio.sleep(2)
     return scraper_manager.start_scraper(scraper_name)
 
 @app.post("/api/scrapers/{scraper_name}/config")
@@ -330,7 +347,7 @@ async def get_scraper_logs(scraper_name: str, limit: int = 100):
 async def get_profitability():
     """Obtiene las oportunidades rentables actuales"""
     try:
-        opportunities = scraper_manager.db_service.get_profitable_opportunities(limit=100)
+        opportunities = await scraper_manager.async_db.get_profitable_opportunities(limit=100)
         return opportunities
     except Exception as e:
         return []
@@ -340,28 +357,48 @@ async def run_profitability_analysis():
     """Ejecuta análisis de rentabilidad"""
     try:
         service = ProfitabilityService()
-        service.run()
+        # Análisis completo (CPU y base de datos): fuera del event loop
+        await asyncio.to_thread(service.run)
         return {"status": "success", "message": "Análisis completado"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/prices/{item_name:path}")
+async def get_live_prices(item_name: str):
+    """Precios actuales de un item en todas las plataformas (memoria compartida)"""
+    price_table = get_price_table()
+    if price_table is None:
+        raise HTTPException(status_code=503, detail="Tabla de precios compartida no disponible")
+    
+    # find_id consulta la DB si el nombre no está en memoria: fuera del event loop
+    item_id = await scraper_manager.async_db.find_item_id(get_name_index().canonical(item_name))
+    if item_id is None:
+        raise HTTPException(status_code=404, detail="Item no encontrado")
+    
+    try:
+        # El seqlock puede esperar a un scraper que está publicando: fuera del event loop
+        prices = await asyncio.to_thread(price_table.get_prices, item_id)
+    except TimeoutError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    
+    return {
+        'item': item_name,
+        'prices': {platform: from_minor(price) for platform, price in prices.items()}
+    }
+
 @app.get("/api/stats")
 async def get_stats():
     """Obtiene estadísticas del sistema"""
     try:
-        session = scraper_manager.db_service.db_manager.get_session()
-        from backend.database.models import Item, ProfitableOpportunity
+        db_stats = await scraper_manager.async_db.get_system_stats()
         
-        stats = {
-            'total_items': session.query(Item).count(),
-            'active_opportunities': session.query(ProfitableOpportunity).filter_by(is_active=True).count(),
+        return {
+            'total_items': db_stats['total_items'],
+            'active_opportunities': db_stats['active_opportunities'],
             'running_scrapers': len(scraper_manager.processes),
             'total_scrapers': len(scraper_manager.available_scrapers)
         }
         
-        session.close()
-        return stats
-        
     except Exception as e:
         return {
             'total_items': 0,
@@ -381,7 +418,7 @@ async def websocket_endpoint(websocket: WebSocket):
         await websocket.send_json({
             'type': 'initial_state',
             'data': {
-                'scrapers': scraper_manager.get_all_scrapers_status(),
+                'scrapers': await scraper_manager.async_db.run(scraper_manager.get_all_scrapers_status),
                 'stats': await get_stats()
             }
         })